@@ -0,0 +1,280 @@
+from datetime import date, datetime, timedelta
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import types
+
+from benchmarks.widget_server import WidgetStandIn, WIDGET_ID
+
+# Where results are written when no --output is given, one JSON file per run
+RESULTS_DIRECTORY = os.path.join("benchmarks", "results")
+
+class BenchmarkRecorder:
+    """Times the weeks, months and bookings of a handler
+
+    The handler is wrapped per instance, so the code being measured is
+    exactly the code that runs against the real site.
+    """
+
+    def __init__(self, profiler):
+        """Initialize the recorder
+
+        Args:
+            profiler: CommandProfiler attached to the driver under test
+        """
+        self.profiler = profiler
+        self.weeks = []
+        self.months = []
+        self.bookings = []
+
+    def wrap_handler(self, handler):
+        """Time process_days (one week), reserve_classes (one month) and book_session (one booking)"""
+
+        process_days = handler.process_days
+        reserve_classes = handler.reserve_classes
+        book_session = handler.book_session
+
+        def timed_process_days(*args, **kwargs):
+            commands_before = self.profiler.command_count
+            start = time.perf_counter()
+            result = process_days(*args, **kwargs)
+            self.weeks.append({
+                "seconds": round(time.perf_counter() - start, 4),
+                "webdriver_commands": self.profiler.command_count - commands_before
+            })
+            return result
+
+        def timed_reserve_classes(driver, studio, target_year, target_month, *args, **kwargs):
+            start = time.perf_counter()
+            result = reserve_classes(driver, studio, target_year, target_month, *args, **kwargs)
+            self.months.append({
+                "year": target_year,
+                "month": target_month,
+                "seconds": round(time.perf_counter() - start, 4),
+                "result": result
+            })
+            return result
+
+        def timed_book_session(driver, session, class_date, studio=""):
+            start = time.perf_counter()
+            booked = book_session(driver, session, class_date, studio)
+            self.bookings.append({
+                "date": class_date.strftime("%Y-%m-%d"),
+                "start_time": session["start_time"],
+                "class_name": session["name"],
+                "seconds": round(time.perf_counter() - start, 4),
+                "booked": booked
+            })
+            return booked
+
+        handler.process_days = timed_process_days
+        handler.reserve_classes = timed_reserve_classes
+        handler.book_session = timed_book_session
+
+    def get_summary(self, total_seconds):
+        """Aggregate the recorded timings"""
+
+        def describe(seconds):
+            if not seconds:
+                return {"count": 0}
+            return {
+                "count": len(seconds),
+                "total": round(sum(seconds), 4),
+                "mean": round(statistics.mean(seconds), 4),
+                "median": round(statistics.median(seconds), 4),
+                "max": round(max(seconds), 4)
+            }
+
+        return {
+            "total_seconds": round(total_seconds, 4),
+            "weeks": describe([week["seconds"] for week in self.weeks]),
+            "months": describe([month["seconds"] for month in self.months]),
+            "bookings": describe([booking["seconds"] for booking in self.bookings]),
+            "booked": sum(1 for booking in self.bookings if booking["booked"]),
+            "webdriver_commands": self.profiler.command_count
+        }
+
+def install_benchmark_config(stand_in, expiration_date):
+    """Point every configured URL at the stand-in before the booking code is imported.
+
+    The booking modules read config.config at import time, so a module built
+    from the stand-in's URLs is registered in its place. This also makes sure
+    a benchmark can never reach the real studio pages or use real credentials.
+    """
+
+    config = types.ModuleType("config.config")
+    config.MINDBODY_USERNAME = "benchmark@example.com"
+    config.MINDBODY_PASSWORD = "benchmark"
+    config.MINDBODY_MEMBERSHIP_EXPIRATION_DATE = expiration_date.strftime("%Y-%m-%d")
+    config.MINDBODY_LOGIN_URL = f"{stand_in.url}/login"
+    config.HYR_METUCHEN_URL = f"{stand_in.url}/metuchen"
+    config.HYR_CRANFORD_URL = f"{stand_in.url}/cranford"
+    config.HYR_METUCHEN_WIDGET_ID = WIDGET_ID
+    config.HYR_CRANFORD_WIDGET_ID = WIDGET_ID
+    sys.modules["config.config"] = config
+
+def get_git_commit():
+    """Helper function to return the current commit hash, None outside a git checkout"""
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def get_months(count, today):
+    """Helper function to list (year, month) pairs starting with the current month"""
+
+    months = []
+    year, month = today.year, today.month
+    for _ in range(count):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+def run_benchmark(args):
+    """Run reserve_classes against the stand-in and collect the measurements.
+
+    Args:
+        args: Options from parse_args
+
+    Returns:
+        dict: The benchmark result
+    """
+
+    today = date.today()
+    stand_in = WidgetStandIn(
+        density=args.density,
+        latency=args.latency_ms / 1000,
+        render_delay=args.render_ms / 1000,
+        ui_delay=args.ui_ms / 1000,
+        datepicker_input=not args.no_datepicker_input
+    ).start()
+    install_benchmark_config(stand_in, today + timedelta(days=400))
+
+    # Imported only now, so they pick up the stand-in's configuration
+    from yoga_reserver import init_driver
+    from utilities.mindbody_handler import MindbodyHandler
+    from utilities.session_manager import SessionManager
+    from utilities.schedule_sources import HttpScheduleSource
+    from utilities.booking_rules import BookingRule, parse_day, parse_time
+    from utilities.command_profiler import CommandProfiler
+    from utilities.tracer import start_tracing
+
+    rule = BookingRule(
+        day=parse_day(args.day) if args.day else None,
+        time=parse_time(args.time) if args.time else None,
+        instructor=args.instructor,
+        class_name=args.class_name
+    )
+    schedule_source = HttpScheduleSource(stand_in.url) if args.schedule_source == "http" else None
+    handler = MindbodyHandler(
+        jump_navigation=args.jump,
+        session_manager=SessionManager(None, login_url=f"{stand_in.url}/login"),
+        schedule_source=schedule_source
+    )
+
+    tracer = start_tracing() if args.trace else None
+    profiler = CommandProfiler()
+    recorder = BenchmarkRecorder(profiler)
+    recorder.wrap_handler(handler)
+
+    driver = init_driver(lean=not args.headed)
+    start = time.perf_counter()
+    try:
+        profiler.attach(driver)
+        driver.get(f"{stand_in.url}/{args.studio}")
+        handler.start_session(driver)
+
+        for year, month in get_months(args.months, today):
+            handler.seek_month(driver, args.studio, year, month)
+            handler.reserve_classes(driver, args.studio, year, month, rules=[rule])
+    finally:
+        total_seconds = time.perf_counter() - start
+        driver.quit()
+        if schedule_source:
+            schedule_source.close()
+        stand_in.stop()
+        if tracer:
+            tracer.save(args.trace)
+
+    return {
+        "benchmark": "reserve_classes",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": get_git_commit(),
+        "settings": {
+            "studio": args.studio,
+            "months": args.months,
+            "rule": rule.describe(),
+            "jump": args.jump,
+            "schedule_source": args.schedule_source,
+            "lean": not args.headed,
+            "density": args.density,
+            "latency_ms": args.latency_ms,
+            "render_ms": args.render_ms,
+            "ui_ms": args.ui_ms,
+            "datepicker_input": not args.no_datepicker_input
+        },
+        "summary": dict(recorder.get_summary(total_seconds), http_requests=stand_in.request_count),
+        "months": recorder.months,
+        "weeks": recorder.weeks,
+        "bookings": recorder.bookings,
+        "webdriver_commands": profiler.to_dict(),
+        "phases": {category: round(seconds, 4) for category, seconds in tracer.get_category_totals().items()} if tracer else None
+    }
+
+def print_summary(result):
+    """Print the headline numbers of a benchmark result"""
+
+    summary = result["summary"]
+    print("\n-------------------------------------------------------")
+    print(f"Benchmark finished in {summary['total_seconds']:.2f}s")
+    for label in ("months", "weeks", "bookings"):
+        stats = summary[label]
+        if stats["count"]:
+            print(f"    {label.title()}: {stats['count']}, mean {stats['mean']:.3f}s, max {stats['max']:.3f}s")
+    print(f"    Booked: {summary['booked']}")
+    print(f"    WebDriver commands: {summary['webdriver_commands']}, HTTP requests: {summary['http_requests']}")
+    print("-------------------------------------------------------")
+
+def parse_args():
+    """Parses the command line options.
+
+    Returns:
+        argparse.Namespace: The parsed options
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmark reserve_classes against a local widget stand-in")
+    parser.add_argument("--studio", choices=("metuchen", "cranford"), default="metuchen", help="studio page to open (default: metuchen)")
+    parser.add_argument("--months", type=int, default=1, help="number of months to book, starting with the current one (default: 1)")
+    parser.add_argument("--class-name", default="Hot Vinyasa", help="class name the rule books (default: 'Hot Vinyasa')")
+    parser.add_argument("--day", help="day of week the rule books")
+    parser.add_argument("--time", help="start time the rule books, e.g. '7:30 AM'")
+    parser.add_argument("--instructor", help="instructor the rule books")
+    parser.add_argument("--jump", action="store_true", help="jump straight to each planned week")
+    parser.add_argument("--schedule-source", choices=("browser", "http"), default="browser", help="where weeks are read from with --jump")
+    parser.add_argument("--headed", action="store_true", help="show the browser instead of the headless lean profile")
+    parser.add_argument("--density", type=int, default=6, help="classes per day (default: 6)")
+    parser.add_argument("--latency-ms", type=float, default=50, help="delay added to every response (default: 50)")
+    parser.add_argument("--render-ms", type=float, default=100, help="time the page takes to render a week or the cart (default: 100)")
+    parser.add_argument("--ui-ms", type=float, default=20, help="time the page takes to react to a click (default: 20)")
+    parser.add_argument("--no-datepicker-input", action="store_true", help="make jumps go through the calendar popup")
+    parser.add_argument("--trace", metavar="PATH", help="also write the run's phase timeline to PATH in Chrome trace format")
+    parser.add_argument("--output", help=f"JSON file for the result (default: a new file in {RESULTS_DIRECTORY})")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    result = run_benchmark(args)
+    print_summary(result)
+
+    output = args.output or os.path.join(RESULTS_DIRECTORY, f"reserve_classes-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as result_file:
+        json.dump(result, result_file, indent=2)
+    print(f"Results written to {output}")
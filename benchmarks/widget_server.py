@@ -0,0 +1,491 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import date, datetime, time as dt_time, timedelta
+from urllib.parse import urlparse, parse_qs
+import argparse
+import html
+import json
+import threading
+import time
+
+from resources.html_selectors import *
+import resources.html_selectors as html_selectors
+
+# Classes and instructors the stand-in schedules, cycled through by session slot
+CLASS_NAMES = ("Hot Vinyasa", "Yin Yoga", "Power Flow", "Hot 26", "Restorative")
+STAFF_NAMES = ("Ana Lopez", "Ben Carter", "Chloe Park", "Dev Patel")
+
+# First class of the day and the gap between class starts
+FIRST_CLASS_TIME = dt_time(6, 0)
+CLASS_SPACING = timedelta(minutes=90)
+CLASS_LENGTH = timedelta(minutes=60)
+
+# Cookie set by the stand-in's sign-in form
+SESSION_COOKIE = "standin_session"
+
+# Widget id the stand-in answers to in its schedule URLs
+WIDGET_ID = "1"
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Schedule widget stand-in</title>
+<style>
+body { font-family: sans-serif; }
+.{FULL_CALENDAR} { display: none; border: 1px solid #999; padding: 8px; width: 260px; }
+.{FULL_CALENDAR}.open { display: block; }
+.{CALENDAR_ROW} { display: flex; }
+.{CALENDAR_DATE}, .hc-pignose-calendar-unit-blank { width: 34px; text-align: center; cursor: pointer; }
+.{CALENDAR_UNIT_DISABLED} { color: #bbb; cursor: default; }
+.{CALENDAR_UNIT_ACTIVE} { background: #cde; }
+.{SESSION_DAY} { margin: 12px 0; }
+.{SESSION} { border-bottom: 1px solid #eee; padding: 4px 0; }
+.{SESSION_BASICS} { cursor: pointer; }
+.{SESSION_CART_BUTTON} { display: none; }
+.{SESSION}.expanded .{SESSION_CART_BUTTON} { display: inline-block; }
+.{MODAL_CONTENT} { position: fixed; top: 5%; left: 10%; width: 80%; height: 80%; background: #fff; border: 1px solid #000; }
+.{MODAL_CONTENT} iframe { width: 100%; height: 90%; border: 0; }
+</style>
+</head>
+<body>
+<div class="{CALENDAR_CONTAINER}">
+  <div class="{FULLCAL_FIELD}">
+    <div class="{DATEPICKER}">
+      <button class="{DATEPICKER_BUTTON}" type="button">Pick a date</button>
+      <input class="{DATEPICKER_INPUT}" type="text">
+    </div>
+  </div>
+  <button class="{FULLCAL_BUTTON}" type="button">Full calendar</button>
+  <div class="{FULL_CALENDAR}">
+    <div class="hc-pignose-calendar-top">
+      <a class="{CALENDAR_TOP_NAV} {CALENDAR_TOP_PREV}" href="#">&lt;</a>
+      <div class="{CALENDAR_TOP_DATE}"><span class="{CALENDAR_TOP_MONTH}"></span> <span class="{CALENDAR_TOP_YEAR}"></span></div>
+      <a class="{CALENDAR_TOP_NAV} {CALENDAR_TOP_NEXT}" href="#">&gt;</a>
+    </div>
+    <div class="{CALENDAR_BODY}"></div>
+    <a class="{CALENDAR_OK_BUTTON} {CALENDAR_OK_BUTTON_APPLY}" href="#">OK</a>
+  </div>
+</div>
+<div class="{SESSIONS_CONTAINER}"></div>
+<script>
+var config = __CONFIG__;
+var MONTH_NAMES = ["January", "February", "March", "April", "May", "June", "July",
+                   "August", "September", "October", "November", "December"];
+
+function pad(n) { return n < 10 ? "0" + n : "" + n; }
+function toKey(d) { return d.getFullYear() + "-" + pad(d.getMonth() + 1) + "-" + pad(d.getDate()); }
+function fromKey(key) { var p = key.split("-"); return new Date(+p[0], p[1] - 1, +p[2]); }
+
+var today = fromKey(config.today);
+var selected = today;
+var pending = null;
+var shownMonth = new Date(today.getFullYear(), today.getMonth(), 1);
+var loadToken = 0;
+
+function loadWeek(start) {
+  var container = document.querySelector(".{SESSIONS_CONTAINER}");
+  var token = ++loadToken;
+  container.innerHTML = "";
+  fetch("/widgets/schedules/" + config.widgetId + "/load_markup?options%5Bstart_date%5D=" + toKey(start))
+    .then(function(response) { return response.json(); })
+    .then(function(data) {
+      setTimeout(function() {
+        if (token === loadToken) { container.innerHTML = data.class_sessions; }
+      }, config.renderMs);
+    });
+}
+
+function renderCalendar() {
+  var calendar = document.querySelector(".{FULL_CALENDAR}");
+  calendar.querySelector(".{CALENDAR_TOP_MONTH}").textContent = MONTH_NAMES[shownMonth.getMonth()];
+  calendar.querySelector(".{CALENDAR_TOP_YEAR}").textContent = shownMonth.getFullYear();
+
+  var body = calendar.querySelector(".{CALENDAR_BODY}");
+  body.innerHTML = "";
+  var active = pending || selected;
+  var day = new Date(shownMonth);
+  var row = null;
+  while (day.getMonth() === shownMonth.getMonth()) {
+    if (!row || day.getDay() === 0) {
+      row = document.createElement("div");
+      row.className = "{CALENDAR_ROW}";
+      body.appendChild(row);
+      for (var blank = 0; row === body.firstChild && blank < day.getDay(); blank++) {
+        var filler = document.createElement("div");
+        filler.className = "hc-pignose-calendar-unit-blank";
+        row.appendChild(filler);
+      }
+    }
+    var unit = document.createElement("div");
+    var classes = ["hc-pignose-calendar-unit", "{CALENDAR_DATE}"];
+    if (day < today) { classes.push("{CALENDAR_UNIT_DISABLED}"); }
+    if (toKey(day) === toKey(active)) { classes.push("{CALENDAR_UNIT_ACTIVE}", "{CALENDAR_UNIT_FIRST_ACTIVE}"); }
+    unit.className = classes.join(" ");
+    unit.setAttribute("data-date", toKey(day));
+    unit.textContent = day.getDate();
+    row.appendChild(unit);
+    day.setDate(day.getDate() + 1);
+  }
+}
+
+function openCalendar() {
+  pending = null;
+  shownMonth = new Date(selected.getFullYear(), selected.getMonth(), 1);
+  renderCalendar();
+  document.querySelector(".{FULL_CALENDAR}").classList.add("open");
+}
+
+document.querySelector(".{DATEPICKER_BUTTON}").addEventListener("click", openCalendar);
+document.querySelector(".{FULLCAL_BUTTON}").addEventListener("click", openCalendar);
+
+document.querySelector(".{FULL_CALENDAR}").addEventListener("click", function(event) {
+  event.preventDefault();
+  var target = event.target;
+  if (target.classList.contains("{CALENDAR_TOP_NEXT}") || target.classList.contains("{CALENDAR_TOP_PREV}")) {
+    var step = target.classList.contains("{CALENDAR_TOP_NEXT}") ? 1 : -1;
+    setTimeout(function() {
+      shownMonth = new Date(shownMonth.getFullYear(), shownMonth.getMonth() + step, 1);
+      renderCalendar();
+    }, config.uiMs);
+  } else if (target.classList.contains("{CALENDAR_DATE}") && !target.classList.contains("{CALENDAR_UNIT_DISABLED}")) {
+    pending = fromKey(target.getAttribute("data-date"));
+    renderCalendar();
+  } else if (target.classList.contains("{CALENDAR_OK_BUTTON_APPLY}")) {
+    if (pending) { selected = pending; }
+    document.querySelector(".{FULL_CALENDAR}").classList.remove("open");
+    loadWeek(selected);
+  }
+});
+
+document.querySelector(".{DATEPICKER_INPUT}").addEventListener("change", function(event) {
+  if (!config.datepickerInput || !/^\\d{4}-\\d{2}-\\d{2}$/.test(event.target.value)) { return; }
+  selected = fromKey(event.target.value);
+  loadWeek(selected);
+});
+
+document.querySelector(".{SESSIONS_CONTAINER}").addEventListener("click", function(event) {
+  var cart = event.target.closest(".{SESSION_CART_BUTTON}");
+  if (cart) {
+    var modal = document.createElement("div");
+    modal.className = "{MODAL_CONTENT}";
+    modal.innerHTML = '<a class="{MODAL_CLOSE}" href="#">Close</a>' +
+      '<iframe id="{MODAL_IFRAME}" src="/cart?session=' + encodeURIComponent(cart.getAttribute("data-session")) + '"></iframe>';
+    modal.querySelector(".{MODAL_CLOSE}").addEventListener("click", function(e) { e.preventDefault(); modal.remove(); });
+    document.body.appendChild(modal);
+    return;
+  }
+  var basics = event.target.closest(".{SESSION_BASICS}");
+  if (basics) {
+    setTimeout(function() { basics.parentNode.classList.add("expanded"); }, config.uiMs);
+  }
+});
+
+loadWeek(selected);
+</script>
+</body>
+</html>
+"""
+
+LOGIN_FORM = """<div class="{LOGIN_HEADER}"><div class="{LOGIN_HEADER_BAR}"><div class="{LOGIN_HEADER_TITLE}">Sign In</div></div></div>
+<form id="signin">
+  <input id="{LOGIN_USERNAME}" type="text">
+  <input id="{LOGIN_PASSWORD}" type="password">
+  <button class="{LOGIN_BUTTON_CLASSES}" type="submit">Sign in</button>
+</form>"""
+
+CART_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Cart stand-in</title></head>
+<body>
+<div id="{MODAL_SPINNER}">Loading...</div>
+<div id="cart" style="display: none">
+  <a class="{MODAL_CONFIRM_BASE} {MODAL_CONFIRM_DISABLE} {MODAL_CONFIRM_PREVIEW}" href="#">Book now</a>
+</div>
+<div id="login" style="display: none">__LOGIN_FORM__</div>
+<div id="outcome"></div>
+<script>
+var config = __CONFIG__;
+
+function book() {
+  fetch("/book?session=" + encodeURIComponent(config.session), {method: "POST"})
+    .then(function(response) { return response.json(); })
+    .then(function(result) {
+      var cart = document.getElementById("cart");
+      var outcome = document.getElementById("outcome");
+      cart.style.display = "none";
+      if (result.status === "login") {
+        document.getElementById("login").style.display = "block";
+      } else if (result.status === "booked") {
+        outcome.innerHTML = '<div class="{MODAL_THANK_YOU_CLASSES}">Thank you, you are booked!</div>';
+      } else {
+        outcome.innerHTML = '<div class="c-banner c-banner--error" role="alert">' + result.message + '</div>';
+      }
+    });
+}
+
+document.getElementById("signin").addEventListener("submit", function(event) {
+  event.preventDefault();
+  fetch("/login", {method: "POST"}).then(function() {
+    document.getElementById("login").style.display = "none";
+    book();
+  });
+});
+
+document.querySelector("#cart a").addEventListener("click", function(event) {
+  event.preventDefault();
+  book();
+});
+
+setTimeout(function() {
+  document.getElementById("{MODAL_SPINNER}").style.display = "none";
+  document.getElementById("cart").style.display = "block";
+}, config.renderMs);
+</script>
+</body>
+</html>
+"""
+
+LOGIN_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Sign-in stand-in</title></head>
+<body>
+__BODY__
+<script>
+var form = document.getElementById("signin");
+if (form) {
+  form.addEventListener("submit", function(event) {
+    event.preventDefault();
+    fetch("/login", {method: "POST"}).then(function() {
+      document.body.innerHTML = "<p>Signed in</p>";
+    });
+  });
+}
+</script>
+</body>
+</html>
+"""
+
+def fill_selectors(template):
+    """Put the selectors from resources/html_selectors.py into a page template.
+
+    The templates name them as {SELECTOR}; str.format is not used because the
+    pages are full of CSS and JavaScript braces.
+    """
+
+    values = {name: value for name, value in vars(html_selectors).items() if name.isupper()}
+    values["LOGIN_BUTTON_CLASSES"] = " ".join(LOGIN_BUTTON.split(".")[1:])
+    values["MODAL_THANK_YOU_CLASSES"] = " ".join(MODAL_THANK_YOU.split("."))
+    for name, value in values.items():
+        template = template.replace("{" + name + "}", value)
+    return template
+
+def format_time(value):
+    """Format a time the way the widget shows it, e.g. '6:00 AM'"""
+
+    return f"{value.hour % 12 or 12}:{value.minute:02d} {'AM' if value.hour < 12 else 'PM'}"
+
+class WidgetStandIn:
+    """Local HTTP server replaying the schedule widget, its calendar popup and the cart modal
+
+    Every day has the same number of classes (the week density); names and
+    instructors rotate so rules can match some of them. Bookings are kept in
+    memory, so booking a class twice shows the cart's error banner.
+    """
+
+    def __init__(self, density=6, latency=0.05, render_delay=0.1, ui_delay=0.02, datepicker_input=True, port=0, today=None):
+        """Initialize the stand-in
+
+        Args:
+            density: Number of classes per day
+            latency: Seconds added to every HTTP response
+            render_delay: Seconds the page takes to render a fetched week or the cart
+            ui_delay: Seconds the page takes to react to a click on the calendar or a class
+            datepicker_input: Whether typing a date into the datepicker input shows its week
+            port: Port to listen on, any free port if 0
+            today: Optional first bookable date, the current date if None
+        """
+        self.density = density
+        self.latency = latency
+        self.render_delay = render_delay
+        self.ui_delay = ui_delay
+        self.datepicker_input = datepicker_input
+        self.today = today or date.today()
+        self.lock = threading.Lock()
+        self.booked = set()
+        self.request_count = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self.build_request_handler())
+        self.thread = None
+
+    @property
+    def url(self):
+        """Base URL of the running server"""
+
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        """Serve requests from a background thread"""
+
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port"""
+
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get_sessions(self, day):
+        """Get the classes of a day as (session id, start, end, name, staff) tuples"""
+
+        sessions = []
+        start = datetime.combine(day, FIRST_CLASS_TIME)
+        for slot in range(self.density):
+            class_start = start + slot * CLASS_SPACING
+            rotation = day.toordinal() + slot
+            sessions.append((
+                f"{day.isoformat()}-{slot}",
+                format_time(class_start.time()),
+                format_time((class_start + CLASS_LENGTH).time()),
+                CLASS_NAMES[rotation % len(CLASS_NAMES)],
+                STAFF_NAMES[rotation % len(STAFF_NAMES)]
+            ))
+        return sessions
+
+    def build_week_markup(self, start_date):
+        """Build the sessions markup of the seven days starting at start_date"""
+
+        parts = []
+        for offset in range(7):
+            day = start_date + timedelta(days=offset)
+            sessions = self.get_sessions(day)
+            day_classes = SESSION_DAY + ("" if sessions else f" {SESSION_DAY_EMPTY}")
+            parts.append(f'<div class="{day_classes}"><h3 class="{SESSION_DATE}">{day:%A}, {day:%B} {day.day}</h3>')
+            for session_id, start, end, name, staff in sessions:
+                parts.append(
+                    f'<div class="{SESSION}" data-session="{session_id}">'
+                    f'<div class="{SESSION_BASICS}"><div class="{SESSION_INFO}"><div class="{SESSION_TIME}">'
+                    f'<div class="{SESSION_COLUMN}"><span class="{SESSION_TIME_SPAN}">'
+                    f'<time class="{SESSION_START_TIME}">{start}</time> - <time class="{SESSION_END_TIME}">{end}</time>'
+                    f'</span></div></div>'
+                    f'<div class="{SESSION_NAME}">{html.escape(name)}</div>'
+                    f'<div class="{SESSION_STAFF}">{html.escape(staff)}</div>'
+                    f'</div></div>'
+                    f'<button class="{SESSION_CART_BUTTON}" type="button" data-session="{session_id}">Book</button>'
+                    f'</div>'
+                )
+            parts.append("</div>")
+        return "".join(parts)
+
+    def book(self, session_id):
+        """Book a class, returning the status the cart shows"""
+
+        with self.lock:
+            if session_id in self.booked:
+                return {"status": "error", "message": "You are already booked for this class."}
+            self.booked.add(session_id)
+            return {"status": "booked"}
+
+    def build_request_handler(self):
+        """Build the request handler class bound to this stand-in"""
+
+        stand_in = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output readable
+
+            def send_body(self, body, content_type="text/html; charset=utf-8", cookie=None):
+                encoded = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(encoded)))
+                self.send_header("Cache-Control", "no-store")
+                if cookie:
+                    self.send_header("Set-Cookie", cookie)
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def is_logged_in(self):
+                return f"{SESSION_COOKIE}=" in (self.headers.get("Cookie") or "")
+
+            def handle_request(self):
+                with stand_in.lock:
+                    stand_in.request_count += 1
+                if stand_in.latency:
+                    time.sleep(stand_in.latency)
+
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+
+                if url.path.endswith("/load_markup"):
+                    start_date = date.fromisoformat(query.get("options[start_date]", [stand_in.today.isoformat()])[0])
+                    return self.send_body(json.dumps({"class_sessions": stand_in.build_week_markup(start_date)}), "application/json")
+
+                if url.path == "/cart":
+                    page_config = json.dumps({"session": query.get("session", [""])[0], "renderMs": int(stand_in.render_delay * 1000)})
+                    page = fill_selectors(CART_TEMPLATE).replace("__LOGIN_FORM__", fill_selectors(LOGIN_FORM))
+                    return self.send_body(page.replace("__CONFIG__", page_config))
+
+                if url.path == "/book" and self.command == "POST":
+                    if not self.is_logged_in():
+                        return self.send_body(json.dumps({"status": "login"}), "application/json")
+                    return self.send_body(json.dumps(stand_in.book(query.get("session", [""])[0])), "application/json")
+
+                if url.path == "/login":
+                    if self.command == "POST":
+                        return self.send_body("{}", "application/json", cookie=f"{SESSION_COOKIE}=1; Path=/")
+                    body = "<p>Already signed in</p>" if self.is_logged_in() else fill_selectors(LOGIN_FORM)
+                    return self.send_body(LOGIN_PAGE_TEMPLATE.replace("__BODY__", body))
+
+                if url.path in ("/", "/metuchen", "/cranford"):
+                    page_config = json.dumps({
+                        "widgetId": WIDGET_ID,
+                        "today": stand_in.today.isoformat(),
+                        "renderMs": int(stand_in.render_delay * 1000),
+                        "uiMs": int(stand_in.ui_delay * 1000),
+                        "datepickerInput": stand_in.datepicker_input
+                    })
+                    return self.send_body(fill_selectors(PAGE_TEMPLATE).replace("__CONFIG__", page_config))
+
+                self.send_error(404)
+
+            def do_GET(self):
+                self.handle_request()
+
+            def do_POST(self):
+                self.handle_request()
+
+        return RequestHandler
+
+def parse_args():
+    """Parses the command line options of the stand-alone server.
+
+    Returns:
+        argparse.Namespace: The parsed options
+    """
+
+    parser = argparse.ArgumentParser(description="Local stand-in for the Mindbody schedule widget")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on (default: 8765)")
+    parser.add_argument("--density", type=int, default=6, help="classes per day (default: 6)")
+    parser.add_argument("--latency-ms", type=float, default=50, help="delay added to every response (default: 50)")
+    parser.add_argument("--render-ms", type=float, default=100, help="time the page takes to render a week or the cart (default: 100)")
+    parser.add_argument("--ui-ms", type=float, default=20, help="time the page takes to react to a click (default: 20)")
+    parser.add_argument("--no-datepicker-input", action="store_true", help="ignore dates typed into the datepicker input")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    stand_in = WidgetStandIn(
+        density=args.density,
+        latency=args.latency_ms / 1000,
+        render_delay=args.render_ms / 1000,
+        ui_delay=args.ui_ms / 1000,
+        datepicker_input=not args.no_datepicker_input,
+        port=args.port
+    )
+    print(f"Serving the widget stand-in at {stand_in.url}/metuchen (Ctrl+C to stop)")
+    try:
+        stand_in.server.serve_forever()
+    except KeyboardInterrupt:
+        stand_in.stop()
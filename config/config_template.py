@@ -2,7 +2,18 @@
 MINDBODY_USERNAME = "your_email@example.com"
 MINDBODY_PASSWORD = "your_password"
 MINDBODY_MEMBERSHIP_EXPIRATION_DATE = "year-month-day"
+MINDBODY_LOGIN_URL = "https://cart.mindbodyonline.com/sites/<site_id>/session/new"
+
+# Optional accounts booked together with --members, each one in a browser and session of its own
+MINDBODY_MEMBERS = [
+    {"name": "alex", "username": "alex@example.com", "password": "alex_password"},
+    {"name": "sam", "username": "sam@example.com", "password": "sam_password"}
+]
 
 # Studio URLS
 HYR_METUCHEN_URL = "https://www.hotyogarevolution.com/metuchen"
 HYR_CRANFORD_URL = "https://www.hotyogarevolution.com/cranford"
+
+# Branded-web widget ids of the studio schedules (the number in the widget's schedule requests)
+HYR_METUCHEN_WIDGET_ID = "<metuchen_widget_id>"
+HYR_CRANFORD_WIDGET_ID = "<cranford_widget_id>"
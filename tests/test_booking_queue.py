@@ -0,0 +1,73 @@
+from datetime import date, timedelta
+
+import pytest
+
+from utilities.booking_queue import BookingQueue, MAX_QUEUE_FAILURES
+
+TOMORROW = date.today() + timedelta(days=1)
+YESTERDAY = date.today() - timedelta(days=1)
+
+def make_session(name, start_time="6:00 PM"):
+    return {"name": name, "staff": "Ann Lee", "start_time": start_time, "end_time": "7:00 PM"}
+
+@pytest.fixture
+def queue_path(tmp_path):
+    return str(tmp_path / "booking_queue.jsonl")
+
+def test_add_week_marks_the_week_scanned(queue_path):
+    queue = BookingQueue(queue_path)
+    assert queue.add_week("Metuchen", TOMORROW, "rules", [(TOMORROW, make_session("Hot 60"))]) == 1
+    assert queue.add_week("metuchen", TOMORROW, "rules", [(TOMORROW, make_session("Hot 60"))]) == 0
+    assert queue.is_week_scanned("metuchen", TOMORROW, "rules")
+    assert not queue.is_week_scanned("metuchen", TOMORROW, "other rules")
+
+def test_scanned_week_expires(queue_path):
+    queue = BookingQueue(queue_path, max_age=timedelta(0))
+    queue.add_week("metuchen", TOMORROW, "rules", [])
+    assert not queue.is_week_scanned("metuchen", TOMORROW, "rules")
+
+def test_queue_is_read_back_from_disk(queue_path):
+    BookingQueue(queue_path).add_week("metuchen", TOMORROW, "rules", [(TOMORROW, make_session("Hot 60"))])
+    queue = BookingQueue(queue_path)
+    assert [entry["name"] for entry in queue.get_sessions("metuchen")] == ["Hot 60"]
+    assert queue.is_week_scanned("metuchen", TOMORROW, "rules")
+
+def test_sessions_are_in_booking_order_without_started_classes(queue_path):
+    queue = BookingQueue(queue_path)
+    queue.add_week("metuchen", YESTERDAY, "rules", [
+        (TOMORROW, make_session("Evening", "6:00 PM")),
+        (TOMORROW, make_session("Morning", "6:00 AM")),
+        (YESTERDAY, make_session("Past", "6:00 PM")),
+        (YESTERDAY, make_session("Past without time", ""))
+    ])
+    assert [entry["name"] for entry in queue.get_sessions("metuchen")] == ["Morning", "Evening"]
+    assert queue.get_sessions("cranford") == []
+
+def test_session_is_given_up_after_repeated_failures(queue_path):
+    queue = BookingQueue(queue_path)
+    queue.add_week("metuchen", TOMORROW, "rules", [(TOMORROW, make_session("Full class"))])
+    entry = queue.get_sessions("metuchen")[0]
+
+    results = [queue.record_failure(entry) for _ in range(MAX_QUEUE_FAILURES)]
+    assert results == [False] * (MAX_QUEUE_FAILURES - 1) + [True]
+    assert queue.get_sessions("metuchen") == []
+    assert len(queue.get_sessions("metuchen", member="bob")) == 1
+    assert BookingQueue(queue_path).get_sessions("metuchen") == []
+
+def test_clear_drops_only_the_studio(queue_path):
+    queue = BookingQueue(queue_path)
+    queue.add_week("metuchen", TOMORROW, "rules", [(TOMORROW, make_session("Hot 60"))])
+    queue.add_week("cranford", TOMORROW, "rules", [(TOMORROW, make_session("Yin 75"))])
+    queue.record_failure(queue.get_sessions("metuchen")[0])
+    queue.clear("metuchen")
+
+    reloaded = BookingQueue(queue_path)
+    assert reloaded.get_sessions("metuchen") == []
+    assert not reloaded.is_week_scanned("metuchen", TOMORROW, "rules")
+    assert [entry["name"] for entry in reloaded.get_sessions("cranford")] == ["Yin 75"]
+
+def test_print_summary(queue_path, capsys):
+    queue = BookingQueue(queue_path)
+    queue.add_week("metuchen", TOMORROW, "rules", [(TOMORROW, make_session("Hot 60"))])
+    queue.print_summary("metuchen")
+    assert "1 classes queued for Metuchen" in capsys.readouterr().out
@@ -0,0 +1,91 @@
+from datetime import date, time
+
+import pytest
+
+from utilities.booking_rules import (
+    BookingRule, RuleIndex, get_rule_days, get_rules_key, normalize_name, parse_day, parse_session_time, parse_time
+)
+
+# Tuesday
+CLASS_DATE = date(2026, 10, 20)
+
+def make_session(name="Hot 60", staff="Zoë Müller", start_time="6:00 PM"):
+    return {"name": name, "staff": staff, "start_time": start_time}
+
+def test_rule_from_dict_parses_day_and_time():
+    rule = BookingRule.from_dict({"day": "tue", "time": "18:00", "instructor": "Zoe", "studio": "Metuchen"})
+    assert (rule.day, rule.time, rule.instructor, rule.studio) == ("Tuesday", time(18, 0), "Zoe", "metuchen")
+
+def test_rule_from_dict_rejects_unknown_keys():
+    with pytest.raises(ValueError):
+        BookingRule.from_dict({"teacher": "Zoe"})
+
+def test_rule_applies_to_its_studio_only():
+    assert BookingRule(studio="metuchen").applies_to("Metuchen")
+    assert not BookingRule(studio="metuchen").applies_to("cranford")
+    assert BookingRule().applies_to("cranford")
+
+def test_rule_matches_day_time_and_accent_insensitive_names():
+    rule = BookingRule(day="Tuesday", time=time(18, 0), instructor="zoe muller", class_name="HOT")
+    assert rule.matches(make_session(), CLASS_DATE)
+    assert not rule.matches(make_session(start_time="6:00 AM"), CLASS_DATE)
+    assert not rule.matches(make_session(), date(2026, 10, 21))
+    assert not rule.matches(make_session(name="Yin 75"), CLASS_DATE)
+
+def test_rule_matches_names():
+    rule = BookingRule(instructor="Zoë")
+    assert rule.matches_names(normalize_name("ZOE Smith"), normalize_name("Any class"))
+    assert not rule.matches_names(normalize_name("Ann Lee"), normalize_name("Any class"))
+
+def test_rule_key_ignores_case_and_accents_of_names():
+    assert BookingRule(instructor="Zoë").get_key() == BookingRule(instructor="zoe").get_key()
+    assert BookingRule(time=time(18, 0)).get_key() != BookingRule(time=time(6, 0)).get_key()
+
+def test_rule_describe():
+    assert BookingRule(day="Tuesday", class_name="Hot 60", studio="cranford").describe() == \
+        "Hot 60 on Tuesday at any time with any instructor (Cranford only)"
+
+def test_rule_index_matches_like_the_rules():
+    rules = [
+        BookingRule(day="Tuesday", time=time(18, 0)),
+        BookingRule(instructor="Zoe"),
+        BookingRule(day="Monday"),
+        BookingRule(time=time(6, 0), class_name="yin")
+    ]
+    index = RuleIndex(rules)
+    sessions = [make_session(), make_session(staff="Ann Lee"), make_session(name="Yin 75", start_time="6:00 AM", staff="Ann Lee")]
+    for session in sessions:
+        assert set(index.match(session, CLASS_DATE)) == {rule for rule in rules if rule.matches(session, CLASS_DATE)}
+
+def test_rule_index_key_and_days():
+    rules = [BookingRule(day="Tuesday"), BookingRule(day="Friday")]
+    index = RuleIndex(rules)
+    assert index.key == RuleIndex(list(reversed(rules))).key
+    assert index.days == {"Tuesday", "Friday"}
+
+def test_parse_session_time():
+    assert parse_session_time("9:30 AM") == time(9, 30)
+    assert parse_session_time("noon") is None
+
+def test_normalize_name():
+    assert normalize_name("  Zoë   MÜLLER ") == "zoe muller"
+    assert normalize_name(None) == ""
+
+def test_parse_day():
+    assert parse_day("TUES") == "Tuesday"
+    with pytest.raises(ValueError):
+        parse_day("tu")
+
+def test_parse_time():
+    assert parse_time("9:30 am") == time(9, 30)
+    assert parse_time("18:00") == time(18, 0)
+    with pytest.raises(ValueError):
+        parse_time("25:00")
+
+def test_rules_key_is_independent_of_order():
+    first, second = BookingRule(day="Tuesday"), BookingRule(instructor="Zoe")
+    assert get_rules_key([first, second]) == get_rules_key([second, first])
+
+def test_rule_days():
+    assert get_rule_days([BookingRule(day="Tuesday"), BookingRule(day="Friday")]) == {"Tuesday", "Friday"}
+    assert get_rule_days([BookingRule(day="Tuesday"), BookingRule()]) is None
@@ -0,0 +1,58 @@
+from datetime import date
+
+import pytest
+
+from utilities.scan_planner import ScanPlanner
+
+@pytest.fixture
+def planner():
+    return ScanPlanner()
+
+def test_month_range_starts_today_and_ends_at_expiration(planner):
+    assert planner.get_month_range(2026, 10, today=date(2026, 10, 18)) == (date(2026, 10, 18), date(2026, 10, 31))
+    assert planner.get_month_range(2026, 11, today=date(2026, 10, 18), expiration_date=date(2026, 11, 15)) == (date(2026, 11, 1), date(2026, 11, 15))
+
+def test_month_range_of_leap_february(planner):
+    assert planner.get_month_range(2028, 2, today=date(2028, 1, 1)) == (date(2028, 2, 1), date(2028, 2, 29))
+
+def test_date_ranges_merge_adjacent_months_and_drop_empty_ones(planner):
+    ranges = planner.get_date_ranges(2026, [12, 10, 11], today=date(2026, 10, 18))
+    assert ranges == [(date(2026, 10, 18), date(2026, 12, 31))]
+
+    ranges = planner.get_date_ranges(2026, [10, 12], today=date(2026, 10, 18), expiration_date=date(2026, 11, 30))
+    assert ranges == [(date(2026, 10, 18), date(2026, 10, 31))]
+
+def test_date_ranges_keep_gaps_between_months(planner):
+    ranges = planner.get_date_ranges(2026, [10, 12], today=date(2026, 10, 18))
+    assert ranges == [(date(2026, 10, 18), date(2026, 10, 31)), (date(2026, 12, 1), date(2026, 12, 31))]
+
+def test_anchor_dates_cover_the_range_week_by_week(planner):
+    anchors = planner.plan_anchor_dates(date(2026, 10, 1), date(2026, 10, 31))
+    assert anchors == [date(2026, 10, 1), date(2026, 10, 8), date(2026, 10, 15), date(2026, 10, 22), date(2026, 10, 29)]
+
+def test_anchor_dates_start_on_the_first_matching_day(planner):
+    # October 1, 2026 is a Thursday, the first Tuesday is October 6
+    anchors = planner.plan_anchor_dates(date(2026, 10, 1), date(2026, 10, 31), {"Tuesday"})
+    assert anchors == [date(2026, 10, 6), date(2026, 10, 13), date(2026, 10, 20), date(2026, 10, 27)]
+
+def test_anchor_dates_reach_a_leap_day(planner):
+    assert planner.plan_anchor_dates(date(2028, 2, 1), date(2028, 2, 29), {"Tuesday"})[-1] == date(2028, 2, 29)
+
+def test_anchor_dates_of_an_empty_range(planner):
+    assert planner.plan_anchor_dates(date(2026, 11, 1), date(2026, 10, 31)) == []
+
+def test_view_dates_keep_matching_days_inside_the_range(planner):
+    view_dates = planner.get_view_dates(date(2026, 10, 27), date(2026, 10, 1), date(2026, 10, 31))
+    assert view_dates == [date(2026, 10, 27), date(2026, 10, 28), date(2026, 10, 29), date(2026, 10, 30), date(2026, 10, 31)]
+    assert planner.get_view_dates(date(2026, 10, 27), date(2026, 10, 1), date(2026, 12, 31), {"Monday"}) == [date(2026, 11, 2)]
+
+def test_day_date_of_a_leap_day(planner):
+    assert planner.get_day_date("Tuesday, February 29", date(2028, 2, 29)) == date(2028, 2, 29)
+
+def test_day_date_across_new_year(planner):
+    assert planner.get_day_date("Friday, January 1", date(2026, 12, 28)) == date(2027, 1, 1)
+    assert planner.get_day_date("Thursday, December 31", date(2027, 1, 1)) == date(2026, 12, 31)
+
+def test_day_date_rejects_other_text(planner):
+    with pytest.raises(ValueError):
+        planner.get_day_date("No classes today", date(2026, 10, 18))
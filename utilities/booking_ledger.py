@@ -0,0 +1,246 @@
+from datetime import datetime, timedelta
+import os
+import sqlite3
+import threading
+
+# Default location of the on-disk ledger
+DEFAULT_LEDGER_PATH = os.path.join("data", "booking_ledger.sqlite3")
+
+LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scanned_dates (
+    studio TEXT NOT NULL,
+    date TEXT NOT NULL,
+    filters TEXT NOT NULL,
+    scanned_at TEXT NOT NULL,
+    PRIMARY KEY (studio, date, filters)
+);
+CREATE TABLE IF NOT EXISTS bookings (
+    studio TEXT NOT NULL,
+    date TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    class_name TEXT NOT NULL,
+    member TEXT NOT NULL DEFAULT '',
+    end_time TEXT,
+    staff TEXT,
+    booked_at TEXT NOT NULL,
+    PRIMARY KEY (studio, date, start_time, class_name, member)
+);
+"""
+
+# Bookings of ledgers written before members existed belong to the default account
+BOOKINGS_MEMBER_MIGRATION = """
+ALTER TABLE bookings RENAME TO bookings_without_member;
+CREATE TABLE bookings (
+    studio TEXT NOT NULL,
+    date TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    class_name TEXT NOT NULL,
+    member TEXT NOT NULL DEFAULT '',
+    end_time TEXT,
+    staff TEXT,
+    booked_at TEXT NOT NULL,
+    PRIMARY KEY (studio, date, start_time, class_name, member)
+);
+INSERT INTO bookings (studio, date, start_time, class_name, end_time, staff, booked_at)
+    SELECT studio, date, start_time, class_name, end_time, staff, booked_at FROM bookings_without_member;
+DROP TABLE bookings_without_member;
+"""
+
+class BookingLedger:
+    """Thread-safe record of claimed dates and booking attempts shared by handlers
+
+    Claims only live for the current run. When a path is given, scanned dates
+    and confirmed bookings are also kept in a SQLite file so later runs can skip
+    sessions we already hold and dates that were scanned recently.
+    """
+
+    def __init__(self, path=None, scan_max_age=timedelta(hours=12)):
+        """Initialize the ledger
+
+        Args:
+            path: Optional path of the SQLite file, the ledger is in-memory only without it
+            scan_max_age: How long a scanned date stays fresh before it is scanned again
+        """
+        self.lock = threading.Lock()
+        self.claimed_dates = {}  # (studio, date_key, filters) -> owner that handles the date
+        self.bookings = []  # Booking attempts in the order they finished
+        self.scan_max_age = scan_max_age
+        self.connection = None
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.connection = sqlite3.connect(path, check_same_thread=False)
+            columns = [row[1] for row in self.connection.execute("PRAGMA table_info(bookings)")]
+            if columns and "member" not in columns:
+                self.connection.executescript(BOOKINGS_MEMBER_MIGRATION)
+            self.connection.executescript(LEDGER_SCHEMA)
+            self.connection.commit()
+
+    def claim_date(self, studio, date_key, owner=None, filters=""):
+        """Claim a date so that no other handler with the same filters processes it.
+
+        Handlers of different jobs book different classes on the same date, so
+        a claim only keeps out handlers that scan with the same filters.
+
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            date_key: Date formatted as YYYY-MM-DD
+            owner: Optional label of the handler claiming the date
+            filters: Key describing the filters the date is handled with
+
+        Returns:
+            bool: True if the date was free and is now claimed, False otherwise
+        """
+
+        with self.lock:
+            key = (studio.lower(), date_key, filters)
+            if key in self.claimed_dates:
+                return False
+            self.claimed_dates[key] = owner
+            return True
+
+    def record_scan(self, studio, date_key, filters):
+        """Mark a date as scanned for a set of filters.
+
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            date_key: Date formatted as YYYY-MM-DD
+            filters: Key describing the filters the date was scanned with
+        """
+
+        if not self.connection:
+            return
+
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO scanned_dates (studio, date, filters, scanned_at) VALUES (?, ?, ?, ?)",
+                (studio.lower(), date_key, filters, datetime.now().isoformat())
+            )
+            self.connection.commit()
+
+    def is_scan_fresh(self, studio, date_key, filters):
+        """Check whether a date was scanned with the same filters within scan_max_age.
+
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            date_key: Date formatted as YYYY-MM-DD
+            filters: Key describing the filters of the current run
+
+        Returns:
+            bool: True if the date does not need to be scanned again
+        """
+
+        if not self.connection:
+            return False
+
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT scanned_at FROM scanned_dates WHERE studio = ? AND date = ? AND filters = ?",
+                (studio.lower(), date_key, filters)
+            ).fetchone()
+
+        return bool(row) and datetime.now() - datetime.fromisoformat(row[0]) < self.scan_max_age
+
+    def is_booked(self, studio, class_date, start_time, class_name, member=""):
+        """Check whether a session was booked in this or an earlier run.
+
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            class_date: Date of the class
+            start_time: Session start time text, e.g. '9:30 AM'
+            class_name: Name of the class
+            member: Name of the member the session is booked for, '' for the default account
+
+        Returns:
+            bool: True if the session is already booked
+        """
+
+        key = (studio.lower(), class_date.strftime("%Y-%m-%d"), start_time, class_name, member)
+        with self.lock:
+            for booking in self.bookings:
+                if booking["success"] and (booking["studio"], booking["date"], booking["start_time"], booking["class_name"], booking["member"]) == key:
+                    return True
+
+            if not self.connection:
+                return False
+            row = self.connection.execute(
+                "SELECT 1 FROM bookings WHERE studio = ? AND date = ? AND start_time = ? AND class_name = ? AND member = ?",
+                key
+            ).fetchone()
+        return bool(row)
+
+    def record_booking(self, studio, class_date, start_time, end_time, class_name, staff, success, member=""):
+        """Store the outcome of a booking attempt.
+
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            class_date: Date of the class
+            start_time: Session start time text, e.g. '9:30 AM'
+            end_time: Session end time text
+            class_name: Name of the class
+            staff: Instructor name
+            success: Whether the booking was confirmed
+            member: Name of the member the session was booked for, '' for the default account
+        """
+
+        with self.lock:
+            self.bookings.append({
+                "studio": studio.lower(),
+                "date": class_date.strftime("%Y-%m-%d"),
+                "start_time": start_time,
+                "end_time": end_time,
+                "class_name": class_name,
+                "staff": staff,
+                "member": member,
+                "success": success
+            })
+
+            if self.connection and success:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO bookings (studio, date, start_time, class_name, member, end_time, staff, booked_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (studio.lower(), class_date.strftime("%Y-%m-%d"), start_time, class_name, member, end_time, staff, datetime.now().isoformat())
+                )
+                self.connection.commit()
+
+    def restore_bookings(self, bookings):
+        """Add the booking attempts of an interrupted run that is being resumed.
+
+        Args:
+            bookings: Booking attempts as returned by get_bookings
+        """
+
+        with self.lock:
+            self.bookings.extend(dict(booking, member=booking.get("member", "")) for booking in bookings)
+
+    def get_bookings(self):
+        """Return a sorted copy of all recorded booking attempts"""
+
+        with self.lock:
+            return sorted(self.bookings, key=lambda booking: (booking["date"], booking["start_time"], booking["studio"], booking["member"]))
+
+    def print_summary(self):
+        """Print every booking attempt recorded in the ledger"""
+
+        bookings = self.get_bookings()
+        booked = [booking for booking in bookings if booking["success"]]
+
+        print("\n-------------------------------------------------------")
+        print("Booking summary:")
+        print(f"    Dates processed: {len({key[:2] for key in self.claimed_dates})}")
+        print(f"    Classes booked: {len(booked)} of {len(bookings)} attempted")
+        for booking in bookings:
+            status = "Booked" if booking["success"] else "Failed"
+            member = f" for {booking['member']}" if booking["member"] else ""
+            print(f"    {status}: {booking['date']} {booking['start_time']} - {booking['end_time']} "
+                  f"{booking['class_name']} with {booking['staff']} ({booking['studio'].title()}){member}")
+        print("-------------------------------------------------------")
+
+    def close(self):
+        """Close the SQLite connection, if any"""
+
+        with self.lock:
+            if self.connection:
+                self.connection.close()
+                self.connection = None
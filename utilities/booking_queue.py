@@ -0,0 +1,222 @@
+from datetime import datetime, timedelta
+import json
+import os
+import threading
+
+# Default file holding the sessions found by the scan stage of a pipelined run
+DEFAULT_QUEUE_PATH = os.path.join("data", "booking_queue.jsonl")
+
+# Session fields stored in the queue; the element index is only valid on the live page
+QUEUE_FIELDS = ("date", "name", "staff", "start_time", "end_time")
+
+# Failed booking attempts after which a queued session is given up for a member, e.g. a class that stays full
+MAX_QUEUE_FAILURES = 3
+
+class BookingQueue:
+    """Sessions found by the scan stage, waiting for the booking stage
+
+    The queue is an append-only JSON lines file. Each scanned week adds its
+    matching sessions followed by a marker line for the week, so a scan that
+    is interrupted resumes after the last week that was fully written.
+    Failed booking attempts are appended too; sessions that have started or
+    failed MAX_QUEUE_FAILURES times are no longer handed out for booking.
+    """
+
+    def __init__(self, path=None, max_age=timedelta(hours=12)):
+        """Initialize the queue
+
+        Args:
+            path: Optional JSON lines file, memory only without it
+            max_age: How long a scanned week is trusted before it has to be scanned again
+        """
+        self.path = path
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.weeks = {}  # (studio, anchor date_key, rules key) -> scanned_at datetime
+        self.sessions = {}  # (studio, date, start_time, name) -> queue entry
+        self.failures = {}  # ((studio, date, start_time, name), member) -> failed booking attempts
+        self.load()
+
+    def load(self):
+        """Helper method to read the queue file left by an earlier scan"""
+
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        with open(self.path) as queue_file:
+            for line in queue_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # A line cut short by an interrupted write
+                if entry.get("kind") == "week":
+                    self.weeks[(entry["studio"], entry["anchor"], entry["rules"])] = datetime.fromisoformat(entry["scanned_at"])
+                elif entry.get("kind") == "session":
+                    self.sessions[self.get_key(entry)] = entry
+                elif entry.get("kind") == "failure":
+                    failure_key = (self.get_key(entry), entry.get("member", ""))
+                    self.failures[failure_key] = self.failures.get(failure_key, 0) + 1
+
+    def get_key(self, entry):
+        """Helper method to build the key identifying a queued session"""
+
+        return (entry["studio"], entry["date"], entry["start_time"], entry["name"])
+
+    def is_week_scanned(self, studio, anchor, rules_key):
+        """Check whether a week view was scanned with the same rules recently.
+
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            anchor: First date of the week view
+            rules_key: RuleIndex.key of the rules of the run
+
+        Returns:
+            bool: Whether the week can be skipped by the scan stage
+        """
+
+        with self.lock:
+            scanned_at = self.weeks.get((studio.lower(), anchor.strftime("%Y-%m-%d"), rules_key))
+            return scanned_at is not None and datetime.now() - scanned_at < self.max_age
+
+    def add_week(self, studio, anchor, rules_key, sessions):
+        """Queue the matching sessions of a scanned week and mark the week as scanned.
+
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            anchor: First date of the week view
+            rules_key: RuleIndex.key of the rules of the run
+            sessions: List of (class_date, session record) pairs to book
+
+        Returns:
+            int: Number of sessions that were not queued yet
+        """
+
+        studio = studio.lower()
+        now = datetime.now()
+        lines = []
+
+        with self.lock:
+            added = 0
+            for class_date, session in sessions:
+                entry = {field: session.get(field, "") for field in QUEUE_FIELDS}
+                entry.update({"kind": "session", "studio": studio, "date": class_date.strftime("%Y-%m-%d")})
+                if self.get_key(entry) not in self.sessions:
+                    added += 1
+                self.sessions[self.get_key(entry)] = entry
+                lines.append(entry)
+
+            week_key = (studio, anchor.strftime("%Y-%m-%d"), rules_key)
+            self.weeks[week_key] = now
+            lines.append({"kind": "week", "studio": studio, "anchor": week_key[1], "rules": rules_key, "scanned_at": now.isoformat()})
+
+            if self.path:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a") as queue_file:
+                    queue_file.write("".join(json.dumps(line) + "\n" for line in lines))
+                    queue_file.flush()
+                    os.fsync(queue_file.fileno())
+
+        return added
+
+    def get_sessions(self, studio, member=""):
+        """Get the queued sessions of a studio that are still worth booking, in booking order.
+
+        Sessions that have already started, or that failed to book for the
+        member MAX_QUEUE_FAILURES times, are left out.
+
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            member: Name of the member booking, '' for the default account
+
+        Returns:
+            List of queue entries sorted by date and start time
+        """
+
+        now = datetime.now()
+        with self.lock:
+            entries = [
+                entry for key, entry in self.sessions.items()
+                if key[0] == studio.lower() and self.failures.get((key, member), 0) < MAX_QUEUE_FAILURES
+            ]
+
+        def booking_order(entry):
+            start_time = self.get_start_time(entry)
+            return (entry["date"], start_time is None, start_time or datetime.min.time())
+
+        return sorted([entry for entry in entries if not self.has_started(entry, now)], key=booking_order)
+
+    def record_failure(self, entry, member=""):
+        """Count a failed booking attempt of a queued session.
+
+        Args:
+            entry: Queue entry from get_sessions
+            member: Name of the member booking, '' for the default account
+
+        Returns:
+            bool: Whether the session is now given up for the member
+        """
+
+        failure_key = (self.get_key(entry), member)
+        with self.lock:
+            self.failures[failure_key] = self.failures.get(failure_key, 0) + 1
+            if self.path:
+                line = {field: entry[field] for field in ("studio", "date", "start_time", "name")}
+                line.update({"kind": "failure", "member": member, "failed_at": datetime.now().isoformat()})
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a") as queue_file:
+                    queue_file.write(json.dumps(line) + "\n")
+            return self.failures[failure_key] >= MAX_QUEUE_FAILURES
+
+    def get_start_time(self, entry):
+        """Helper method to parse the start time of a queue entry, None if it has none"""
+
+        try:
+            return datetime.strptime(entry["start_time"].strip(), "%I:%M %p").time()
+        except ValueError:
+            return None
+
+    def has_started(self, entry, now):
+        """Helper method to check whether a queued class has started, or its day has passed when it has no start time"""
+
+        class_date = datetime.strptime(entry["date"], "%Y-%m-%d").date()
+        start_time = self.get_start_time(entry)
+        if start_time is None:
+            return class_date < now.date()
+        return datetime.combine(class_date, start_time) <= now
+
+    def clear(self, studio):
+        """Drop the queued sessions and scanned weeks of a studio once they are booked"""
+
+        studio = studio.lower()
+        with self.lock:
+            self.sessions = {key: entry for key, entry in self.sessions.items() if key[0] != studio}
+            self.weeks = {key: scanned_at for key, scanned_at in self.weeks.items() if key[0] != studio}
+            self.failures = {key: count for key, count in self.failures.items() if key[0][0] != studio}
+
+            if not self.path:
+                return
+
+            # Rewrite the file with what is left for the other studios
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w") as queue_file:
+                for entry in self.sessions.values():
+                    queue_file.write(json.dumps(entry) + "\n")
+                for (week_studio, anchor, rules_key), scanned_at in self.weeks.items():
+                    queue_file.write(json.dumps({
+                        "kind": "week", "studio": week_studio, "anchor": anchor,
+                        "rules": rules_key, "scanned_at": scanned_at.isoformat()
+                    }) + "\n")
+                for ((failure_studio, date_key, start_time, name), member), count in self.failures.items():
+                    line = {"kind": "failure", "studio": failure_studio, "date": date_key, "start_time": start_time, "name": name, "member": member}
+                    queue_file.write((json.dumps(line) + "\n") * count)
+            os.replace(temp_path, self.path)
+
+    def print_summary(self, studio):
+        """Print the sessions queued for a studio"""
+
+        entries = self.get_sessions(studio)
+        print("\n-------------------------------------------------------")
+        print(f"{len(entries)} classes queued for {studio.title()}")
+        for entry in entries:
+            print(f"    {entry['date']} {entry['start_time']} {entry['name']} with {entry['staff']}")
+        print("-------------------------------------------------------")
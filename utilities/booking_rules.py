@@ -0,0 +1,252 @@
+from datetime import datetime
+from functools import lru_cache
+import calendar
+import unicodedata
+
+# Accepted formats of a rule's time, e.g. '9:30 AM' or '18:00'
+RULE_TIME_FORMATS = ("%I:%M %p", "%H:%M")
+
+# Keys a rule read from a job file may use
+RULE_KEYS = ("day", "time", "instructor", "class_name", "studio")
+
+class BookingRule:
+    """A combination of filters a session has to pass to be booked"""
+
+    def __init__(self, day=None, time=None, instructor=None, class_name=None, studio=None):
+        """Initialize the rule, every filter left as None matches anything
+
+        Args:
+            day: Optional day of week name, e.g. 'Tuesday'
+            time: Optional datetime.time the class starts at
+            instructor: Optional instructor name (or part of it)
+            class_name: Optional class name (or part of it)
+            studio: Optional studio name ('cranford' or 'metuchen') the rule is limited to
+        """
+        self.day = day
+        self.time = time
+        self.instructor = instructor
+        self.class_name = class_name
+        self.studio = studio.lower() if studio else None
+        self.instructor_key = normalize_name(instructor)
+        self.class_name_key = normalize_name(class_name)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a rule from a job file entry.
+
+        Args:
+            data: Dict using keys from RULE_KEYS
+
+        Returns:
+            BookingRule: The parsed rule
+
+        Raises:
+            ValueError: If the entry has unknown keys or invalid values
+        """
+
+        unknown_keys = set(data) - set(RULE_KEYS)
+        if unknown_keys:
+            raise ValueError(f"Unknown rule keys: {', '.join(sorted(unknown_keys))}")
+
+        return cls(
+            day=parse_day(data["day"]) if data.get("day") else None,
+            time=parse_time(data["time"]) if data.get("time") else None,
+            instructor=data.get("instructor") or None,
+            class_name=data.get("class_name") or None,
+            studio=data.get("studio") or None
+        )
+
+    def applies_to(self, studio):
+        """Check whether the rule is used at a studio"""
+
+        return not self.studio or self.studio == studio.lower()
+
+    def matches(self, session, class_date):
+        """Check a session record against the rule.
+
+        Args:
+            session: Session record from SessionUtils.extract_week or the schedule cache
+            class_date: Date of the class
+
+        Returns:
+            bool: Whether the session passes every filter of the rule
+        """
+
+        # Only check time if it is specified
+        if self.time and parse_session_time(session["start_time"]) != self.time:
+            return False
+
+        # Only check day if it is specified
+        if self.day and class_date.strftime("%A") != self.day:
+            return False
+
+        return self.matches_names(normalize_name(session["staff"]), normalize_name(session["name"]))
+
+    def matches_names(self, staff_key, name_key):
+        """Check normalized instructor and class names against the rule.
+
+        Args:
+            staff_key: Instructor name passed through normalize_name
+            name_key: Class name passed through normalize_name
+
+        Returns:
+            bool: Whether both names contain the rule's filters
+        """
+
+        if self.instructor_key and self.instructor_key not in staff_key:
+            return False
+        if self.class_name_key and self.class_name_key not in name_key:
+            return False
+        return True
+
+    def get_key(self):
+        """Return a string identifying the filters of the rule"""
+
+        time_key = self.time.strftime("%H:%M") if self.time else ""
+        return f"{self.day or ''}|{time_key}|{self.instructor_key}|{self.class_name_key}"
+
+    def describe(self):
+        """Return a readable summary of the rule"""
+
+        parts = [
+            self.class_name or "any class",
+            f"on {self.day}" if self.day else "on any day",
+            f"at {self.time.strftime('%I:%M %p')}" if self.time else "at any time",
+            f"with {self.instructor}" if self.instructor else "with any instructor"
+        ]
+        if self.studio:
+            parts.append(f"({self.studio.title()} only)")
+        return " ".join(parts)
+
+class RuleIndex:
+    """Rules compiled once per run into buckets keyed by (day, start time)
+
+    A session only has to look at the bucket of its own day and time plus the
+    buckets of rules that leave the day or time open, so resolving a session
+    costs the same however many rules there are.
+    """
+
+    def __init__(self, rules):
+        """Compile the rules
+
+        Args:
+            rules: List of BookingRule
+        """
+        self.rules = list(rules)
+        self.key = get_rules_key(self.rules)
+        self.days = get_rule_days(self.rules)
+        self.buckets = {}  # (day name or None, datetime.time or None) -> rules
+        for rule in self.rules:
+            self.buckets.setdefault((rule.day, rule.time), []).append(rule)
+
+    def match(self, session, class_date):
+        """Resolve a session record to the rules it matches.
+
+        Args:
+            session: Session record from SessionUtils.extract_week or the schedule cache
+            class_date: Date of the class
+
+        Returns:
+            List of the matching rules, empty if none
+        """
+
+        day = calendar.day_name[class_date.weekday()]
+        start_time = parse_session_time(session["start_time"])
+
+        keys = [(day, None), (None, None)]
+        if start_time:
+            keys = [(day, start_time), (None, start_time)] + keys
+
+        staff_key = normalize_name(session["staff"])
+        name_key = normalize_name(session["name"])
+
+        matched = []
+        for key in keys:
+            for rule in self.buckets.get(key, ()):
+                if rule.matches_names(staff_key, name_key):
+                    matched.append(rule)
+        return matched
+
+@lru_cache(maxsize=1024)
+def parse_session_time(text):
+    """Parse a session start time such as '9:30 AM', once per distinct text.
+
+    Args:
+        text: Start time text from the schedule
+
+    Returns:
+        datetime.time or None: The parsed time, None if the text is not a time
+    """
+
+    try:
+        return datetime.strptime(text.strip(), "%I:%M %p").time()
+    except ValueError:
+        print(f"Error parsing session time: {text}")
+        return None
+
+@lru_cache(maxsize=1024)
+def normalize_name(text):
+    """Normalize a name for matching: no accents, case or extra whitespace.
+
+    Args:
+        text: Instructor or class name, may be None
+
+    Returns:
+        str: The normalized name, '' for None
+    """
+
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(character for character in decomposed if not unicodedata.combining(character))
+    return " ".join(stripped.casefold().split())
+
+def parse_day(value):
+    """Parse a day of week name, full or abbreviated to at least three letters.
+
+    Args:
+        value: Day name such as 'Tuesday', 'tue' or 'TUES'
+
+    Returns:
+        str: The full day name, e.g. 'Tuesday'
+
+    Raises:
+        ValueError: If the value is not a day of the week
+    """
+
+    text = str(value).strip().lower()
+    if len(text) >= 3:
+        for day in calendar.day_name:
+            if day.lower().startswith(text):
+                return day
+    raise ValueError(f"Invalid day: {value}")
+
+def parse_time(value):
+    """Parse a time such as '9:30 AM' or '18:00'.
+
+    Args:
+        value: Time text
+
+    Returns:
+        datetime.time: The parsed time
+
+    Raises:
+        ValueError: If the value matches none of RULE_TIME_FORMATS
+    """
+
+    for time_format in RULE_TIME_FORMATS:
+        try:
+            return datetime.strptime(str(value).strip().upper(), time_format).time()
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid time: {value}")
+
+def get_rules_key(rules):
+    """Return a string identifying a set of rules, independent of their order"""
+
+    return "||".join(sorted(rule.get_key() for rule in rules))
+
+def get_rule_days(rules):
+    """Return the day names the rules are limited to, or None if any day can match"""
+
+    if any(not rule.day for rule in rules):
+        return None
+    return {rule.day for rule in rules}
@@ -0,0 +1,216 @@
+from selenium.webdriver.common.by import By
+from datetime import datetime, timedelta
+import json
+import os
+import time
+
+from utilities.tracer import traced
+from resources.html_selectors import *
+
+# Seconds before a deadline the timer stops sleeping and spins on the monotonic clock
+SPIN_WINDOW = 0.2
+
+# Seconds after the release time the sniper keeps trying to reach the cart button
+FIRE_TIMEOUT = 20
+
+# Times the week is read again when the widget re-renders before the class's element is found
+SESSION_LOOKUP_ATTEMPTS = 3
+
+# How long before the release time the session is logged in, navigated and expanded
+DEFAULT_PREPARE_LEAD = timedelta(seconds=90)
+
+# One JSON line per shot with the latency reached
+SNIPER_LOG_PATH = os.path.join("data", "sniper_results.jsonl")
+
+class BookingSniper:
+    """Class to book a single class the moment its booking window opens"""
+
+    def __init__(self, handler):
+        """Initialize the sniper
+
+        Args:
+            handler: MindbodyHandler whose utilities and ledger the sniper uses
+        """
+        self.handler = handler
+
+    def run(self, driver, studio, class_date, rule, release_time, prepare_lead=DEFAULT_PREPARE_LEAD):
+        """Prepare the session ahead of the release time and book it at that moment.
+
+        Args:
+            driver: Selenium webdriver instance with the studio page loaded
+            studio: Studio name ('cranford' or 'metuchen')
+            class_date: Date of the class
+            rule: BookingRule identifying the class on that date
+            release_time: datetime at which the booking window opens
+            prepare_lead: timedelta before release_time at which preparation starts
+
+        Returns:
+            bool: Whether the class was booked
+        """
+
+        print("-------------------------------------------------------")
+        print(f"Sniper armed for {rule.describe()} on {class_date.strftime('%A, %B %d, %Y')}")
+        print(f"    Booking window opens at {release_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        print("-------------------------------------------------------")
+
+        self.wait_until(release_time - prepare_lead)
+
+        session = self.prepare(driver, studio, class_date, rule)
+        if not session:
+            return False
+
+        print(f"\nReady. Waiting for {release_time.strftime('%H:%M:%S')}...")
+        release_clock = self.wait_until(release_time)
+        return self.fire(driver, studio, class_date, rule, session, release_clock, release_time)
+
+    @traced("sleep")
+    def wait_until(self, wall_time):
+        """Block until a wall-clock time, timed on the monotonic clock.
+
+        Sleeps in short steps until SPIN_WINDOW before the deadline, then spins,
+        so the wake-up is not delayed by sleep granularity.
+
+        Args:
+            wall_time: datetime to wait for
+
+        Returns:
+            float: The deadline on the time.monotonic() clock
+        """
+
+        deadline = time.monotonic() + (wall_time - datetime.now()).total_seconds()
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return deadline
+            if remaining > SPIN_WINDOW:
+                time.sleep(min(remaining - SPIN_WINDOW, 1.0))
+
+    def prepare(self, driver, studio, class_date, rule):
+        """Log in, show the class's day and expand the class before the window opens.
+
+        Args:
+            driver: Selenium webdriver instance
+            studio: Studio name ('cranford' or 'metuchen')
+            class_date: Date of the class
+            rule: BookingRule identifying the class
+
+        Returns:
+            dict or None: Session record of the class, None if it could not be found
+        """
+
+        print("\nPreparing session...")
+        self.handler.session_manager.start(driver, self.handler.modal_utils)
+
+        session = self.show_target_session(driver, studio, class_date, rule)
+        if not session:
+            print("Could not find the class on the schedule, sniper stopped")
+            return None
+
+        print(f"    Found {session['name']} at {session['start_time']} with {session['staff']}")
+        return session
+
+    def show_target_session(self, driver, studio, class_date, rule):
+        """Helper method to show the class's week, find the class and expand its details"""
+
+        if not self.handler.calendar_utils.jump_to_date(driver, studio, class_date):
+            return None
+
+        for _ in range(SESSION_LOOKUP_ATTEMPTS):
+            session = self.find_target_session(driver, class_date, rule)
+            if not session:
+                return None
+            session_element = self.handler.session_utils.find_live_session(driver, session)
+            if session_element:
+                session_element.find_element(By.CLASS_NAME, SESSION_BASICS).click()
+                return session
+            # The widget re-rendered between reading the week and the lookup, read it again
+        return None
+
+    def find_target_session(self, driver, class_date, rule):
+        """Helper method to return the session record of the first class of the day matching the rule"""
+
+        for day in self.handler.session_utils.extract_week(driver) or []:
+            try:
+                day_date = self.handler.scan_planner.get_day_date(day["date"], class_date)
+            except ValueError:
+                continue
+            if day_date != class_date:
+                continue
+
+            for session in day["sessions"]:
+                if rule.matches(session, class_date):
+                    return session
+        return None
+
+    def find_cart_button(self, driver, session):
+        """Helper method to return the session's cart button if it can be clicked"""
+
+        session_element = self.handler.session_utils.find_live_session(driver, session)
+        if not session_element:
+            return None
+        for cart_button in session_element.find_elements(By.CLASS_NAME, SESSION_CART_BUTTON):
+            if cart_button.is_displayed() and cart_button.is_enabled():
+                return cart_button
+        return None
+
+    def fire(self, driver, studio, class_date, rule, session, release_clock, release_time):
+        """Click the cart button and confirm the booking as soon as possible.
+
+        If the page was rendered before the window opened and shows no cart
+        button yet, the page is reloaded and the class expanded again until
+        FIRE_TIMEOUT runs out.
+
+        Args:
+            driver: Selenium webdriver instance
+            studio: Studio name ('cranford' or 'metuchen')
+            class_date: Date of the class
+            rule: BookingRule identifying the class
+            session: Session record returned by prepare
+            release_clock: The release time on the time.monotonic() clock (T0)
+            release_time: The release time as a datetime, for the log
+
+        Returns:
+            bool: Whether the class was booked
+        """
+
+        while time.monotonic() - release_clock < FIRE_TIMEOUT:
+            cart_button = self.find_cart_button(driver, session)
+
+            if cart_button:
+                cart_button.click()
+                booked = self.handler.modal_utils.handle_booking_modal(driver)
+                latency = time.monotonic() - release_clock
+                self.record_shot(studio, class_date, session, booked, latency, release_time)
+                return booked
+
+            # The booking window opened after the page rendered, load it again
+            driver.refresh()
+            session = self.show_target_session(driver, studio, class_date, rule) or session
+
+        print(f"\nNo cart button within {FIRE_TIMEOUT}s of the release time, sniper stopped")
+        return False
+
+    def record_shot(self, studio, class_date, session, booked, latency, release_time):
+        """Helper method to store the outcome and latency of a shot in the ledger and the sniper log"""
+
+        self.handler.ledger.record_booking(
+            studio, class_date, session["start_time"], session["end_time"], session["name"], session["staff"], booked,
+            member=self.handler.member.name
+        )
+
+        print("\n-------------------------------------------------------")
+        print(f"{'Booked' if booked else 'Could not book'} {session['name']} at {session['start_time']}")
+        print(f"    Latency from release to confirmation: {latency:.3f}s")
+        print("-------------------------------------------------------")
+
+        os.makedirs(os.path.dirname(SNIPER_LOG_PATH), exist_ok=True)
+        with open(SNIPER_LOG_PATH, "a") as log_file:
+            log_file.write(json.dumps({
+                "studio": studio.lower(),
+                "date": class_date.strftime("%Y-%m-%d"),
+                "start_time": session["start_time"],
+                "class_name": session["name"],
+                "release_time": release_time.isoformat(),
+                "booked": booked,
+                "latency_seconds": round(latency, 3)
+            }) + "\n")
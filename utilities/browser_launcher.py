@@ -0,0 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
+
+class BrowserLauncher:
+    """Starts a browser in the background while the user answers the prompts
+
+    Work is queued on a single thread, so steps run in order on the same
+    browser: the launch starts right away, and the studio page can be queued
+    as soon as the studio is known. get() then waits only for whatever has not
+    finished yet.
+    """
+
+    def __init__(self, start_browser):
+        """Initialize the launcher and start the browser
+
+        Args:
+            start_browser: Callable returning a new webdriver
+        """
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="browser-launcher")
+        self.launch = self.executor.submit(start_browser)
+        self.steps = [self.launch]
+        self.taken = False
+
+    def queue(self, step):
+        """Run a step on the browser once it is up, e.g. loading the studio page.
+
+        Args:
+            step: Callable taking the webdriver
+        """
+
+        self.steps.append(self.executor.submit(lambda: step(self.launch.result())))
+
+    def get(self):
+        """Wait for the browser and every queued step.
+
+        Returns:
+            webdriver: The launched browser, now owned by the caller
+
+        Raises:
+            Exception: Whatever the launch or a queued step raised
+        """
+
+        try:
+            for step in self.steps:
+                step.result()
+        except Exception:
+            self.close()
+            raise
+        finally:
+            self.executor.shutdown(wait=False)
+
+        self.taken = True
+        return self.launch.result()
+
+    def close(self):
+        """Quit the browser unless get() handed it out, waiting for a launch still in progress"""
+
+        self.executor.shutdown(wait=True)
+        if self.taken or self.launch.exception():
+            return
+        self.launch.result().quit()
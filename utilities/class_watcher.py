@@ -0,0 +1,284 @@
+from datetime import datetime, timedelta
+import time
+
+from utilities.booking_rules import parse_session_time
+from utilities.schedule_sources import SeleniumScheduleSource
+from utilities.tracer import traced
+
+# Cart button labels of a class that has no open spot, compared in lowercase
+FULL_CART_LABELS = ("waitlist", "wait list", "join waitlist", "full", "class full", "sold out")
+
+# Shortest and longest pause between two polls, in seconds
+MIN_POLL_INTERVAL = 30
+MAX_POLL_INTERVAL = 15 * 60
+
+# Factor the pause grows by after a poll that saw no change
+POLL_BACKOFF = 1.5
+
+# The pause never exceeds this share of the time left until the next watched class starts
+POLL_SHARE_OF_TIME_LEFT = 1 / 12
+
+# How long before the start a class stops being watched, bookings usually close then
+WATCH_CUTOFF = timedelta(minutes=5)
+
+# Polls in a row without a matching class after which a watched class is given up
+MAX_MISSING_POLLS = 10
+
+def is_spot_open(session):
+    """Check whether a session record shows a cart button that books a spot
+
+    Args:
+        session: Session record from SessionUtils.extract_week or a ScheduleSource
+
+    Returns:
+        bool: Whether the class can be booked right now
+    """
+
+    label = session.get("cart_label", "").strip().lower()
+    return bool(session.get("cart_enabled")) and label not in FULL_CART_LABELS
+
+class ClassWatcher:
+    """Class to wait for spots to free up in full classes and book them right away
+
+    Only the days of the watched classes are polled. Every poll is compared
+    with the previous observation of each class, and the pause between polls
+    backs off while nothing changes, drops back to the minimum after a change,
+    and shrinks as the next class gets closer.
+    """
+
+    def __init__(self, handler):
+        """Initialize the watcher
+
+        Args:
+            handler: MindbodyHandler whose utilities, schedule source and ledger the watcher uses
+        """
+        self.handler = handler
+        self.observations = {}  # (date_key, start_time, name) -> (cart_label, cart_enabled)
+        self.finished = set()  # (date_key, start_time, name) of classes booked or about to start
+        self.missing_polls = {}  # (class_date, rule key) -> polls in a row without a matching class
+
+    def run(self, driver, studio, targets, until=None):
+        """Watch classes until each one is booked, about to start, or until is reached.
+
+        A rule matching several classes of its day keeps watching each of them.
+
+        Args:
+            driver: Selenium webdriver instance with the studio page loaded
+            studio: Studio name ('cranford' or 'metuchen')
+            targets: List of (class_date, BookingRule) identifying the classes to watch
+            until: Optional datetime at which watching stops
+
+        Returns:
+            int: Number of classes booked
+        """
+
+        pending = list(targets)
+        booked_count = 0
+        interval = MIN_POLL_INTERVAL
+
+        print("-------------------------------------------------------")
+        print(f"Watching {len(pending)} classes at {studio.title()}")
+        for class_date, rule in pending:
+            print(f"    {rule.describe()} on {class_date.strftime('%A, %B %d, %Y')}")
+        print("-------------------------------------------------------")
+
+        while pending:
+            if self.handler.is_cancelled() or (until and datetime.now() >= until):
+                break
+
+            changed = False
+            next_start = None
+            days = {}  # Each watched day is read once per poll, however many classes it holds
+            for target in list(pending):
+                class_date, rule = target
+                if class_date not in days:
+                    days[class_date] = self.read_day(driver, studio, class_date)
+                outcome, class_start, booked = self.check_target(driver, studio, class_date, rule, days[class_date])
+                changed = changed or booked > 0 or outcome == "changed"
+                booked_count += booked
+                if outcome == "over" or self.is_target_expired(class_date, rule, outcome):
+                    pending.remove(target)
+                elif class_start and (next_start is None or class_start < next_start):
+                    next_start = class_start
+
+            if not pending:
+                break
+
+            interval = self.get_poll_interval(interval, changed, next_start)
+            print(f"Next check in {interval:.0f}s ({datetime.now() + timedelta(seconds=interval):%H:%M:%S})")
+            self.pause(interval, until)
+
+        print("\n-------------------------------------------------------")
+        print(f"Watch finished: {booked_count} booked, {len(pending)} still full")
+        print("-------------------------------------------------------")
+        return booked_count
+
+    def check_target(self, driver, studio, class_date, rule, sessions):
+        """Helper method to compare the classes matching a rule with their last observation and book any with an open spot.
+
+        Every match is watched on its own; one that is booked or about to
+        start is left out while the others are still watched.
+
+        Args:
+            driver: Selenium webdriver instance
+            studio: Studio name ('cranford' or 'metuchen')
+            class_date: Date of the class
+            rule: BookingRule identifying the class
+            sessions: Session records of the day from read_day, None if it could not be read
+
+        Returns:
+            Tuple (outcome, start datetime of the next watched match or None, number of classes booked);
+            outcome is 'over' (no match left to watch), 'booked', 'changed', 'unchanged',
+            'missing' (no class matches) or 'unread' (the day could not be read)
+        """
+
+        date_key = class_date.strftime("%Y-%m-%d")
+        if sessions is None:
+            return "unread", None, 0  # A failed read says nothing about whether the class exists
+
+        matches = [session for session in sessions if rule.matches(session, class_date)]
+        if not matches:
+            print(f"No class matching {rule.describe()} on {date_key}")
+            return "missing", None, 0
+
+        outcome = "unchanged"
+        next_start = None
+        booked = 0
+        watching = 0
+        for session in matches:
+            key = (date_key, session["start_time"], session["name"])
+            if key in self.finished:
+                continue
+            if self.handler.is_booked(studio, class_date, session):
+                print(f"{session['name']} at {session['start_time']} on {date_key} is already booked")
+                self.finished.add(key)
+                continue
+            start_time = parse_session_time(session["start_time"])
+            class_start = datetime.combine(class_date, start_time) if start_time else None
+            if class_start and datetime.now() > class_start - WATCH_CUTOFF:
+                print(f"{session['name']} at {session['start_time']} on {date_key} starts soon, no longer watching it")
+                self.finished.add(key)
+                continue
+
+            observation = (session.get("cart_label", ""), bool(session.get("cart_enabled")))
+            previous = self.observations.get(key)
+            self.observations[key] = observation
+            if previous is not None and previous != observation:
+                print(f"{session['name']} at {session['start_time']} on {date_key}: "
+                      f"'{previous[0] or 'no button'}' -> '{observation[0] or 'no button'}'")
+                outcome = "changed"
+
+            if is_spot_open(session):
+                print(f"\nA spot is open in {session['name']} at {session['start_time']} on {date_key}, booking...")
+                if self.book(driver, studio, class_date, session):
+                    booked += 1
+                    self.finished.add(key)
+                    continue
+                outcome = "changed"  # Taken again before we got it, keep polling closely
+
+            watching += 1
+            if class_start and (next_start is None or class_start < next_start):
+                next_start = class_start
+
+        if not watching:
+            return "over", None, booked
+        return "booked" if booked else outcome, next_start, booked
+
+    def is_target_expired(self, class_date, rule, outcome):
+        """Helper method to check whether a watched class can no longer show up.
+
+        A class whose day has passed is given up right away, one that was
+        missing from MAX_MISSING_POLLS polls in a row is given up as well.
+
+        Args:
+            class_date: Date of the class
+            rule: BookingRule identifying the class
+            outcome: Outcome of the last check_target
+
+        Returns:
+            bool: Whether to stop watching the class
+        """
+
+        if class_date < datetime.now().date():
+            print(f"{rule.describe()} on {class_date.strftime('%Y-%m-%d')} is in the past, no longer watching it")
+            return True
+
+        key = (class_date, rule.describe())
+        if outcome == "unread":
+            return False
+        self.missing_polls[key] = self.missing_polls.get(key, 0) + 1 if outcome == "missing" else 0
+        if self.missing_polls[key] < MAX_MISSING_POLLS:
+            return False
+        print(f"No class matching {rule.describe()} on {class_date.strftime('%Y-%m-%d')} in {MAX_MISSING_POLLS} polls, no longer watching it")
+        return True
+
+    def read_day(self, driver, studio, class_date):
+        """Helper method to read the current sessions of one day, fresh from the server.
+
+        Returns:
+            List of session records, or None if the day could not be read
+        """
+
+        source = self.handler.get_schedule_source(driver)
+        if isinstance(source, SeleniumScheduleSource):
+            driver.refresh()  # The widget keeps weeks it already showed, reload to see freed spots
+        week = source.get_week(studio, class_date)
+        if week is None:
+            print(f"Could not read {class_date.strftime('%B %d')}")
+            return None
+        return week.get(class_date.strftime("%Y-%m-%d"), [])
+
+    def book(self, driver, studio, class_date, session):
+        """Helper method to book a session on the live page.
+
+        The session is looked up again in the browser, since records read over
+        HTTP or before a refresh carry no index of the live page.
+        """
+
+        if not self.handler.calendar_utils.jump_to_date(driver, studio, class_date):
+            print(f"Could not show {class_date.strftime('%B %d')}")
+            return False
+
+        for day in self.handler.session_utils.extract_week(driver) or []:
+            try:
+                day_date = self.handler.scan_planner.get_day_date(day["date"], class_date)
+            except ValueError:
+                continue
+            if day_date != class_date:
+                continue
+            for live_session in day["sessions"]:
+                if (live_session["start_time"], live_session["name"]) == (session["start_time"], session["name"]):
+                    return bool(self.handler.book_session(driver, live_session, class_date, studio))
+
+        print(f"{session['name']} at {session['start_time']} is no longer on the page")
+        return False
+
+    def get_poll_interval(self, interval, changed, next_start):
+        """Get the pause before the next poll.
+
+        Args:
+            interval: Seconds paused before the last poll
+            changed: Whether the last poll saw a change
+            next_start: Start datetime of the next watched class, None if unknown
+
+        Returns:
+            float: Seconds to pause
+        """
+
+        interval = MIN_POLL_INTERVAL if changed else interval * POLL_BACKOFF
+        limit = MAX_POLL_INTERVAL
+        if next_start:
+            limit = min(limit, (next_start - WATCH_CUTOFF - datetime.now()).total_seconds() * POLL_SHARE_OF_TIME_LEFT)
+        return max(MIN_POLL_INTERVAL, min(interval, limit))
+
+    @traced("sleep")
+    def pause(self, seconds, until=None):
+        """Helper method to sleep between polls, waking up early for cancellation or until"""
+
+        deadline = time.monotonic() + seconds
+        if until:
+            deadline = min(deadline, time.monotonic() + max(0, (until - datetime.now()).total_seconds()))
+        while time.monotonic() < deadline:
+            if self.handler.cancel_event is not None and self.handler.cancel_event.is_set():
+                return
+            time.sleep(max(0, min(1.0, deadline - time.monotonic())))
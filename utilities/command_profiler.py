@@ -0,0 +1,142 @@
+from collections import defaultdict
+import os
+import sys
+import threading
+import time
+
+# Frames from files under this directory count as our code when attributing a command
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generic helpers skipped when attributing, so a command is charged to the method that asked for it
+GENERIC_CALLERS = {"WaitUtils.wait_for", "WaitUtils.record"}
+
+class CommandProfiler:
+    """Counts and times every WebDriver command and charges it to the calling method
+
+    Element methods (click, get_attribute, find_element, ...) send their
+    commands through the driver that created the element, so wrapping the
+    driver's execute method covers the driver and every element it returns.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stats = defaultdict(lambda: [0, 0.0])  # (caller, command) -> [count, seconds]
+
+    def attach(self, driver):
+        """Route every command of a driver through the profiler
+
+        Args:
+            driver: Selenium webdriver instance
+        """
+
+        execute = driver.execute
+
+        def profiled_execute(driver_command, params=None):
+            start = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                self.record(self.get_caller(), driver_command, time.perf_counter() - start)
+
+        driver.execute = profiled_execute
+
+    def get_caller(self):
+        """Helper method to name the innermost method of our code on the call stack"""
+
+        frame = sys._getframe(2)
+        this_file = os.path.abspath(__file__)
+        while frame:
+            file_name = os.path.abspath(frame.f_code.co_filename)
+            if file_name.startswith(PROJECT_ROOT) and file_name != this_file and "site-packages" not in file_name:
+                name = self.get_frame_name(frame)
+                if name not in GENERIC_CALLERS and "<" not in name:
+                    return name
+            frame = frame.f_back
+        return "<unattributed>"
+
+    def get_frame_name(self, frame):
+        """Helper method to build a 'Class.method' name for a frame"""
+
+        code = frame.f_code
+        qualified_name = getattr(code, "co_qualname", None)  # Python 3.11+
+        if qualified_name:
+            return qualified_name
+        instance = frame.f_locals.get("self")
+        return f"{type(instance).__name__}.{code.co_name}" if instance is not None else code.co_name
+
+    def record(self, caller, command, seconds):
+        """Helper method to add one command to the totals"""
+
+        with self.lock:
+            entry = self.stats[(caller, command)]
+            entry[0] += 1
+            entry[1] += seconds
+
+    @property
+    def command_count(self):
+        """Number of commands recorded so far"""
+
+        with self.lock:
+            return sum(count for count, _ in self.stats.values())
+
+    def get_totals(self, key_index=None):
+        """Get [count, seconds] totals grouped by command, by caller or by both.
+
+        Args:
+            key_index: 0 to group by caller, 1 by command, None by (caller, command)
+
+        Returns:
+            Dict of key -> [count, seconds]
+        """
+
+        totals = defaultdict(lambda: [0, 0.0])
+        with self.lock:
+            for key, (count, seconds) in self.stats.items():
+                total = totals[key if key_index is None else key[key_index]]
+                total[0] += count
+                total[1] += seconds
+        return dict(totals)
+
+    def to_dict(self):
+        """Return the totals in a JSON serializable form"""
+
+        def rows(totals):
+            return [
+                {"key": key if isinstance(key, str) else " / ".join(key), "count": count, "seconds": round(seconds, 4)}
+                for key, (count, seconds) in sorted(totals.items(), key=lambda item: -item[1][1])
+            ]
+
+        return {
+            "by_command": rows(self.get_totals(1)),
+            "by_caller": rows(self.get_totals(0)),
+            "by_caller_and_command": rows(self.get_totals())
+        }
+
+    def print_summary(self, limit=10):
+        """Print the top commands and callers by count and by total latency
+
+        Args:
+            limit: Number of rows per table
+        """
+
+        if not self.stats:
+            return
+
+        total_count = self.command_count
+        total_seconds = sum(seconds for _, seconds in self.get_totals(1).values())
+
+        print("\n-------------------------------------------------------")
+        print(f"WebDriver commands: {total_count} in {total_seconds:.2f}s")
+
+        tables = (
+            ("Top commands by count", self.get_totals(1), 0),
+            ("Top commands by total time", self.get_totals(1), 1),
+            ("Top callers by total time", self.get_totals(0), 1),
+            ("Top call sites by total time", self.get_totals(), 1)
+        )
+        for title, totals, sort_index in tables:
+            print(f"\n{title}:")
+            for key, (count, seconds) in sorted(totals.items(), key=lambda item: -item[1][sort_index])[:limit]:
+                label = key if isinstance(key, str) else f"{key[0]} -> {key[1]}"
+                print(f"    {count:6d} x {seconds:8.2f}s  (avg {seconds / count * 1000:7.1f}ms)  {label}")
+        print("-------------------------------------------------------")
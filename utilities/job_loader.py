@@ -0,0 +1,141 @@
+from datetime import datetime
+import json
+import os
+
+from utilities.booking_rules import BookingRule
+
+# Studios a job can book at
+STUDIOS = ("metuchen", "cranford")
+
+class BookingJob:
+    """A non-interactive booking run: studios, months and the rules to book by"""
+
+    def __init__(self, studios, year, months, rules, name=None, members=None):
+        """Initialize the job
+
+        Args:
+            studios: List of studio names ('cranford' or 'metuchen')
+            year: Year to book classes in
+            months: List of month numbers (1-12) in ascending order
+            rules: List of BookingRule, a class is booked if it matches any of them
+            name: Optional label used in progress messages
+            members: Optional names of MINDBODY_MEMBERS to book every class for, the default account if empty
+        """
+        self.studios = studios
+        self.year = year
+        self.months = months
+        self.rules = rules
+        self.name = name or ", ".join(studio.title() for studio in studios)
+        self.members = members or []
+        self.path = None  # Absolute path of the job file, set by load_job_file
+
+def load_job_file(path):
+    """Read a booking job from a JSON, YAML or TOML file.
+
+    Args:
+        path: Path of the job file
+
+    Returns:
+        BookingJob: The parsed job
+
+    Raises:
+        ValueError: If the file type is unsupported or the job is invalid
+    """
+
+    job = parse_job(read_job_data(path))
+    job.path = os.path.abspath(path)
+    return job
+
+def read_job_data(path):
+    """Helper function to load the raw contents of a job file by its extension"""
+
+    extension = os.path.splitext(path)[1].lower()
+
+    with open(path, "rb") as job_file:
+        if extension == ".json":
+            return json.load(job_file)
+
+        if extension in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("Reading YAML job files requires PyYAML (pip install pyyaml)")
+            return yaml.safe_load(job_file)
+
+        if extension == ".toml":
+            try:
+                import tomllib
+            except ImportError:
+                try:
+                    import tomli as tomllib
+                except ImportError:
+                    raise ValueError("Reading TOML job files requires Python 3.11 or tomli (pip install tomli)")
+            return tomllib.load(job_file)
+
+    raise ValueError(f"Unsupported job file type: {extension or path}")
+
+def parse_job(data, today=None):
+    """Build a job from the contents of a job file.
+
+    Args:
+        data: Dict with 'studios', 'rules' and optionally 'year', 'months', 'name' and 'members'
+        today: Optional date used for the defaults, the current date if None
+
+    Returns:
+        BookingJob: The parsed job
+
+    Raises:
+        ValueError: If a value is missing or invalid
+    """
+
+    if not isinstance(data, dict):
+        raise ValueError("A job file must contain a mapping")
+
+    today = today or datetime.now().date()
+
+    studios = data.get("studios") or ([data["studio"]] if data.get("studio") else [])
+    studios = [str(studio).strip().lower() for studio in studios]
+    if not studios or any(studio not in STUDIOS for studio in studios):
+        raise ValueError(f"'studios' must list one or more of: {', '.join(STUDIOS)}")
+
+    year = int(data.get("year", today.year))
+    months = parse_months(data.get("months"), year, today)
+
+    rules = [BookingRule.from_dict(rule) for rule in data.get("rules") or []]
+    if not rules:
+        raise ValueError("A job needs at least one rule")
+    for rule in rules:
+        if rule.studio and rule.studio not in studios:
+            raise ValueError(f"Rule for {rule.studio} but the job only books at {', '.join(studios)}")
+
+    members = data.get("members") or []
+    if not isinstance(members, list):
+        raise ValueError("'members' must list names from MINDBODY_MEMBERS")
+    members = [str(member).strip().lower() for member in members]
+
+    return BookingJob(studios, year, months, rules, data.get("name"), members)
+
+def parse_months(value, year, today):
+    """Helper function to turn the 'months' entry into a sorted list of month numbers
+
+    'all' means every remaining month of the year, nothing means the current month.
+    """
+
+    first_month = today.month if year == today.year else 1
+
+    if value is None:
+        months = [first_month]
+    elif str(value).strip().lower() == "all":
+        months = list(range(first_month, 13))
+    elif isinstance(value, list):
+        months = [int(month) for month in value]
+    else:
+        months = [int(value)]
+
+    for month in months:
+        if not 1 <= month <= 12:
+            raise ValueError(f"Invalid month: {month}")
+        if (year, month) < (today.year, today.month):
+            raise ValueError(f"Cannot book classes in past months: {month}/{year}")
+
+    return sorted(set(months))
@@ -0,0 +1,161 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import calendar
+import signal
+import threading
+
+class JobOrchestrator:
+    """Runs many booking jobs at once from one asyncio event loop
+
+    Every job is split into units of one studio and month (one studio when
+    the jobs are pipelined), and each unit drives a browser of its own. The
+    blocking Selenium work runs in a thread pool, and a semaphore bounds how
+    many browsers are open at the same time.
+
+    Ctrl+C does not interrupt a browser halfway through a booking: it sets a
+    cancel event that every handler checks before its next week or booking,
+    units that have not started are skipped, and the run ends once every
+    open browser has been closed.
+    """
+
+    def __init__(self, handler, open_browser, max_browsers=2, queue=None, book_queued=True):
+        """Initialize the orchestrator
+
+        Args:
+            handler: MindbodyHandler whose ledger, cache and session every unit shares
+            open_browser: Callable taking a studio name and returning a webdriver showing its schedule
+            max_browsers: Maximum number of browsers open at once
+            queue: Optional BookingQueue; units then run the two-phase pipeline per studio
+            book_queued: Whether pipelined units book their queue after scanning
+        """
+        self.handler = handler
+        self.open_browser = open_browser
+        self.max_browsers = max(1, max_browsers)
+        self.queue = queue
+        self.book_queued = book_queued
+        self.cancel_event = threading.Event()
+
+    def run(self, jobs):
+        """Run the jobs to completion or cancellation.
+
+        Args:
+            jobs: List of BookingJob
+
+        Returns:
+            List of (label, status) tuples, one per unit
+        """
+
+        return asyncio.run(self.run_jobs(jobs))
+
+    def get_units(self, jobs):
+        """Helper method to split jobs into (job, studio, months) units of work"""
+
+        units = []
+        for job in jobs:
+            for studio in job.studios:
+                if not any(rule.applies_to(studio) for rule in job.rules):
+                    continue
+                if self.queue:
+                    units.append((job, studio, job.months))
+                else:
+                    units.extend((job, studio, [month]) for month in job.months)
+        return units
+
+    async def run_jobs(self, jobs):
+        """Schedule every unit and wait for all of them to finish"""
+
+        units = self.get_units(jobs)
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_browsers)
+        executor = ThreadPoolExecutor(max_workers=self.max_browsers)
+
+        print("-------------------------------------------------------")
+        print(f"Running {len(jobs)} jobs as {len(units)} units on up to {self.max_browsers} browsers")
+        print("-------------------------------------------------------")
+        print("\n")
+
+        self.install_cancel_handler(loop)
+        try:
+            results = await asyncio.gather(*(self.run_unit(loop, executor, semaphore, *unit) for unit in units))
+        finally:
+            self.remove_cancel_handler(loop)
+            executor.shutdown(wait=True)
+
+        print("\n-------------------------------------------------------")
+        for label, status in results:
+            print(f"    {label}: {status}")
+        print("-------------------------------------------------------")
+
+        self.handler.ledger.print_summary()
+        return results
+
+    async def run_unit(self, loop, executor, semaphore, job, studio, months):
+        """Helper method to wait for a free browser slot and run one unit in the thread pool"""
+
+        label = f"{job.name} - {studio.title()} {', '.join(calendar.month_abbr[month] for month in months)} {job.year}"
+
+        async with semaphore:
+            if self.cancel_event.is_set():
+                return label, "cancelled before it started"
+            try:
+                result = await loop.run_in_executor(executor, self.run_blocking, job, studio, months)
+            except Exception as e:
+                return label, f"failed: {e}"
+
+        if self.cancel_event.is_set():
+            return label, "cancelled"
+        return label, "membership expired" if result is None else "finished" if result else "stopped early"
+
+    def run_blocking(self, job, studio, months):
+        """Helper method to run one unit on a browser of its own, inside a worker thread"""
+
+        handler = self.handler.spawn()
+        handler.cancel_event = self.cancel_event
+
+        # Scanning over HTTP without booking needs no browser
+        needs_browser = self.book_queued or not self.queue or not handler.schedule_source
+        driver = self.open_browser(studio) if needs_browser else None
+        try:
+            if self.book_queued or not self.queue:
+                handler.start_session(driver)
+
+            if self.queue:
+                return handler.reserve_classes_pipelined(
+                    driver, studio, job.year, months, rules=job.rules, queue=self.queue, book=self.book_queued
+                )
+
+            handler.seek_month(driver, studio, job.year, months[0])
+            return handler.reserve_classes(driver, studio, job.year, months[0], rules=job.rules)
+        finally:
+            if driver:
+                driver.quit()
+
+    def cancel(self):
+        """Stop the run: running units stop at their next week or booking, waiting ones never start
+
+        Worker threads cannot be interrupted safely, so a second Ctrl+C only
+        reports that the run is still winding down.
+        """
+
+        if self.cancel_event.is_set():
+            print("\nStill waiting for open browsers to finish their current step...")
+            return
+        print("\n\nCancelling... open browsers close after their current step")
+        self.cancel_event.set()
+
+    def install_cancel_handler(self, loop):
+        """Helper method to route Ctrl+C to cancel() while the jobs run"""
+
+        try:
+            loop.add_signal_handler(signal.SIGINT, self.cancel)
+        except (NotImplementedError, RuntimeError):
+            # Windows event loops have no signal handlers, Ctrl+C then raises KeyboardInterrupt as before
+            pass
+
+    def remove_cancel_handler(self, loop):
+        """Helper method to restore the default Ctrl+C behaviour"""
+
+        try:
+            loop.remove_signal_handler(signal.SIGINT)
+        except (NotImplementedError, RuntimeError):
+            pass
@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from utilities.booking_queue import BookingQueue
+from utilities.session_manager import SessionManager
+
+class MemberBooker:
+    """Books the same classes for several members, scanning the schedule only once
+
+    Every member gets a browser of its own, with its own profile and saved
+    session, so the accounts never share cookies. The browsers start and log
+    in while the first one (or the HTTP schedule source) scans the requested
+    months into a booking queue. Each member's browser then books the whole
+    queue for its member, all members at the same time.
+    """
+
+    def __init__(self, handler, members, open_browser, session_path=None):
+        """Initialize the booker
+
+        Args:
+            handler: MindbodyHandler whose ledger, cache and schedule source every member shares
+            members: List of Member to book for
+            open_browser: Callable taking a studio name and returning a webdriver showing its schedule
+            session_path: Session file of the default account, each member's file is derived from it
+        """
+        self.open_browser = open_browser
+        self.handlers = [
+            handler.for_member(member, SessionManager(member.get_session_path(session_path)))
+            for member in members
+        ]
+
+    def run(self, studio, target_year, target_months, rules, queue=None, book=True):
+        """Scan the months once and book every match for each member.
+
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            target_year: Year to book classes for
+            target_months: Month numbers (1-12) to book classes for, in ascending order
+            rules: List of BookingRule a class has to match one of
+            queue: Optional BookingQueue holding the scan results, a new in-memory one if None
+            book: Whether to book the queue after scanning
+
+        Returns:
+            Boolean indicating whether every member holds every queued class
+        """
+
+        scanner = self.handlers[0]
+        rule_index = scanner.get_studio_rule_index(studio, rules)
+        if not rule_index:
+            return True
+        queue = queue or BookingQueue()
+        members = [handler.member for handler in self.handlers]
+
+        print("-------------------------------------------------------")
+        print(f"Booking for {len(members)} members: {', '.join(member.describe() for member in members)}")
+        print("-------------------------------------------------------")
+
+        # Only the scan needs a browser without booking, and none when it reads over HTTP
+        starting = self.handlers
+        if not book:
+            starting = [] if scanner.schedule_source and not scanner.schedule_source.uses_browser else self.handlers[:1]
+        executor = ThreadPoolExecutor(max_workers=len(self.handlers), thread_name_prefix="member")
+        browsers = [executor.submit(self.start_member, handler, studio) for handler in starting]
+
+        try:
+            scan_driver = browsers[0].result() if browsers else None
+            if not scanner.scan_months(scan_driver, studio, target_year, target_months, rule_index, queue, members):
+                return False
+            if not book:
+                return True
+
+            bookings = [executor.submit(self.book_member, handler, browser, studio, queue) for handler, browser in zip(self.handlers, browsers)]
+            all_booked = all([booking.result() for booking in bookings])
+            if all_booked:
+                queue.clear(studio)
+            return all_booked
+
+        finally:
+            executor.shutdown(wait=True)
+            for browser in browsers:
+                if not browser.exception():
+                    browser.result().quit()
+
+    def start_member(self, handler, studio):
+        """Helper method to open a member's browser on the studio page and log the member in"""
+
+        driver = self.open_browser(studio)
+        handler.start_session(driver)
+        return driver
+
+    def book_member(self, handler, browser, studio, queue):
+        """Helper method to book the queue for one member once its browser is ready"""
+
+        try:
+            driver = browser.result()
+        except Exception as e:
+            print(f"Could not start the browser of {handler.member.describe()}: {e}")
+            return False
+
+        try:
+            return handler.book_queue(driver, studio, queue)
+        except Exception as e:
+            print(f"Booking for {handler.member.describe()} failed: {e}")
+            return False
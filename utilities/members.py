@@ -0,0 +1,84 @@
+import os
+
+from config.config import MINDBODY_USERNAME, MINDBODY_PASSWORD
+
+try:
+    from config.config import MINDBODY_MEMBERS
+except ImportError:
+    MINDBODY_MEMBERS = []  # Older config files only hold the one account
+
+class Member:
+    """A Mindbody account classes are booked for
+
+    The account of MINDBODY_USERNAME has an empty name, so its bookings and
+    saved session keep the keys they had before members existed.
+    """
+
+    def __init__(self, username, password, name=""):
+        """Initialize the member
+
+        Args:
+            username: Mindbody sign-in email
+            password: Mindbody password
+            name: Short label used in the ledger, progress output and file names
+        """
+        self.username = username
+        self.password = password
+        self.name = name
+
+    def describe(self):
+        """Get the label of the member used in progress output"""
+
+        return self.name or self.username
+
+    def get_session_path(self, path):
+        """Get the file the member's login cookies are kept in.
+
+        Args:
+            path: Session file of the default account, None to keep sessions in memory
+
+        Returns:
+            str or None: The member's own session file
+        """
+
+        if not path or not self.name:
+            return path
+        root, extension = os.path.splitext(path)
+        return f"{root}_{self.name}{extension}"
+
+def get_default_member():
+    """Get the account of MINDBODY_USERNAME and MINDBODY_PASSWORD"""
+
+    return Member(MINDBODY_USERNAME, MINDBODY_PASSWORD)
+
+def load_members(names=None):
+    """Read the members configured in MINDBODY_MEMBERS.
+
+    Args:
+        names: Optional names of the members to return, every member if empty
+
+    Returns:
+        List of Member in the order of the config or of names
+
+    Raises:
+        ValueError: If a member is incomplete, a name is used twice or a requested name is unknown
+    """
+
+    members = {}
+    for entry in MINDBODY_MEMBERS:
+        name = str(entry.get("name", "")).strip().lower()
+        if not name or not entry.get("username") or not entry.get("password"):
+            raise ValueError("Every entry of MINDBODY_MEMBERS needs a name, username and password")
+        if name in members:
+            raise ValueError(f"Member '{name}' is listed twice in MINDBODY_MEMBERS")
+        members[name] = Member(entry["username"], entry["password"], name)
+
+    if not members:
+        raise ValueError("No members configured, add MINDBODY_MEMBERS to config.py")
+    if not names:
+        return list(members.values())
+
+    unknown = [name for name in names if name.lower() not in members]
+    if unknown:
+        raise ValueError(f"Unknown members: {', '.join(unknown)} (configured: {', '.join(members)})")
+    return [members[name] for name in dict.fromkeys(name.lower() for name in names)]
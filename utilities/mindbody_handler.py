@@ -1,41 +1,188 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from datetime import datetime
+from datetime import date, datetime
 import calendar
 import time
 
 from utilities.mindbody_utils.modal_utils import ModalUtils
 from utilities.mindbody_utils.calendar_utils import CalendarUtils
+from utilities.mindbody_utils.session_utils import SessionUtils
+from utilities.mindbody_utils.wait_utils import WaitUtils
+from utilities.booking_ledger import BookingLedger
+from utilities.scan_planner import ScanPlanner
+from utilities.booking_queue import BookingQueue, MAX_QUEUE_FAILURES
+from utilities.schedule_sources import SeleniumScheduleSource, group_days_by_date
+from utilities.schedule_cache import ScheduleCache
+from utilities.session_manager import SessionManager
+from utilities.booking_rules import BookingRule, RuleIndex
+from utilities.members import get_default_member
+from utilities.week_prefetcher import WeekPrefetcher
+from utilities.schedule_export import get_schedule_record
+from utilities.tracer import traced
 from resources.html_selectors import *
 from config.config import MINDBODY_MEMBERSHIP_EXPIRATION_DATE
 
-# Global month dictionary
-MONTHS = {
-    "january": (1, 31),
-    "february": (2, 28),  # Note: Will need special handling for leap years
-    "march": (3, 31),
-    "april": (4, 30),
-    "may": (5, 31),
-    "june": (6, 30),
-    "july": (7, 31),
-    "august": (8, 31),
-    "september": (9, 30),
-    "october": (10, 31),
-    "november": (11, 30),
-    "december": (12, 31)
-}
-
 class MindbodyHandler:
     """Class to handle all Mindbody website interactions"""
 
-    def __init__(self):
-        """Initialize the MindbodyHandler with an empty set of processed dates"""
+    def __init__(self, verbose_waits=False, ledger=None, jump_navigation=False, schedule_cache=None, session_manager=None, schedule_source=None, cancel_event=None, member=None, prefetch_weeks=False):
+        """Initialize the MindbodyHandler with an empty set of processed dates
+        
+        Args:
+            verbose_waits: Whether to print the duration of every condition wait
+            ledger: Optional BookingLedger shared with other handlers
+            jump_navigation: Whether to jump straight to each planned week instead of walking the calendar
+            schedule_cache: Optional ScheduleCache with snapshots of earlier scans
+            session_manager: Optional SessionManager holding the authenticated Mindbody session
+            schedule_source: Optional ScheduleSource used to read schedules, the browser itself if None
+            cancel_event: Optional threading.Event that stops the handler at the next week or booking once set
+            member: Optional Member the handler books for, the account of MINDBODY_USERNAME if None
+            prefetch_weeks: Whether to load the next planned week in a second tab while the current one is booked
+        """
         self.processed_dates = set()  # Store processed dates
-        self.modal_utils = ModalUtils()
-        self.calendar_utils = CalendarUtils()
+        self.failed_dates = set()  # Processed dates whose booking failed, not saved as handled
+        self.ledger = ledger or BookingLedger()  # Dates claimed and bookings made across handlers
+        self.schedule_cache = schedule_cache or ScheduleCache()  # Parsed schedules of earlier scans
+        self.session_manager = session_manager or SessionManager()  # Login shared by every browser
+        self.schedule_source = schedule_source  # Where weeks are discovered, bookings always use the browser
+        self.cancel_event = cancel_event  # Set by an orchestrator to stop the run
+        self.member = member or get_default_member()  # Account logged in and booked for
+        self.week_signature = None  # Signature of the last week we processed
+        self.wait_utils = WaitUtils(verbose=verbose_waits)
+        self.modal_utils = ModalUtils(self.wait_utils, self.member)
+        self.calendar_utils = CalendarUtils(self.wait_utils)
+        self.session_utils = SessionUtils()
+        self.scan_planner = ScanPlanner()
+        self.jump_navigation = jump_navigation
+        self.prefetch_weeks = prefetch_weeks
+        self.rule_index = None  # RuleIndex of the rules of the current run
+        self.checkpoint = None  # RunCheckpoint saved after every week of a serial run
         self.expiration_date = datetime.strptime(MINDBODY_MEMBERSHIP_EXPIRATION_DATE, "%Y-%m-%d").date()
     
+    def spawn(self):
+        """Create a handler for another browser that shares this handler's ledger, cache and session
+        
+        Returns:
+            MindbodyHandler: The new handler
+        """
+
+        return MindbodyHandler(
+            verbose_waits=self.wait_utils.verbose,
+            ledger=self.ledger,
+            jump_navigation=self.jump_navigation,
+            schedule_cache=self.schedule_cache,
+            session_manager=self.session_manager,
+            schedule_source=self.schedule_source,
+            cancel_event=self.cancel_event,
+            member=self.member,
+            prefetch_weeks=self.prefetch_weeks
+        )
+
+    def for_member(self, member, session_manager):
+        """Create a handler booking for another member, sharing this handler's ledger, cache and schedule source
+        
+        Args:
+            member: Member the new handler books for
+            session_manager: SessionManager holding that member's login
+            
+        Returns:
+            MindbodyHandler: The new handler
+        """
+
+        return MindbodyHandler(
+            verbose_waits=self.wait_utils.verbose,
+            ledger=self.ledger,
+            jump_navigation=self.jump_navigation,
+            schedule_cache=self.schedule_cache,
+            session_manager=session_manager,
+            schedule_source=self.schedule_source,
+            cancel_event=self.cancel_event,
+            member=member,
+            prefetch_weeks=self.prefetch_weeks
+        )
+
+    def is_booked(self, studio, class_date, session):
+        """Check whether a session is booked for the handler's member
+        
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            class_date: Date of the class
+            session: Session record or queue entry with 'start_time' and 'name'
+            
+        Returns:
+            bool: Whether the ledger holds a booking of the session for the member
+        """
+
+        return self.ledger.is_booked(studio, class_date, session["start_time"], session["name"], self.member.name)
+
+    def get_scan_filters(self, rule_index):
+        """Get the key scans are recorded under, a date scanned for one member can still hold classes for another
+        
+        Args:
+            rule_index: RuleIndex of the rules of the current run
+            
+        Returns:
+            str: The rules key, followed by the member's name for named members
+        """
+
+        return f"{rule_index.key}|{self.member.name}" if self.member.name else rule_index.key
+
+    def restore_progress(self, studio):
+        """Pick up the dates of a studio a checkpointed run already handled
+        
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+        """
+
+        if self.checkpoint:
+            self.processed_dates |= self.checkpoint.get_processed_dates(studio)
+
+    def save_progress(self, studio, month, anchor=None):
+        """Save the run's progress after a week, if the run keeps a checkpoint
+        
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            month: Month number (1-12) the week was processed for
+            anchor: First date of the week view, None when walking the calendar
+        """
+
+        # A cancelled week stopped partway, the checkpoint keeps the last finished one
+        if self.checkpoint and (self.cancel_event is None or not self.cancel_event.is_set()):
+            self.checkpoint.finish_week(
+                studio, month, anchor, self.processed_dates - self.failed_dates, self.ledger.get_bookings(), self.failed_dates
+            )
+
+    def is_cancelled(self):
+        """Check whether the run was cancelled, printing a notice if it was
+        
+        Returns:
+            bool: Whether the handler has to stop
+        """
+
+        if self.cancel_event is None or not self.cancel_event.is_set():
+            return False
+        print("Run cancelled, stopping...")
+        return True
+
+    @traced("login")
+    def start_session(self, driver):
+        """Log the browser into Mindbody before the first booking
+        
+        Args:
+            driver: Selenium webdriver instance with the studio page loaded
+            
+        Returns:
+            bool: Whether the browser is logged in
+        """
+
+        print("-------------------------------------------------------")
+        print(f"Preparing Mindbody session{' for ' + self.member.name if self.member.name else ''}")
+        logged_in = self.session_manager.start(driver, self.modal_utils)
+        if not logged_in:
+            print("    Could not log in up front, bookings will log in when asked")
+        print("-------------------------------------------------------")
+        print("\n")
+        return logged_in
+
     def is_month_changed_in_batch(self, driver, studio, target_month, target_year, current_month_name, current_month, current_year, class_day):
         """Check if we need to change months while processing a batch of days.
         
@@ -62,7 +209,7 @@ class MindbodyHandler:
             print("-------------------------------------------------------")
             return True
         
-        elif class_day == MONTHS[current_month_name][1]:
+        elif class_day == calendar.monthrange(current_year, current_month)[1]:
 
             if current_month == 12:
                 current_month = 0
@@ -77,64 +224,69 @@ class MindbodyHandler:
         
         return False
                     
-    def process_days(self, driver, studio, target_year, target_month, target_day=None, target_time=None, instructor=None):
+    @traced("scan")
+    def process_days(self, driver, studio, target_year, target_month, rule_index, follow_month_change=True, date_range=None, anchor=None):
         """Helper method to process and book sessions for given days
         
+        Every rule is evaluated in the same pass over the week.
+        
         Args:
             driver: Selenium webdriver instance
-            days: List of day elements to process
+            studio: Studio name ('cranford' or 'metuchen')
             target_year: Year to filter by
             target_month: Month to filter by
-            target_day: Optional day of week to filter by
-            target_time: Optional time to filter by
-            instructor: Optional instructor name to filter by
+            rule_index: RuleIndex of the rules a session has to match one of
+            follow_month_change: Whether to navigate to the next week when the month changes
+            date_range: Optional (start_date, end_date) used instead of the target month to pick the days to book
+            anchor: Optional first date of the week view on screen, used to find the year of each day
             
         Returns:
             Boolean indicating if processing should continue
         """
         
-        sessions_container = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, SESSIONS_CONTAINER))
-        )
-        time.sleep(2)
+        # Wait for the sessions of a new week to render
+        signature = self.wait_utils.wait_for_sessions(driver, self.week_signature)
+        if signature:
+            self.week_signature = signature
                 
-        # Find all days in the current week
-        days = sessions_container.find_elements(By.CLASS_NAME, SESSION_DAY)
+        # Read all days in the current week with a single round trip
+        days = self.session_utils.extract_week(driver)
         
         if not days:
             print("-------------------------------------------------------")
             print("No classes found in current week")
             print("-------------------------------------------------------") 
             print("\n")
-            return True
+            return True, False
+
+        # Day headers have no year, it is taken from the date closest to the week on screen
+        reference_date = anchor or date(target_year, target_month, 15)
+
+        # Keep a snapshot of the week and report what changed since the last one
+        self.cache_week(studio, days, reference_date)
         
         for day in days:
+            date_key = None
             try:
                 # Check if this is an empty day
-                day_classes = day.get_attribute("class")
-                if "bw-widget__day--empty" in day_classes:
-                    date_div = day.find_element(By.CLASS_NAME, SESSION_DATE)
+                if day["empty"]:
                     print("-------------------------------------------------------")
-                    print(f"No classes for {date_div.text}")
+                    print(f"No classes for {day['date']}")
                     print("-------------------------------------------------------")
                     continue
 
-                # Get date from the date div
-                date_div = day.find_element(By.CLASS_NAME, SESSION_DATE)
-                date_text = date_div.text
-                current_month_name = date_text.split(", ")[1].split(" ")[0].lower()
+                # Get date from the day record
+                date_text = day["date"]
                 if not date_text:
                     continue
+                current_month_name = date_text.split(", ")[1].split(" ")[0].lower()
                 
                 # Parse the date text
                 try:
-                    # Convert "Monday, December 30" to datetime object
-                    class_date = datetime.strptime(date_text, "%A, %B %d")
+                    # Convert "Monday, December 30" to datetime object, leap days and New Year included
+                    class_date = datetime.combine(self.scan_planner.get_day_date(date_text, reference_date), datetime.min.time())
                     class_day = class_date.day
 
-                    # Add year since it's not in the text
-                    class_date = class_date.replace(year=target_year)
-
                     # Get current month and year
                     current_month = class_date.month
                     current_year = class_date.year
@@ -148,9 +300,10 @@ class MindbodyHandler:
                         return False, True
                     
                     # Check if we've reached the end of the month
-                    early_month_change = self.is_month_changed_in_batch(driver, studio, target_month, target_year, current_month_name, current_month, current_year, class_day)
-                    if early_month_change:
-                        return False, False 
+                    if follow_month_change:
+                        early_month_change = self.is_month_changed_in_batch(driver, studio, target_month, target_year, current_month_name, current_month, current_year, class_day)
+                        if early_month_change:
+                            return False, False 
                     
                     # Check if we've already processed this date
                     date_key = class_date.strftime("%Y-%m-%d")
@@ -165,64 +318,62 @@ class MindbodyHandler:
                     print(f"Error parsing date: {date_text}")
                     continue
                 
-                # Check if day is in target month
-                if class_date.year == target_year and class_date.month == target_month:
-                    # Find sessions within this day
-                    sessions = day.find_elements(By.CLASS_NAME, SESSION)
-                    self.book_sessions(driver, sessions, class_date, target_day, target_time, instructor)
+                # Check if day is in the target month or range
+                if date_range:
+                    in_scope = date_range[0] <= class_date.date() <= date_range[1]
+                else:
+                    in_scope = class_date.year == target_year and class_date.month == target_month
+                if in_scope:
+                    # Boundary weeks are seen by two handlers of a job, only one of them handles the date
+                    if not self.ledger.claim_date(studio, date_key, class_date.month, self.get_scan_filters(rule_index)):
+                        print(f"{date_text} is handled by another worker, skipping...")
+                        continue
+
+                    if self.ledger.is_scan_fresh(studio, date_key, self.get_scan_filters(rule_index)):
+                        print(f"{date_text} was scanned recently, skipping...")
+                        continue
+
+                    # Dates with a failed booking stay stale so the next run tries again
+                    if self.book_sessions(driver, day["sessions"], class_date, rule_index, studio):
+                        self.ledger.record_scan(studio, date_key, self.get_scan_filters(rule_index))
+                    else:
+                        self.failed_dates.add(date_key)
 
             except Exception as e:
                 print(f"Error processing day: {e}")
+                if date_key:
+                    self.failed_dates.add(date_key)  # The date stopped partway, a resumed run tries it again
                 continue
 
         return True, False
 
-    def book_sessions(self, driver, sessions, class_date, target_day=None, target_time=None, instructor=None):
+    @traced("booking")
+    def book_sessions(self, driver, sessions, class_date, rule_index, studio=""):
         """Helper method to book individual sessions
         
         Args:
             driver: Selenium webdriver instance
-            sessions: List of session elements to process
+            sessions: List of session records from SessionUtils.extract_week
             class_date: Date of the class
-            target_day: Optional day of week to filter by
-            target_time: Optional time to filter by
-            instructor: Optional instructor name to filter by
+            rule_index: RuleIndex of the rules a session has to match one of
+            studio: Studio name recorded with each booking attempt
+            
+        Returns:
+            Boolean indicating whether every matching session is booked
         """
         
+        all_booked = True
         for session in sessions:
+            if self.is_cancelled():
+                return False
             try:
-                # Get session basics
-                session_basics = session.find_element(By.CLASS_NAME, SESSION_BASICS)
-                
-                # Check if this is the instructor's class
-                staff_name = session_basics.find_element(By.CLASS_NAME, SESSION_STAFF).text
-                session_name = session_basics.find_element(By.CLASS_NAME, SESSION_NAME).text
-                
-                # Get time from the correct HTML structure
-                session_info = session_basics.find_element(By.CLASS_NAME, SESSION_INFO)
-                session_time_div = session_info.find_element(By.CLASS_NAME, SESSION_TIME)
-                session_time_col = session_time_div.find_element(By.CLASS_NAME, SESSION_COLUMN)
-                session_time_span = session_time_col.find_element(By.CLASS_NAME, SESSION_TIME_SPAN)
-
-                session_start_time = session_time_span.find_element(By.CLASS_NAME, SESSION_START_TIME).text
-                session_end_time = session_time_span.find_element(By.CLASS_NAME, SESSION_END_TIME).text
+                staff_name = session["staff"]
+                session_name = session["name"]
+                session_start_time = session["start_time"]
+                session_end_time = session["end_time"]
                 
-                # Only check time if target_time is specified
-                if target_time:
-                    try:
-                        session_time_obj = datetime.strptime(session_start_time, "%I:%M %p").time()
-                        if session_time_obj != target_time:
-                            continue
-                    except ValueError:
-                        print(f"Error parsing session time: {session_start_time}")
-                        continue
-                
-                # Only check day if target_day is specified
-                if target_day and class_date.strftime("%A") != target_day:
-                    continue
-                
-                # Only check instructor if specified
-                if instructor and instructor not in staff_name:
+                matched_rules = self.session_matches(session, class_date, rule_index)
+                if not matched_rules:
                     continue
                 
                 print("\n----------------------------------------------")
@@ -232,29 +383,210 @@ class MindbodyHandler:
                 print(f"    Date: {class_date.strftime('%A, %B %d, %Y')}")
                 print(f"    Time: {session_start_time} - {session_end_time}")
                 print(f"    Instructor: {staff_name}")
+                if len(rule_index.rules) > 1:
+                    print(f"    Matched rule: {matched_rules[0].describe()}")
+
+                # Sessions booked in an earlier run never reach the booking modal
+                if self.is_booked(studio, class_date, session):
+                    print("Already booked according to the ledger, skipping...")
+                    continue
+
                 print("\nAttempting to book class...")
-                
-                # Click to expand details
-                session_basics.click()
-                time.sleep(2)
-                    
-                # Find and click book button
-                cart_button = session.find_element(By.CLASS_NAME, SESSION_CART_BUTTON)
-                cart_button.click()
-                time.sleep(2)
-                    
-                # Handle the booking modal
-                if self.modal_utils.handle_booking_modal(driver):
+
+                booked = self.book_session(driver, session, class_date, studio)
+                if booked is None:
+                    continue
+                if booked:
                     print(f"Successfully booked class for {class_date.strftime('%A, %B %d, %Y')} at {session_start_time} - {session_end_time}")
                     # Continue with next session instead of returning
                     continue
+                all_booked = False
                 print("----------------------------------------------")
         
             except Exception as e:
                 print(f"Error processing session: {e}")
+                all_booked = False
                 continue
 
-    def reserve_classes(self, driver, studio, target_year, target_month, target_day=None, target_time=None, instructor=None):
+        return all_booked
+
+    @traced("booking")
+    def book_session(self, driver, session, class_date, studio=""):
+        """Helper method to book one session on the live page
+        
+        Args:
+            driver: Selenium webdriver instance
+            session: Session record from SessionUtils.extract_week of the page as it is now
+            class_date: Date of the class
+            studio: Studio name recorded with the booking attempt
+            
+        Returns:
+            Boolean indicating whether the class was booked, None if it is no longer on the page
+        """
+
+        # Only go back to the live page for sessions we actually book
+        session_element = self.session_utils.find_live_session(driver, session)
+        if not session_element:
+            print("Session is no longer on the page, skipping...")
+            return None
+        
+        # Click to expand details
+        session_element.find_element(By.CLASS_NAME, SESSION_BASICS).click()
+            
+        # Wait for the expanded details and click book button
+        cart_button = self.wait_utils.wait_for_child_clickable(
+            driver, session_element, By.CLASS_NAME, SESSION_CART_BUTTON, "book button"
+        )
+        cart_button.click()
+            
+        # Handle the booking modal
+        booked = self.modal_utils.handle_booking_modal(driver)
+        self.ledger.record_booking(
+            studio, class_date, session["start_time"], session["end_time"], session["name"], session["staff"], booked,
+            member=self.member.name
+        )
+        return booked
+
+    def session_matches(self, session, class_date, rule_index):
+        """Check a session record against the rules
+        
+        Args:
+            session: Session record from SessionUtils.extract_week or the schedule cache
+            class_date: Date of the class
+            rule_index: RuleIndex of the rules to check
+            
+        Returns:
+            List of the rules the session matches, empty if none
+        """
+
+        return rule_index.match(session, class_date)
+
+    def get_rule_index(self, rules):
+        """Get the compiled index of a set of rules, built once per run
+        
+        Args:
+            rules: List of BookingRule
+            
+        Returns:
+            RuleIndex of the rules
+        """
+
+        if self.rule_index is None or self.rule_index.rules != rules:
+            self.rule_index = RuleIndex(rules)
+        return self.rule_index
+
+    def get_studio_rule_index(self, studio, rules, target_day=None, target_time=None, instructor=None):
+        """Get the rule index of the rules used at a studio
+        
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            rules: Optional list of BookingRule, built from the three filters below if None
+            target_day: Optional day of week to filter by
+            target_time: Optional time to filter by
+            instructor: Optional instructor name to filter by
+            
+        Returns:
+            RuleIndex of the rules, None if no rule applies to the studio
+        """
+
+        if rules is None:
+            rules = [BookingRule(target_day, target_time, instructor)]
+        rules = [rule for rule in rules if rule.applies_to(studio)]
+        if not rules:
+            print(f"No booking rules for {studio.title()}, skipping...")
+            return None
+        return self.get_rule_index(rules)
+
+    def get_schedule_source(self, driver):
+        """Get the source weeks are read from
+        
+        Args:
+            driver: Selenium webdriver instance, used when no other source is set
+            
+        Returns:
+            ScheduleSource to read weeks from
+        """
+
+        return self.schedule_source or SeleniumScheduleSource(driver, self.calendar_utils, self.session_utils)
+
+    def cache_week(self, studio, days, reference_date):
+        """Store an extracted week in the schedule cache and print the changes
+        
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            days: Day records from SessionUtils.extract_week
+            reference_date: Date in or near the week, used to find the year of each day
+        """
+
+        week = group_days_by_date(days, reference_date, self.scan_planner)
+        self.schedule_cache.print_diff(self.schedule_cache.put_week(studio, week))
+
+    def has_unbooked_match(self, studio, cached_week, rule_index):
+        """Check whether a cached week holds a matching session we have not booked
+        
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            cached_week: Dict of date_key -> session records from ScheduleCache.get_week
+            rule_index: RuleIndex of the rules a session has to match one of
+            
+        Returns:
+            Boolean indicating whether the week has to be loaded live
+        """
+
+        for date_key, sessions in cached_week.items():
+            class_date = datetime.strptime(date_key, "%Y-%m-%d")
+            for session in sessions:
+                if self.session_matches(session, class_date, rule_index) and not self.is_booked(studio, class_date, session):
+                    return True
+        return False
+
+    def is_week_fresh(self, studio, anchor, start_date, end_date, rule_index):
+        """Check whether every day a week view would show was scanned recently
+        
+        A date scanned with different rules may hold other matches, so the
+        ledger keeps scans under a key built from the rules.
+        
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            anchor: First date of the week view
+            start_date: First date of the planned range
+            end_date: Last date of the planned range
+            rule_index: RuleIndex of the rules of the current run
+            
+        Returns:
+            Boolean indicating whether the week can be skipped
+        """
+
+        return all(
+            self.ledger.is_scan_fresh(studio, day.strftime("%Y-%m-%d"), self.get_scan_filters(rule_index))
+            for day in self.scan_planner.get_view_dates(anchor, start_date, end_date, rule_index.days)
+        )
+
+    @traced("navigation")
+    def seek_month(self, driver, studio, target_year, target_month):
+        """Navigate the calendar to the first available week of a month
+        
+        The studio page opens on the current week, so a handler that starts on a
+        later month has to move there before processing any days.
+        
+        Args:
+            driver: Selenium webdriver instance
+            studio: Studio name ('cranford' or 'metuchen')
+            target_year: Year to navigate to
+            target_month: Month to navigate to
+        """
+
+        today = datetime.now().date()
+        if self.jump_navigation or (target_year == today.year and target_month == today.month):
+            return
+
+        print("\n-------------------------------------------------------")
+        print(f"Moving to {calendar.month_name[target_month]} {target_year}...")
+        print("-------------------------------------------------------")
+        self.calendar_utils.move_to_next_week(driver, studio, target_month, target_year, None, None, self.processed_dates)
+
+    @traced("month")
+    def reserve_classes(self, driver, studio, target_year, target_month, target_day=None, target_time=None, instructor=None, rules=None):
         """Main method to handle class reservation process
         
         Args:
@@ -265,30 +597,49 @@ class MindbodyHandler:
             target_day: Optional day of week to filter by
             target_time: Optional time to filter by
             instructor: Optional instructor name to filter by
+            rules: Optional list of BookingRule used instead of the three filters above
             
         Returns:
             Boolean indicating success/failure
         """
+
+        rule_index = self.get_studio_rule_index(studio, rules, target_day, target_time, instructor)
+        if not rule_index:
+            return True
+
+        if self.jump_navigation:
+            return self.reserve_classes_by_jump(driver, studio, target_year, target_month, rule_index)
        
         try:
+
+            # A resumed run continues after the last date it handled instead of walking there
+            resume_date = self.checkpoint.get_resume_date(studio, target_year, target_month) if self.checkpoint else None
+            if resume_date:
+                print(f"Resuming at {resume_date.strftime('%A, %B %d')}...")
+                if self.calendar_utils.jump_to_date(driver, studio, resume_date):
+                    self.week_signature = None
             
             while True:
+
+                if self.is_cancelled():
+                    return False
                 
-                continue_processing, membership_expired = self.process_days(driver, studio, target_year, target_month, target_day, target_time, instructor)
+                continue_processing, membership_expired = self.process_days(driver, studio, target_year, target_month, rule_index)
+                self.save_progress(studio, target_month)
 
                 if not continue_processing:
                     print("\n-------------------------------------------------------")
                     print(f"Finished processing {calendar.month_name[target_month]} {target_year}")
                     print("-------------------------------------------------------")
                     print("\n")
+                    self.wait_utils.print_summary()
+                    self.wait_utils.reset()
 
                     if membership_expired:
                         return None
                     return True
                  
                 self.calendar_utils.move_to_next_week(driver, studio, target_month, target_year, None, None, self.processed_dates) 
-
-                time.sleep(5)
                 
         except KeyboardInterrupt:
             print("\nInterrupted by user. Stopping gracefully...")
@@ -297,4 +648,465 @@ class MindbodyHandler:
         except Exception as e:
             print(f"Error in reserve_classes: {e}")
             return False
-    
+
+    @traced("month")
+    def reserve_classes_pipelined(self, driver, studio, target_year, target_months, target_day=None, target_time=None, instructor=None, rules=None, queue=None, book=True):
+        """Handle the reservation process in two stages: scan everything, then book
+        
+        The scan stage finds every matching session of the requested months and
+        writes it to the booking queue. The booking stage then books the queue
+        back to back, so bookings are not spread out between page scans.
+        
+        Args:
+            driver: Selenium webdriver instance
+            studio: Studio name ('cranford' or 'metuchen')
+            target_year: Year to book classes for
+            target_months: Month numbers (1-12) to book classes for, in ascending order
+            target_day: Optional day of week to filter by
+            target_time: Optional time to filter by
+            instructor: Optional instructor name to filter by
+            rules: Optional list of BookingRule used instead of the three filters above
+            queue: Optional BookingQueue holding the scan results, a new in-memory one if None
+            book: Whether to run the booking stage after the scan stage
+            
+        Returns:
+            Boolean indicating success/failure
+        """
+
+        rule_index = self.get_studio_rule_index(studio, rules, target_day, target_time, instructor)
+        if not rule_index:
+            return True
+        queue = queue or BookingQueue()
+
+        try:
+
+            if not self.scan_months(driver, studio, target_year, target_months, rule_index, queue):
+                return False
+            if not book:
+                return True
+
+            if self.book_queue(driver, studio, queue):
+                queue.clear(studio)
+
+            self.wait_utils.print_summary()
+            self.wait_utils.reset()
+            return True
+
+        except KeyboardInterrupt:
+            print("\nInterrupted by user. Stopping gracefully...")
+            return False
+
+        except Exception as e:
+            print(f"Error in reserve_classes_pipelined: {e}")
+            return False
+
+    def scan_months(self, driver, studio, target_year, target_months, rule_index, queue, members=None):
+        """Scan stage of the pipeline: queue the matching sessions of every requested month
+        
+        Args:
+            driver: Selenium webdriver instance, None if the schedule source needs no browser
+            studio: Studio name ('cranford' or 'metuchen')
+            target_year: Year to book classes for
+            target_months: Month numbers (1-12) to scan, in ascending order
+            rule_index: RuleIndex of the rules a session has to match one of
+            queue: BookingQueue the matches are added to
+            members: Optional list of Member the queue is booked for, the handler's member if None
+            
+        Returns:
+            Boolean indicating whether the scan ran to the end without being cancelled
+        """
+
+        for target_month in target_months:
+            if self.is_cancelled():
+                return False
+
+            print("\n-------------------------------------------------------")
+            print(f"Scanning {calendar.month_name[target_month]} {target_year}")
+            print("-------------------------------------------------------")
+
+            start_date, end_date = self.scan_planner.get_month_range(target_year, target_month, expiration_date=self.expiration_date)
+            if start_date > self.expiration_date:
+                print(f"Reached membership expiration date ({self.expiration_date})")
+                break
+            self.scan_to_queue(driver, studio, start_date, end_date, rule_index, queue, members)
+
+        queue.print_summary(studio)
+        return self.cancel_event is None or not self.cancel_event.is_set()
+
+    @traced("scan")
+    def scan_to_queue(self, driver, studio, start_date, end_date, rule_index, queue, members=None):
+        """Scan stage: queue the matching sessions of a date range without booking any
+        
+        Weeks the queue already holds a recent scan of are skipped, so an
+        interrupted scan picks up where it stopped.
+        
+        Args:
+            driver: Selenium webdriver instance, None if the schedule source needs no browser
+            studio: Studio name ('cranford' or 'metuchen')
+            start_date: First date of the range
+            end_date: Last date of the range
+            rule_index: RuleIndex of the rules a session has to match one of
+            queue: BookingQueue the matches are added to
+            members: Optional list of Member the queue is booked for; a session is queued unless all of them hold it
+        """
+
+        member_names = [member.name for member in members or [self.member]]
+        queue_key = rule_index.key if member_names == [""] else f"{rule_index.key}|{','.join(member_names)}"
+        for anchor in self.scan_planner.plan_anchor_dates(start_date, end_date, rule_index.days):
+            if self.is_cancelled():
+                return
+            if queue.is_week_scanned(studio, anchor, queue_key):
+                print(f"Week of {anchor.strftime('%B %d')} is already queued, skipping...")
+                continue
+
+            view_dates = self.scan_planner.get_view_dates(anchor, start_date, end_date, rule_index.days)
+            week = self.schedule_cache.get_week(studio, [day.strftime("%Y-%m-%d") for day in view_dates])
+
+            if week is None:
+                week = self.get_schedule_source(driver).get_week(studio, anchor)
+                if week is None:
+                    print(f"Could not read the week of {anchor.strftime('%B %d')}, skipping...")
+                    continue
+                self.schedule_cache.print_diff(self.schedule_cache.put_week(studio, week))
+
+            matches = []
+            for class_date in view_dates:
+                for session in week.get(class_date.strftime("%Y-%m-%d"), []):
+                    if self.session_matches(session, class_date, rule_index) and not all(
+                        self.ledger.is_booked(studio, class_date, session["start_time"], session["name"], name) for name in member_names
+                    ):
+                        matches.append((class_date, session))
+
+            added = queue.add_week(studio, anchor, queue_key, matches)
+            print(f"Week of {anchor.strftime('%B %d')}: {len(matches)} matching classes, {added} new in the queue")
+
+    @traced("scan")
+    def scan_schedule(self, driver, studio, target_year, target_months, rule_index=None):
+        """Read-only pass over the schedule: yield every parsed session of the requested months
+        
+        Each planned week view is read once, through the schedule source, and
+        its sessions are yielded before the next week is loaded, so callers
+        can write them out at scan speed. Nothing is clicked and nothing is
+        booked; the fresh weeks still update the schedule cache.
+        
+        Args:
+            driver: Selenium webdriver instance, None if the schedule source needs no browser
+            studio: Studio name ('cranford' or 'metuchen')
+            target_year: Year of the months
+            target_months: Month numbers (1-12) to read
+            rule_index: Optional RuleIndex; only the days its rules allow are loaded and only matching sessions yielded
+            
+        Yields:
+            Dict built by get_schedule_record for each session, in date order
+        """
+
+        days = rule_index.days if rule_index else None
+        for start_date, end_date in self.scan_planner.get_date_ranges(target_year, target_months, expiration_date=self.expiration_date):
+            for anchor in self.scan_planner.plan_anchor_dates(start_date, end_date, days):
+                if self.is_cancelled():
+                    return
+
+                week = self.get_schedule_source(driver).get_week(studio, anchor)
+                if week is None:
+                    print(f"Could not read the week of {anchor.strftime('%B %d')}, skipping...")
+                    continue
+                self.schedule_cache.put_week(studio, week)
+
+                for class_date in self.scan_planner.get_view_dates(anchor, start_date, end_date, days):
+                    for session in week.get(class_date.strftime("%Y-%m-%d"), []):
+                        if rule_index is None or self.session_matches(session, class_date, rule_index):
+                            yield get_schedule_record(studio, class_date, session)
+
+    @traced("booking")
+    def book_queue(self, driver, studio, queue):
+        """Booking stage: book the queued sessions of a studio back to back
+        
+        Each queued day is shown with a single jump, and days already on
+        screen are booked without navigating. The session is looked up again
+        on the live page right before it is booked, so no element goes stale.
+        
+        Args:
+            driver: Selenium webdriver instance
+            studio: Studio name ('cranford' or 'metuchen')
+            queue: BookingQueue filled by the scan stage
+            
+        Returns:
+            Boolean indicating whether every queued session is booked
+        """
+
+        entries = queue.get_sessions(studio, self.member.name)
+        shown_dates = set()  # Date keys of the week view on screen
+        first_booked = last_booked = None
+        booked_count = 0
+        all_booked = True
+
+        print("\n-------------------------------------------------------")
+        print(f"Booking {len(entries)} queued classes at {studio.title()}{' for ' + self.member.name if self.member.name else ''}")
+        print("-------------------------------------------------------")
+
+        for entry in entries:
+            if self.is_cancelled():
+                all_booked = False
+                break
+            try:
+                class_date = datetime.strptime(entry["date"], "%Y-%m-%d").date()
+                if self.is_booked(studio, class_date, entry):
+                    continue
+
+                if entry["date"] not in shown_dates and not self.calendar_utils.jump_to_date(driver, studio, class_date):
+                    print(f"Could not show {class_date.strftime('%B %d')}, skipping...")
+                    all_booked = self.give_up_queued(queue, entry) and all_booked
+                    continue
+
+                # One round trip gives the current element indexes of the week on screen
+                live_session = None
+                shown_dates = set()
+                for day in self.session_utils.extract_week(driver) or []:
+                    try:
+                        date_key = self.scan_planner.get_day_date(day["date"], class_date).strftime("%Y-%m-%d")
+                    except ValueError:
+                        continue
+                    shown_dates.add(date_key)
+                    if date_key == entry["date"]:
+                        live_session = next((
+                            session for session in day["sessions"]
+                            if (session["start_time"], session["name"]) == (entry["start_time"], entry["name"])
+                        ), None)
+
+                if not live_session:
+                    print(f"{entry['name']} at {entry['start_time']} on {entry['date']} is no longer on the schedule, skipping...")
+                    continue
+
+                print(f"Booking {entry['name']} on {class_date.strftime('%A, %B %d')} at {entry['start_time']}...")
+                booked = self.book_session(driver, live_session, class_date, studio)
+                if booked:
+                    booked_count += 1
+                    last_booked = time.monotonic()
+                    first_booked = first_booked or last_booked
+                else:
+                    all_booked = self.give_up_queued(queue, entry) and all_booked
+
+            except KeyboardInterrupt:
+                raise
+
+            except Exception as e:
+                print(f"Error booking queued class: {e}")
+                all_booked = self.give_up_queued(queue, entry) and all_booked
+
+        print("\n-------------------------------------------------------")
+        print(f"Booked {booked_count} of {len(entries)} queued classes")
+        if booked_count > 1:
+            print(f"    {last_booked - first_booked:.1f}s from first to last confirmation")
+        print("-------------------------------------------------------")
+        return all_booked
+
+    def give_up_queued(self, queue, entry):
+        """Helper method to count a failed attempt at a queued session
+        
+        Args:
+            queue: BookingQueue the entry comes from
+            entry: Queue entry that could not be booked
+            
+        Returns:
+            bool: Whether the session is given up, so it no longer keeps the queue alive
+        """
+
+        if not queue.record_failure(entry, self.member.name):
+            return False
+        print(f"Giving up on {entry['name']} at {entry['start_time']} on {entry['date']} after {MAX_QUEUE_FAILURES} failed attempts")
+        return True
+
+    def reserve_classes_by_jump(self, driver, studio, target_year, target_month, rule_index):
+        """Handle the reservation process by jumping straight to each planned week
+        
+        Only the week views that can contain a match are loaded, starting from
+        the first day the rules allow.
+        
+        Args:
+            driver: Selenium webdriver instance
+            studio: Studio name ('cranford' or 'metuchen')
+            target_year: Year to book classes for
+            target_month: Month to book classes for
+            rule_index: RuleIndex of the rules a session has to match one of
+            
+        Returns:
+            Boolean indicating success/failure, None if the membership expired
+        """
+
+        start_date, end_date = self.scan_planner.get_month_range(target_year, target_month, expiration_date=self.expiration_date)
+        if start_date > self.expiration_date:
+            print("\n-------------------------------------------------------")
+            print(f"Reached membership expiration date ({self.expiration_date})")
+            print("-------------------------------------------------------")
+            return None
+
+        return self.reserve_date_range(driver, studio, start_date, end_date, rule_index, f"{calendar.month_name[target_month]} {target_year}")
+
+    @traced("month")
+    def reserve_classes_continuous(self, driver, studio, target_year, target_months, target_day=None, target_time=None, instructor=None, rules=None):
+        """Handle the reservation process of several months in one pass over the weeks
+        
+        The week views covering every requested month up to the membership
+        expiration date are planned up front. Adjacent months share a plan, so a
+        week that spans two months is loaded once and booked for both.
+        
+        Args:
+            driver: Selenium webdriver instance
+            studio: Studio name ('cranford' or 'metuchen')
+            target_year: Year to book classes for
+            target_months: Month numbers (1-12) to book classes for
+            target_day: Optional day of week to filter by
+            target_time: Optional time to filter by
+            instructor: Optional instructor name to filter by
+            rules: Optional list of BookingRule used instead of the three filters above
+            
+        Returns:
+            Boolean indicating success/failure, None if the membership expired before any requested month
+        """
+
+        rule_index = self.get_studio_rule_index(studio, rules, target_day, target_time, instructor)
+        if not rule_index:
+            return True
+
+        date_ranges = self.scan_planner.get_date_ranges(target_year, target_months, expiration_date=self.expiration_date)
+        if not date_ranges:
+            print("\n-------------------------------------------------------")
+            print(f"Nothing left to book before the membership expiration date ({self.expiration_date})")
+            print("-------------------------------------------------------")
+            return None
+
+        week_count = sum(len(self.scan_planner.plan_anchor_dates(start_date, end_date, rule_index.days)) for start_date, end_date in date_ranges)
+        print("-------------------------------------------------------")
+        print(f"Planned {week_count} week views from {date_ranges[0][0].strftime('%B %d, %Y')} to {date_ranges[-1][1].strftime('%B %d, %Y')}")
+        print("-------------------------------------------------------")
+
+        for start_date, end_date in date_ranges:
+            label = f"{start_date.strftime('%B %d')} - {end_date.strftime('%B %d, %Y')}"
+            result = self.reserve_date_range(driver, studio, start_date, end_date, rule_index, label)
+            if not result:
+                return result
+        return True
+
+    def reserve_date_range(self, driver, studio, start_date, end_date, rule_index, label):
+        """Helper method to show each planned week view of a date range once and book its matches
+        
+        Args:
+            driver: Selenium webdriver instance
+            studio: Studio name ('cranford' or 'metuchen')
+            start_date: First date of the range
+            end_date: Last date of the range, at most the membership expiration date
+            rule_index: RuleIndex of the rules a session has to match one of
+            label: Name of the range used in the progress output
+            
+        Returns:
+            Boolean indicating success/failure, None if the membership expired
+        """
+
+        prefetcher = None
+        try:
+            weeks = self.get_weeks_to_show(studio, start_date, end_date, rule_index)
+            if self.prefetch_weeks:
+                prefetcher = WeekPrefetcher(driver, self.calendar_utils, self.wait_utils)
+
+            anchor = next(weeks, None)
+            while anchor is not None:
+                if self.is_cancelled():
+                    return False
+
+                print("\n-------------------------------------------------------")
+                print(f"Jumping to {anchor.strftime('%A, %B %d, %Y')}...")
+                print("-------------------------------------------------------")
+
+                if not (prefetcher and prefetcher.take(anchor)) and not self.calendar_utils.jump_to_date(driver, studio, anchor):
+                    print(f"Could not show the week of {anchor.strftime('%B %d')}, skipping...")
+                    anchor = next(weeks, None)
+                    continue
+
+                # The next week loads in the spare tab while this one is booked
+                next_anchor = next(weeks, None)
+                if prefetcher and next_anchor is not None:
+                    prefetcher.start(next_anchor)
+
+                # The jump or the prefetch already waited for the new week to render
+                self.week_signature = None
+                _, membership_expired = self.process_days(
+                    driver, studio, anchor.year, anchor.month, rule_index,
+                    follow_month_change=False, date_range=(start_date, end_date), anchor=anchor
+                )
+                if membership_expired:
+                    return None
+                self.save_progress(studio, anchor.month, anchor)
+                anchor = next_anchor
+
+            if self.is_cancelled():
+                return False
+            if prefetcher and prefetcher.hits:
+                print(f"{prefetcher.hits} weeks were already loaded in the prefetch tab")
+            print("\n-------------------------------------------------------")
+            print(f"Finished processing {label}")
+            print("-------------------------------------------------------")
+            print("\n")
+            self.wait_utils.print_summary()
+            self.wait_utils.reset()
+            return True
+
+        except KeyboardInterrupt:
+            print("\nInterrupted by user. Stopping gracefully...")
+            return False
+
+        except Exception as e:
+            print(f"Error in reserve_date_range: {e}")
+            return False
+
+        finally:
+            if prefetcher:
+                prefetcher.close()
+                self.week_signature = None
+
+    def get_weeks_to_show(self, studio, start_date, end_date, rule_index):
+        """Helper method to yield the planned week views of a date range the browser still has to show
+        
+        Weeks finished before the last run stopped, scanned recently, or
+        without anything left to book in their cached or fetched schedule are
+        skipped here, so the caller can look one week ahead.
+        
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            start_date: First date of the range
+            end_date: Last date of the range
+            rule_index: RuleIndex of the rules a session has to match one of
+            
+        Yields:
+            date: First date of each week view to show
+        """
+
+        for anchor in self.scan_planner.plan_anchor_dates(start_date, end_date, rule_index.days):
+            if self.is_cancelled():
+                return
+
+            week_label = anchor.strftime('%A, %B %d, %Y')
+            if self.checkpoint and self.checkpoint.is_week_finished(studio, anchor):
+                print(f"Week of {week_label} was finished before the last run stopped, skipping...")
+                continue
+
+            if self.is_week_fresh(studio, anchor, start_date, end_date, rule_index):
+                print(f"Week of {week_label} was scanned recently, skipping...")
+                continue
+
+            # A fresh snapshot without anything left to book spares the browser the trip
+            view_dates = self.scan_planner.get_view_dates(anchor, start_date, end_date, rule_index.days)
+            date_keys = [day.strftime("%Y-%m-%d") for day in view_dates]
+            cached_week = self.schedule_cache.get_week(studio, date_keys)
+
+            # A source without a browser checks the week before the browser has to show it
+            if cached_week is None and self.schedule_source and not self.schedule_source.uses_browser:
+                week = self.schedule_source.get_week(studio, anchor)
+                if week is not None:
+                    self.schedule_cache.print_diff(self.schedule_cache.put_week(studio, week))
+                    cached_week = {date_key: week.get(date_key, []) for date_key in date_keys}
+
+            if cached_week is not None and not self.has_unbooked_match(studio, cached_week, rule_index):
+                print(f"Cached schedule of the week of {week_label} has no classes left to book, skipping...")
+                continue
+
+            yield anchor
@@ -1,30 +1,40 @@
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-import time
 from datetime import datetime
+import calendar
 from resources.html_selectors import *
+from utilities.mindbody_utils.wait_utils import WaitUtils
+from utilities.tracer import traced
 
-# Global month dictionary
-MONTHS = {
-    "january": (1, 31),
-    "february": (2, 28),  # Note: Will need special handling for leap years
-    "march": (3, 31),
-    "april": (4, 30),
-    "may": (5, 31),
-    "june": (6, 30),
-    "july": (7, 31),
-    "august": (8, 31),
-    "september": (9, 30),
-    "october": (10, 31),
-    "november": (11, 30),
-    "december": (12, 31)    
+# Month numbers by lowercase month name, as shown in the calendar header
+MONTH_NUMBERS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+
+# Sets the datepicker input to a date and lets the widget react as if the user typed it
+SET_DATEPICKER_SCRIPT = """
+var input = document.querySelector('.' + arguments[0]);
+if (!input) { return false; }
+if (window.jQuery) {
+    window.jQuery(input).val(arguments[1]).trigger('input').trigger('change');
+} else {
+    input.value = arguments[1];
+    input.dispatchEvent(new Event('input', {bubbles: true}));
+    input.dispatchEvent(new Event('change', {bubbles: true}));
 }
+return true;
+"""
+
+# Seconds to wait for the widget to accept a date typed into the datepicker input
+DATEPICKER_INPUT_TIMEOUT = 3
+
+# Seconds given to a re-render when the datepicker input targets the week already shown
+RERENDER_SETTLE_TIMEOUT = 0.5
 
 class CalendarUtils:
-    def __init__(self):
-        pass
+    def __init__(self, wait_utils=None):
+        self.wait_utils = wait_utils or WaitUtils()
+        self.jump_method = None  # 'input' or 'calendar' once we know which one the widget accepts
 
+    @traced("navigation")
     def open_calendar(self, driver, studio):
         """Helper method to open the calendar for either studio
         
@@ -36,9 +46,7 @@ class CalendarUtils:
             None
         """
 
-        calendar_container = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.CLASS_NAME, CALENDAR_CONTAINER))
-            )
+        calendar_container = self.wait_utils.wait_for_clickable(driver, (By.CLASS_NAME, CALENDAR_CONTAINER), "calendar container")
 
         full_cal_field = calendar_container.find_element(By.CLASS_NAME, FULLCAL_FIELD)
 
@@ -46,12 +54,13 @@ class CalendarUtils:
             datepicker = full_cal_field.find_element(By.CLASS_NAME, DATEPICKER)
             datepicker_button = datepicker.find_element(By.CLASS_NAME, DATEPICKER_BUTTON)
             datepicker_button.click()
-            time.sleep(2)
         else:  # Metuchen
             full_cal_button = calendar_container.find_element(By.CLASS_NAME, FULLCAL_BUTTON)
             full_cal_button.click()
-            time.sleep(2)
 
+        self.wait_utils.wait_for_calendar_open(driver)
+
+    @traced("navigation")
     def move_to_next_date_in_calendar(self, driver, target_year, target_month, full_calendar, processed_dates):
         """Helper method to select the next available date in the calendar and apply it
         
@@ -67,13 +76,14 @@ class CalendarUtils:
 
         # Use the generator from navigate_calendar
         for date_obj in self.find_next_unprocessed_date_in_calendar(driver, target_year, target_month, processed_dates, full_calendar):
-            ok_button = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, f"a.{CALENDAR_OK_BUTTON}.{CALENDAR_OK_BUTTON_APPLY}"))
+            ok_button = self.wait_utils.wait_for_clickable(
+                driver, (By.CSS_SELECTOR, f"a.{CALENDAR_OK_BUTTON}.{CALENDAR_OK_BUTTON_APPLY}"), "calendar OK button"
             )
             ok_button.click()
-            time.sleep(2)
+            self.wait_utils.wait_for_calendar_closed(driver)
             return date_obj
             
+    @traced("navigation")
     def find_next_unprocessed_date_in_calendar(self, driver, target_year, target_month, processed_dates, full_calendar=None):
         """Helper method to find and select the next unprocessed date in the calendar view
         
@@ -96,8 +106,8 @@ class CalendarUtils:
 
             # Wait for calendar to load
             if not full_calendar:
-                full_calendar = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, FULL_CALENDAR))
+                full_calendar = self.wait_utils.wait_for(
+                    driver, EC.presence_of_element_located((By.CLASS_NAME, FULL_CALENDAR)), "full calendar"
                 )
             
             # Get calendar body
@@ -137,7 +147,7 @@ class CalendarUtils:
                             date_key = date_obj.strftime("%Y-%m-%d")
                             if date_key not in processed_dates:
                                 date.click()
-                                time.sleep(1)
+                                self.wait_utils.wait_for_date_selected(driver, date_key)
                                 
                                 yield date_obj
                                 return
@@ -163,15 +173,17 @@ class CalendarUtils:
         current_month = month_element.get_attribute('textContent').strip()
         current_year = year_element.get_attribute('textContent').strip()
 
-        current_month_num = MONTHS[current_month.lower()][0]  # Get first value of tuple
+        current_month_num = MONTH_NUMBERS[current_month.lower()]
         current_year_num = int(current_year)
 
         return current_month_num, current_year_num
 
-    def move_to_next_month(self, target_month, target_year, current_month, current_year, full_calendar):
+    @traced("navigation")
+    def move_to_next_month(self, driver, target_month, target_year, current_month, current_year, full_calendar):
         """Navigate to the next month in the calendar if needed.
         
         Args:
+            driver: Selenium webdriver instance
             target_month (int): Month to navigate to (1-12)
             target_year (int): Year to navigate to
             current_month (int): Current month number (1-12)
@@ -190,9 +202,10 @@ class CalendarUtils:
                     print("Moving to next month...")
                     print("------------------------------------------------------")
 
+                    previous_month = full_calendar.find_element(By.CLASS_NAME, CALENDAR_TOP_MONTH).get_attribute('textContent').strip()
                     next_button = full_calendar.find_element(By.CSS_SELECTOR, f"a.{CALENDAR_TOP_NAV}.{CALENDAR_TOP_NEXT}")
                     next_button.click()
-                    time.sleep(1)
+                    self.wait_utils.wait_for_calendar_month(driver, full_calendar, previous_month)
 
                     current_month, current_year = self.get_current_month_and_year(full_calendar)
 
@@ -201,6 +214,7 @@ class CalendarUtils:
         
         return False
 
+    @traced("navigation")
     def move_to_next_week(self, driver, studio, target_month, target_year, current_month, current_year, processed_dates):
         """Helper method to navigate calendar to target month and select first available day
         
@@ -219,11 +233,11 @@ class CalendarUtils:
             self.open_calendar(driver, studio)
 
              # Wait for calendar to load and navigate to target month
-            full_calendar = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, FULL_CALENDAR))
+            full_calendar = self.wait_utils.wait_for(
+                driver, EC.presence_of_element_located((By.CLASS_NAME, FULL_CALENDAR)), "full calendar"
             )
 
-            if self.move_to_next_month(target_month, target_year, current_month, current_year, full_calendar):
+            if self.move_to_next_month(driver, target_month, target_year, current_month, current_year, full_calendar):
                 self.move_to_next_date_in_calendar(driver, target_year, target_month, full_calendar, processed_dates)
                 return
             
@@ -231,7 +245,7 @@ class CalendarUtils:
                 
                 current_month, current_year = self.get_current_month_and_year(full_calendar)
                     
-                self.move_to_next_month(target_month, target_year, current_month, current_year, full_calendar)
+                self.move_to_next_month(driver, target_month, target_year, current_month, current_year, full_calendar)
                
                 print("\n------------------------------------------------------")
                 print("Moving to the next unprocessed date...")
@@ -248,6 +262,93 @@ class CalendarUtils:
         except Exception as e:
             print(f"Error navigating to next unprocessed date: {e}")
             return False
-    
 
-    
\ No newline at end of file
+    @traced("navigation")
+    def jump_to_date(self, driver, studio, date_obj):
+        """Helper method to show the week of a date without walking the calendar week by week
+        
+        Tries the datepicker input first and remembers whether the widget accepts
+        it, which only a jump that changed the shown week can tell. Otherwise opens
+        the calendar once, moves to the date's month and clicks the date directly
+        by its data-date attribute.
+        
+        Args:
+            driver: Selenium webdriver instance
+            studio: Studio name ('cranford' or 'metuchen')
+            date_obj: Date to jump to
+            
+        Returns:
+            Boolean indicating whether the week of the date is shown
+        """
+
+        if self.jump_method in (None, "input"):
+            previous_signature = self.wait_utils.get_week_signature(driver)
+            if self.set_datepicker_input(driver, date_obj):
+                signature = self.wait_utils.wait_for_week_containing(driver, date_obj, DATEPICKER_INPUT_TIMEOUT)
+                if signature and signature == previous_signature:
+                    # The week was already shown, let a re-render the input started finish before anyone reads the page
+                    if self.wait_utils.wait_for_sessions(driver, previous_signature, RERENDER_SETTLE_TIMEOUT):
+                        signature = self.wait_utils.wait_for_week_containing(driver, date_obj, DATEPICKER_INPUT_TIMEOUT)
+                if signature:
+                    # A week that was already shown says nothing about whether the widget took the input
+                    if signature != previous_signature:
+                        self.jump_method = "input"
+                    return True
+
+            if self.jump_method is None:
+                print("Datepicker input not accepted, jumping through the calendar instead")
+                self.jump_method = "calendar"
+
+        try:
+            self.jump_to_date_in_calendar(driver, studio, date_obj)
+        except Exception as e:
+            print(f"Error jumping to {date_obj.strftime('%Y-%m-%d')}: {e}")
+            return False
+
+        return bool(self.wait_utils.wait_for_week_containing(driver, date_obj))
+
+    def set_datepicker_input(self, driver, date_obj):
+        """Helper method to type a date into the datepicker input
+        
+        Args:
+            driver: Selenium webdriver instance
+            date_obj: Date to select
+            
+        Returns:
+            Boolean indicating whether the input was found
+        """
+
+        return driver.execute_script(SET_DATEPICKER_SCRIPT, DATEPICKER_INPUT, date_obj.strftime("%Y-%m-%d"))
+
+    def jump_to_date_in_calendar(self, driver, studio, date_obj):
+        """Helper method to select a date in the calendar popup and apply it
+        
+        Args:
+            driver: Selenium webdriver instance
+            studio: Studio name ('cranford' or 'metuchen')
+            date_obj: Date to select
+            
+        Raises:
+            ValueError: If the date is before the month shown or cannot be selected
+        """
+
+        self.open_calendar(driver, studio)
+        full_calendar = driver.find_element(By.CLASS_NAME, FULL_CALENDAR)
+
+        current_month, current_year = self.get_current_month_and_year(full_calendar)
+        if (date_obj.year, date_obj.month) < (current_year, current_month):
+            raise ValueError("date is before the month shown in the calendar")
+        self.move_to_next_month(driver, date_obj.month, date_obj.year, current_month, current_year, full_calendar)
+
+        date_key = date_obj.strftime("%Y-%m-%d")
+        date = full_calendar.find_element(By.CSS_SELECTOR, f".{CALENDAR_DATE}[data-date='{date_key}']")
+        if CALENDAR_UNIT_DISABLED in date.get_attribute("class"):
+            raise ValueError("date is disabled in the calendar")
+        date.click()
+        self.wait_utils.wait_for_date_selected(driver, date_key)
+
+        ok_button = self.wait_utils.wait_for_clickable(
+            driver, (By.CSS_SELECTOR, f"a.{CALENDAR_OK_BUTTON}.{CALENDAR_OK_BUTTON_APPLY}"), "calendar apply button"
+        )
+        ok_button.click()
+        self.wait_utils.wait_for_calendar_closed(driver)
@@ -1,57 +1,91 @@
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-import time
 from resources.html_selectors import *
-from config.config import (
-    MINDBODY_USERNAME, 
-    MINDBODY_PASSWORD
-)
+from utilities.mindbody_utils.wait_utils import WaitUtils
+from utilities.tracer import traced
+from utilities.members import get_default_member
 
 class ModalUtils:
-    def __init__(self):
-        pass
+    def __init__(self, wait_utils=None, member=None):
+        self.wait_utils = wait_utils or WaitUtils()
+        self.member = member or get_default_member()  # Account whose credentials fill the login form
 
+    @traced("login")
     def handle_login(self, driver):
-        """Helper method to handle login to Mindbody"""
+        """Helper method to handle login to Mindbody
+        
+        Returns:
+            Boolean indicating whether the login form was submitted and went away
+        """
 
         try:
 
-            print(f"    Logging into Mindbody...")
+            print(f"    Logging into Mindbody as {self.member.describe()}...")
 
             # Wait for loading animation to disappear
-            WebDriverWait(driver, 10).until(
-                EC.invisibility_of_element_located((By.ID, MODAL_SPINNER))
-            )
+            self.wait_utils.wait_for_spinner_gone(driver)
             
             # Wait for login form
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.ID, LOGIN_USERNAME))
-            )
-            time.sleep(1)
+            self.wait_utils.wait_for_clickable(driver, (By.ID, LOGIN_USERNAME), "login form")
 
             # Fill in credentials
-            driver.find_element(By.ID, LOGIN_USERNAME).send_keys(MINDBODY_USERNAME)
-            driver.find_element(By.ID, LOGIN_PASSWORD).send_keys(MINDBODY_PASSWORD)
+            driver.find_element(By.ID, LOGIN_USERNAME).send_keys(self.member.username)
+            driver.find_element(By.ID, LOGIN_PASSWORD).send_keys(self.member.password)
             
             # Click sign in button
             driver.find_element(By.CSS_SELECTOR, LOGIN_BUTTON).click()
-            time.sleep(2)
+            if not self.wait_utils.wait_for_login_submitted(driver):
+                print("Login error: the login form did not go away")
+                return False
 
             print(f"    Successfully logged into Mindbody!")
+            return True
 
         except Exception as e:
             print(f"Login error: {e}")
+            return False
+
+    @traced("login")
+    def login_up_front(self, driver, login_url):
+        """Helper method to log in on the Mindbody sign-in page before any booking
+        
+        The sign-in page is opened in a separate tab so the studio page keeps its state.
+        
+        Args:
+            driver: Selenium webdriver instance
+            login_url: URL of the Mindbody sign-in page
+            
+        Returns:
+            Boolean indicating whether the browser is logged in
+        """
+
+        studio_window = driver.current_window_handle
+        driver.switch_to.new_window('tab')
+        try:
+            driver.get(login_url)
+            if driver.find_elements(By.ID, LOGIN_USERNAME):
+                return self.handle_login(driver)
+            print("    Already logged into Mindbody")
+            return True
+        except Exception as e:
+            print(f"Login error: {e}")
+            return False
+        finally:
+            driver.close()
+            driver.switch_to.window(studio_window)
 
     def is_modal_header_title_login(self, driver):
-        """Helper method to check if the current modal header is a login prompt"""
+        """Helper method to check if the current modal header is a login prompt
+        
+        Does not wait: it is called once the booking outcome has rendered, so a
+        login prompt is either already shown or not coming.
+        """
 
         try:
 
-            # Wait for header to load
-            header = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, LOGIN_HEADER))
-            )
+            headers = driver.find_elements(By.CLASS_NAME, LOGIN_HEADER)
+            if not headers:
+                return False
+            header = headers[0]
 
             # Get header bar and title
             header_bar = header.find_element(By.CLASS_NAME, LOGIN_HEADER_BAR)
@@ -62,52 +96,46 @@ class ModalUtils:
         except:
             return False
     
+    @traced("booking")
     def handle_booking_modal(self, driver):
         """Helper method to handle the booking confirmation modal"""
         
         try:
 
             # Wait for and switch to modal iframe
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, MODAL_CONTENT))
-            )
-            iframe = driver.find_element(By.ID, MODAL_IFRAME)
-            driver.switch_to.frame(iframe)
+            self.wait_utils.wait_for_modal_iframe(driver)
             
             # Wait for spinner to disappear
-            WebDriverWait(driver, 10).until(
-                EC.invisibility_of_element_located((By.ID, MODAL_SPINNER))
-            )
+            self.wait_utils.wait_for_spinner_gone(driver)
             
             # Click confirm button
-            confirm_button = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, f"a.{MODAL_CONFIRM_BASE}.{MODAL_CONFIRM_DISABLE}.{MODAL_CONFIRM_PREVIEW}"))
+            confirm_button = self.wait_utils.wait_for_clickable(
+                driver,
+                (By.CSS_SELECTOR, f"a.{MODAL_CONFIRM_BASE}.{MODAL_CONFIRM_DISABLE}.{MODAL_CONFIRM_PREVIEW}"),
+                "confirm button"
             )
-            time.sleep(1)
             confirm_button.click()
-            time.sleep(2)
 
-            # Handle login if needed
+            # Wait for the modal to answer the confirm click
+            self.wait_utils.wait_for_booking_outcome(driver)
+
+            # Handle login if needed, only when no session was set up front or it expired
             if self.is_modal_header_title_login(driver):
                 self.handle_login(driver)
-                time.sleep(2)
+                self.wait_utils.wait_for_booking_outcome(driver, include_login=False)
             
             # Check for error banner
             try:
-                error_banner = WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, MODAL_ERROR_BANNER))
-                )
-                if error_banner.is_displayed():
+                error_banners = driver.find_elements(By.CSS_SELECTOR, MODAL_ERROR_BANNER)
+                if error_banners and error_banners[0].is_displayed():
                     return self.close_modal(driver, "Class already booked or unavailable", False)
             except:
                 pass
 
             # Check for thank you message
             try:
-                thank_you = WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, MODAL_THANK_YOU))
-                )
-                if thank_you.is_displayed():
+                thank_you = driver.find_elements(By.CLASS_NAME, MODAL_THANK_YOU)
+                if thank_you and thank_you[0].is_displayed():
                     return self.close_modal(driver, "Successfully booked class!", True)
             except:
                 pass
@@ -143,7 +171,7 @@ class ModalUtils:
                 var closeButton = document.querySelector('.{MODAL_CLOSE}');
                 if (closeButton) closeButton.click();
             """)
-            time.sleep(1)
+            self.wait_utils.wait_for_modal_closed(driver)
             
         except:
             print("Could not close modal")
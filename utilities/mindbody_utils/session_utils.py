@@ -0,0 +1,126 @@
+from resources.html_selectors import *
+from utilities.tracer import traced
+
+# Selector chain from a session's basics block down to its start/end time spans
+SESSION_TIME_PATH = f".{SESSION_INFO} .{SESSION_TIME} .{SESSION_COLUMN} .{SESSION_TIME_SPAN}"
+
+# Walks the whole sessions container inside the browser and returns plain records,
+# so a full week costs a single WebDriver round trip instead of one per element.
+EXTRACT_WEEK_SCRIPT = """
+var s = arguments[0];
+var container = document.querySelector('.' + s.container);
+if (!container) { return null; }
+
+var text = function(root, selector) {
+    var el = root.querySelector(selector);
+    return el ? el.innerText.trim() : '';
+};
+
+var allSessions = Array.prototype.slice.call(container.querySelectorAll('.' + s.session));
+var days = [];
+
+container.querySelectorAll('.' + s.day).forEach(function(day) {
+    var date = text(day, '.' + s.date);
+    var record = {date: date, empty: day.classList.contains(s.dayEmpty), sessions: []};
+
+    if (!record.empty) {
+        day.querySelectorAll('.' + s.session).forEach(function(session) {
+            var basics = session.querySelector('.' + s.basics);
+            if (!basics) { return; }
+            var cart = session.querySelector('.' + s.cartButton);
+            record.sessions.push({
+                index: allSessions.indexOf(session),
+                date: date,
+                name: text(basics, '.' + s.name),
+                staff: text(basics, '.' + s.staff),
+                start_time: text(basics, s.timePath + ' .' + s.startTime),
+                end_time: text(basics, s.timePath + ' .' + s.endTime),
+                cart_label: cart ? cart.textContent.trim() : '',
+                cart_enabled: !!cart && !cart.disabled && !cart.classList.contains('disabled')
+            });
+        });
+    }
+    days.push(record);
+});
+
+return days;
+"""
+
+# Resolves a session record from EXTRACT_WEEK_SCRIPT back to its live element. The element
+# at the recorded index is only trusted if it is still the same class (day, name and start
+# time); after a re-render the class is looked up by those fields instead.
+FIND_SESSION_SCRIPT = """
+var s = arguments[0];
+var target = arguments[1];
+var container = document.querySelector('.' + s.container);
+if (!container) { return null; }
+
+var text = function(root, selector) {
+    var el = root.querySelector(selector);
+    return el ? el.innerText.trim() : '';
+};
+var isTarget = function(session) {
+    var basics = session.querySelector('.' + s.basics);
+    var day = session.closest('.' + s.day);
+    return !!basics && !!day &&
+        text(day, '.' + s.date) === target.date &&
+        text(basics, '.' + s.name) === target.name &&
+        text(basics, s.timePath + ' .' + s.startTime) === target.start_time;
+};
+
+var sessions = container.querySelectorAll('.' + s.session);
+var indexed = sessions[target.index];
+if (indexed && isTarget(indexed)) { return indexed; }
+for (var i = 0; i < sessions.length; i++) {
+    if (isTarget(sessions[i])) { return sessions[i]; }
+}
+return null;
+"""
+
+class SessionUtils:
+    def __init__(self):
+        self.selectors = {
+            "container": SESSIONS_CONTAINER,
+            "day": SESSION_DAY,
+            "dayEmpty": SESSION_DAY_EMPTY,
+            "date": SESSION_DATE,
+            "session": SESSION,
+            "basics": SESSION_BASICS,
+            "name": SESSION_NAME,
+            "staff": SESSION_STAFF,
+            "timePath": SESSION_TIME_PATH,
+            "startTime": SESSION_START_TIME,
+            "endTime": SESSION_END_TIME,
+            "cartButton": SESSION_CART_BUTTON,
+        }
+
+    @traced("scan")
+    def extract_week(self, driver):
+        """Helper method to read every day and session of the current week in one call
+
+        Args:
+            driver: Selenium webdriver instance
+
+        Returns:
+            List of day records, each a dict with 'date', 'empty' and 'sessions'.
+            Session records hold 'index', 'date', 'name', 'staff', 'start_time',
+            'end_time', 'cart_label' (text of the cart button, '' without one) and
+            'cart_enabled'. Returns None if the sessions container is missing.
+        """
+
+        return driver.execute_script(EXTRACT_WEEK_SCRIPT, self.selectors)
+
+    def find_live_session(self, driver, session):
+        """Helper method to fetch the live element for an extracted session record
+
+        Args:
+            driver: Selenium webdriver instance
+            session: Session record returned by extract_week
+
+        Returns:
+            WebElement of the same class, or None if it is no longer on the page
+        """
+
+        target = {field: session.get(field, "") for field in ("date", "name", "start_time")}
+        target["index"] = session["index"]
+        return driver.execute_script(FIND_SESSION_SCRIPT, self.selectors, target)
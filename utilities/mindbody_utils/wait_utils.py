@@ -0,0 +1,247 @@
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+from datetime import datetime
+import time
+from resources.html_selectors import *
+from utilities.tracer import span
+from utilities.scan_planner import ScanPlanner
+
+# Returns a signature of the rendered week (its day headers), or '' while nothing is rendered
+WEEK_SIGNATURE_SCRIPT = """
+var container = document.querySelector('.' + arguments[0]);
+if (!container) { return ''; }
+var dates = container.querySelectorAll('.' + arguments[1] + ' .' + arguments[2]);
+return Array.prototype.map.call(dates, function(el) { return el.innerText.trim(); }).join('|');
+"""
+
+class WaitUtils:
+    def __init__(self, timeout=10, poll_frequency=0.1, verbose=False):
+        """Initialize the wait layer shared by the handler and its helpers
+
+        Args:
+            timeout: Default number of seconds to wait for a condition
+            poll_frequency: Seconds between condition checks
+            verbose: Whether to print the duration of every wait as it finishes
+        """
+
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.verbose = verbose
+        self.timings = []  # (description, seconds, condition met)
+        self.scan_planner = ScanPlanner()  # Dates the year-less day headers
+
+    def wait_for(self, driver, condition, description, timeout=None, raise_on_timeout=True):
+        """Wait until a condition holds and record how long it took
+
+        Args:
+            driver: Selenium webdriver instance
+            condition: Callable taking the driver, truthy once the condition holds
+            description: Short label used in timing reports
+            timeout: Optional number of seconds overriding the default timeout
+            raise_on_timeout: Whether to raise TimeoutException or return None
+
+        Returns:
+            The truthy value returned by the condition, or None on a tolerated timeout
+        """
+
+        start = time.monotonic()
+        try:
+            with span(description, "wait"):
+                result = WebDriverWait(
+                    driver,
+                    self.timeout if timeout is None else timeout,
+                    poll_frequency=self.poll_frequency,
+                    ignored_exceptions=(StaleElementReferenceException,)
+                ).until(condition)
+        except TimeoutException:
+            self.record(description, time.monotonic() - start, False)
+            if raise_on_timeout:
+                raise
+            return None
+
+        self.record(description, time.monotonic() - start, True)
+        return result
+
+    def record(self, description, seconds, succeeded):
+        """Helper method to store a wait duration and optionally print it"""
+
+        self.timings.append((description, seconds, succeeded))
+        if self.verbose:
+            status = "" if succeeded else " (timed out)"
+            print(f"    Waited {seconds:.2f}s for {description}{status}")
+
+    def wait_for_clickable(self, driver, locator, description, timeout=None):
+        """Wait until the element at locator is clickable and return it"""
+
+        return self.wait_for(driver, EC.element_to_be_clickable(locator), description, timeout)
+
+    def wait_for_child_clickable(self, driver, parent, by, value, description, timeout=None):
+        """Wait until a child of parent is displayed and enabled and return it"""
+
+        def child_clickable(_):
+            child = parent.find_element(by, value)
+            return child if child.is_displayed() and child.is_enabled() else False
+
+        return self.wait_for(driver, child_clickable, description, timeout)
+
+    def get_week_signature(self, driver):
+        """Helper method to read the signature of the currently rendered week"""
+
+        return driver.execute_script(WEEK_SIGNATURE_SCRIPT, SESSIONS_CONTAINER, SESSION_DAY, SESSION_DATE)
+
+    def wait_for_sessions(self, driver, previous_signature=None, timeout=None):
+        """Wait until the sessions container has rendered a week different from the previous one
+
+        Args:
+            driver: Selenium webdriver instance
+            previous_signature: Signature of the week shown before navigating, if any
+            timeout: Optional number of seconds overriding the default timeout
+
+        Returns:
+            The new week signature, or None if the week did not change in time
+        """
+
+        def sessions_rendered(d):
+            signature = self.get_week_signature(d)
+            return signature if signature and signature != previous_signature else False
+
+        return self.wait_for(driver, sessions_rendered, "sessions to render", timeout, raise_on_timeout=False)
+
+    def wait_for_week_containing(self, driver, date_obj, timeout=None):
+        """Wait until the rendered week includes the given date
+
+        Args:
+            driver: Selenium webdriver instance
+            date_obj: Date that has to be shown
+            timeout: Optional number of seconds overriding the default timeout
+
+        Returns:
+            The week signature, or None if the date was not shown in time
+        """
+
+        target = date_obj.date() if isinstance(date_obj, datetime) else date_obj
+
+        def week_contains_date(d):
+            signature = self.get_week_signature(d)
+            for date_text in signature.split("|") if signature else []:
+                try:
+                    shown = self.scan_planner.get_day_date(date_text, target)
+                except ValueError:
+                    continue
+                if shown == target:
+                    return signature
+            return False
+
+        return self.wait_for(driver, week_contains_date, "week to show target date", timeout, raise_on_timeout=False)
+
+    def wait_for_calendar_open(self, driver):
+        """Wait until the calendar popup is visible and return it"""
+
+        return self.wait_for(driver, EC.visibility_of_element_located((By.CLASS_NAME, FULL_CALENDAR)), "calendar popup")
+
+    def wait_for_calendar_closed(self, driver):
+        """Wait until the calendar popup has been dismissed"""
+
+        return self.wait_for(
+            driver,
+            EC.invisibility_of_element_located((By.CLASS_NAME, FULL_CALENDAR)),
+            "calendar to close",
+            raise_on_timeout=False
+        )
+
+    def wait_for_calendar_month(self, driver, full_calendar, previous_month):
+        """Wait until the calendar header shows a month other than previous_month"""
+
+        def month_changed(_):
+            month = full_calendar.find_element(By.CLASS_NAME, CALENDAR_TOP_MONTH).get_attribute('textContent').strip()
+            return month if month and month != previous_month else False
+
+        return self.wait_for(driver, month_changed, "calendar month to change")
+
+    def wait_for_date_selected(self, driver, date_key):
+        """Wait until the calendar marks the date with data-date == date_key as active"""
+
+        locator = (By.CSS_SELECTOR, f".{CALENDAR_DATE}.{CALENDAR_UNIT_ACTIVE}[data-date='{date_key}']")
+        return self.wait_for(driver, EC.presence_of_element_located(locator), "calendar date selection", raise_on_timeout=False)
+
+    def wait_for_modal_iframe(self, driver):
+        """Wait until the booking modal iframe is loaded and switch into it"""
+
+        self.wait_for(driver, EC.presence_of_element_located((By.CLASS_NAME, MODAL_CONTENT)), "booking modal")
+        return self.wait_for(driver, EC.frame_to_be_available_and_switch_to_it((By.ID, MODAL_IFRAME)), "modal iframe")
+
+    def wait_for_spinner_gone(self, driver):
+        """Wait until the modal loading spinner has disappeared"""
+
+        return self.wait_for(driver, EC.invisibility_of_element_located((By.ID, MODAL_SPINNER)), "spinner to disappear")
+
+    def wait_for_booking_outcome(self, driver, include_login=True, timeout=None):
+        """Wait until the modal shows a login form, an error banner or a thank-you message
+
+        Args:
+            driver: Selenium webdriver instance
+            include_login: Whether the login form counts as an outcome
+            timeout: Optional number of seconds overriding the default timeout
+
+        Returns:
+            The first matching element, or None if nothing appeared in time
+        """
+
+        locators = [(By.CSS_SELECTOR, MODAL_ERROR_BANNER), (By.CLASS_NAME, MODAL_THANK_YOU)]
+        if include_login:
+            locators.append((By.ID, LOGIN_USERNAME))
+
+        def outcome_shown(d):
+            for locator in locators:
+                elements = d.find_elements(*locator)
+                if elements:
+                    return elements[0]
+            return False
+
+        return self.wait_for(driver, outcome_shown, "booking outcome", timeout, raise_on_timeout=False)
+
+    def wait_for_login_submitted(self, driver):
+        """Wait until the login form has been submitted and replaced"""
+
+        return self.wait_for(
+            driver,
+            EC.invisibility_of_element_located((By.ID, LOGIN_USERNAME)),
+            "login to complete",
+            raise_on_timeout=False
+        )
+
+    def wait_for_modal_closed(self, driver):
+        """Wait until the booking modal has been dismissed"""
+
+        return self.wait_for(
+            driver,
+            EC.invisibility_of_element_located((By.CLASS_NAME, MODAL_CONTENT)),
+            "modal to close",
+            timeout=5,
+            raise_on_timeout=False
+        )
+
+    def print_summary(self):
+        """Print the number of waits and time spent waiting, grouped by condition"""
+
+        if not self.timings:
+            return
+
+        totals = {}
+        for description, seconds, succeeded in self.timings:
+            count, total, longest, timeouts = totals.get(description, (0, 0.0, 0.0, 0))
+            totals[description] = (count + 1, total + seconds, max(longest, seconds), timeouts + (not succeeded))
+
+        print("\n-------------------------------------------------------")
+        print("Wait summary:")
+        for description, (count, total, longest, timeouts) in sorted(totals.items(), key=lambda item: -item[1][1]):
+            print(f"    {description}: {count} waits, {total:.2f}s total, {longest:.2f}s max, {timeouts} timeouts")
+        print(f"    Total time waiting: {sum(seconds for _, seconds, _ in self.timings):.2f}s")
+        print("-------------------------------------------------------")
+
+    def reset(self):
+        """Clear recorded wait timings"""
+
+        self.timings = []
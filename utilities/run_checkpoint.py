@@ -0,0 +1,214 @@
+from datetime import datetime, timedelta
+import json
+import os
+import threading
+
+from utilities.scan_planner import WEEK_VIEW_DAYS
+
+# Default file holding the progress of the last serial booking run
+DEFAULT_CHECKPOINT_PATH = os.path.join("data", "run_checkpoint.json")
+
+class RunCheckpoint:
+    """Progress of a long booking run, saved after every week so a later run can resume it
+
+    The checkpoint identifies the run by its inputs (the prompt answers or
+    the job files) and records, per studio, the week views that were fully
+    processed, the dates already handled and the dates whose booking failed,
+    plus every booking attempt. Failed dates are not treated as handled, so a
+    resumed run tries them again.
+    It is written atomically, so a crash or Ctrl+C at any point leaves the
+    state of the last finished week behind. A run that completes removes it.
+    """
+
+    def __init__(self, path=DEFAULT_CHECKPOINT_PATH):
+        """Initialize the checkpoint
+
+        Args:
+            path: JSON file the progress is saved to
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.state = None
+
+    def load(self):
+        """Read the checkpoint left by an earlier run.
+
+        Returns:
+            Dict with the saved state, None if there is no readable checkpoint
+        """
+
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path) as checkpoint_file:
+                return json.load(checkpoint_file)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable checkpoint: {e}")
+            return None
+
+    def start(self, run, resume=False):
+        """Begin tracking a run, picking up the saved progress when resuming the same run.
+
+        Args:
+            run: JSON-serializable dict identifying the run, e.g. its prompt answers
+            resume: Whether to continue from the saved checkpoint
+
+        Returns:
+            bool: Whether saved progress was picked up
+
+        Raises:
+            ValueError: If resuming and the checkpoint on disk belongs to another run
+        """
+
+        saved = self.load() if resume else None
+        if saved and saved.get("run") != run:
+            saved_run = saved.get("run") or {}
+            differences = sorted(key for key in set(saved_run) | set(run) if saved_run.get(key) != run.get(key))
+            raise ValueError(
+                f"The checkpoint in {self.path} was saved by another run (differs in: {', '.join(differences)}), "
+                f"run without --resume to start over"
+            )
+
+        with self.lock:
+            if saved:
+                self.state = saved
+                print("-------------------------------------------------------")
+                print(f"Resuming the run stopped at {saved['updated_at'] or saved['started_at']}")
+                print(f"    {sum(len(weeks) for weeks in saved['finished_weeks'].values())} weeks finished, "
+                      f"{len(saved['bookings'])} booking attempts")
+                print("-------------------------------------------------------")
+                return True
+
+            if resume:
+                print("No checkpoint to resume, starting from the beginning")
+            self.state = {
+                "run": run,
+                "started_at": datetime.now().isoformat(timespec="seconds"),
+                "updated_at": None,
+                "current": None,  # Studio, month and week view of the last finished week
+                "finished_weeks": {},  # studio -> anchor date keys of fully processed week views
+                "processed_dates": {},  # studio -> date keys already handled
+                "failed_dates": {},  # studio -> date keys whose booking failed, retried on resume
+                "bookings": []  # Booking attempts as recorded by the ledger
+            }
+            self.save()
+            return False
+
+    def get_saved_run(self):
+        """Get the inputs of the run the checkpoint on disk belongs to, None without a checkpoint"""
+
+        saved = self.load()
+        return saved.get("run") if saved else None
+
+    def is_week_finished(self, studio, anchor):
+        """Check whether a week view was fully processed before the run stopped.
+
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            anchor: First date of the week view
+
+        Returns:
+            bool: Whether the week can be skipped
+        """
+
+        with self.lock:
+            return anchor.strftime("%Y-%m-%d") in self.state["finished_weeks"].get(studio.lower(), [])
+
+    def get_processed_dates(self, studio):
+        """Get the dates of a studio that were handled before the run stopped.
+
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+
+        Returns:
+            Set of date keys formatted as YYYY-MM-DD
+        """
+
+        with self.lock:
+            return set(self.state["processed_dates"].get(studio.lower(), []))
+
+    def get_resume_date(self, studio, target_year, target_month):
+        """Get the first date of a month a calendar walk has not reached yet.
+
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            target_year: Year of the month
+            target_month: Month number (1-12)
+
+        Returns:
+            date or None: The first failed date of the month, otherwise the day after the last
+            handled one, None if none was handled
+        """
+
+        prefix = f"{target_year:04d}-{target_month:02d}-"
+        handled = [date_key for date_key in self.get_processed_dates(studio) if date_key.startswith(prefix)]
+        with self.lock:
+            failed = [date_key for date_key in self.state.get("failed_dates", {}).get(studio.lower(), []) if date_key.startswith(prefix)]
+        if failed:
+            # The walk goes back to the first failed date, the handled dates after it are skipped as it passes them
+            return datetime.strptime(min(failed), "%Y-%m-%d").date()
+        if not handled:
+            return None
+        resume_date = datetime.strptime(max(handled), "%Y-%m-%d").date() + timedelta(days=1)
+        return resume_date if resume_date.month == target_month else None
+
+    def finish_week(self, studio, month, anchor, processed_dates, bookings, failed_dates=()):
+        """Record a processed week and save the checkpoint.
+
+        A week view holding a failed date is not marked finished, so a
+        resumed run shows it again.
+
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            month: Month number (1-12) the week was processed for
+            anchor: First date of the week view, None when walking the calendar
+            processed_dates: Date keys the handler has handled successfully so far
+            bookings: Every booking attempt of the run, from BookingLedger.get_bookings
+            failed_dates: Date keys whose booking failed in this run
+        """
+
+        studio = studio.lower()
+        with self.lock:
+            # Failures of the stopped run stay until a later week handles the date
+            failed = self.state.setdefault("failed_dates", {})
+            failed[studio] = sorted((set(failed.get(studio, [])) | set(failed_dates)) - set(processed_dates))
+            if anchor and not self.has_failed_date(failed[studio], anchor):
+                finished = self.state["finished_weeks"].setdefault(studio, [])
+                if anchor.strftime("%Y-%m-%d") not in finished:
+                    finished.append(anchor.strftime("%Y-%m-%d"))
+            self.state["processed_dates"][studio] = sorted(processed_dates)
+            self.state["bookings"] = bookings
+            self.state["current"] = {"studio": studio, "month": month, "anchor": anchor.strftime("%Y-%m-%d") if anchor else None}
+            self.state["updated_at"] = datetime.now().isoformat(timespec="seconds")
+            self.save()
+
+    def has_failed_date(self, failed_dates, anchor):
+        """Helper method to check whether a week view starting at anchor holds one of the failed dates"""
+
+        week_keys = {(anchor + timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range(WEEK_VIEW_DAYS)}
+        return bool(week_keys & set(failed_dates))
+
+    def get_bookings(self):
+        """Get the booking attempts recorded before the run stopped"""
+
+        with self.lock:
+            return list(self.state["bookings"])
+
+    def clear(self):
+        """Remove the checkpoint once the run has completed"""
+
+        with self.lock:
+            self.state = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def save(self):
+        """Helper method to write the state atomically, so an interrupted write never leaves a broken file"""
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as checkpoint_file:
+            json.dump(self.state, checkpoint_file, indent=1)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(temp_path, self.path)
@@ -0,0 +1,137 @@
+from datetime import date, datetime, timedelta
+import calendar
+
+# Number of days the schedule widget shows after the selected date
+WEEK_VIEW_DAYS = 7
+
+class ScanPlanner:
+    """Class to decide which week views have to be loaded to cover a date range"""
+
+    def __init__(self):
+        pass
+
+    def get_month_range(self, target_year, target_month, today=None, expiration_date=None):
+        """Get the bookable part of a month.
+
+        Args:
+            target_year: Year of the month
+            target_month: Month number (1-12)
+            today: Optional first bookable date, defaults to the current date
+            expiration_date: Optional last bookable date (membership expiration)
+
+        Returns:
+            Tuple (start_date, end_date); start_date is after end_date if nothing is bookable
+        """
+
+        start = date(target_year, target_month, 1)
+        end = date(target_year, target_month, calendar.monthrange(target_year, target_month)[1])
+
+        start = max(start, today or date.today())
+        if expiration_date:
+            end = min(end, expiration_date)
+        return start, end
+
+    def get_date_ranges(self, target_year, target_months, today=None, expiration_date=None):
+        """Get the bookable date ranges of a set of months, adjacent months merged into one range.
+
+        Args:
+            target_year: Year of the months
+            target_months: Month numbers (1-12)
+            today: Optional first bookable date, defaults to the current date
+            expiration_date: Optional last bookable date (membership expiration)
+
+        Returns:
+            List of (start_date, end_date) tuples in ascending order, without empty ranges
+        """
+
+        ranges = []
+        for target_month in sorted(set(target_months)):
+            start, end = self.get_month_range(target_year, target_month, today, expiration_date)
+            if start > end:
+                continue
+            if ranges and ranges[-1][1] + timedelta(days=1) >= start:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+        return ranges
+
+    def plan_anchor_dates(self, start_date, end_date, target_days=None):
+        """Get the dates to jump to so that every day that can match is shown once.
+
+        The range is covered by consecutive week views. With day filters the
+        first view starts on the first matching weekday, so days before it are
+        never loaded; every later view still shows each matching weekday once.
+
+        Args:
+            start_date: First date of the range
+            end_date: Last date of the range
+            target_days: Optional collection of day of week names, e.g. {'Tuesday'}
+
+        Returns:
+            List of dates in ascending order
+        """
+
+        if start_date > end_date:
+            return []
+
+        if target_days:
+            weekdays = [list(calendar.day_name).index(day) for day in target_days]
+            start_date += timedelta(days=min((weekday - start_date.weekday()) % 7 for weekday in weekdays))
+
+        anchors = []
+        anchor = start_date
+        while anchor <= end_date:
+            anchors.append(anchor)
+            anchor += timedelta(days=WEEK_VIEW_DAYS)
+        return anchors
+
+    def get_view_dates(self, anchor, start_date, end_date, target_days=None):
+        """Get the dates of a planned week view that can match and fall inside the range.
+
+        Args:
+            anchor: First date of the week view
+            start_date: First date of the range
+            end_date: Last date of the range
+            target_days: Optional collection of day of week names the filters allow
+
+        Returns:
+            List of dates in ascending order
+        """
+
+        view_dates = [anchor + timedelta(days=offset) for offset in range(WEEK_VIEW_DAYS)]
+        return [
+            day for day in view_dates
+            if start_date <= day <= end_date and (not target_days or day.strftime("%A") in target_days)
+        ]
+
+    def get_day_date(self, date_text, anchor):
+        """Get the date of a day header such as 'Monday, December 30'.
+
+        The header has no year, so the year is chosen that puts the date
+        closest to a date of the same week view. Views that cross New Year and
+        February 29 of leap years are handled, and the weekday in the header
+        settles any remaining doubt.
+
+        Args:
+            date_text: Day header text from the schedule
+            anchor: First date of the week view, or any date near it
+
+        Returns:
+            The date of the header
+
+        Raises:
+            ValueError: If the text is not a day header
+        """
+
+        candidates = []
+        for year in (anchor.year - 1, anchor.year, anchor.year + 1):
+            try:
+                candidates.append(datetime.strptime(f"{date_text} {year}", "%A, %B %d %Y").date())
+            except ValueError:
+                continue  # Not a header, or February 29 of a year that has none
+        if not candidates:
+            raise ValueError(f"Not a day header: {date_text}")
+
+        weekday = date_text.split(",")[0].strip()
+        candidates = [day for day in candidates if day.strftime("%A") == weekday] or candidates
+        return min(candidates, key=lambda day: abs(day - anchor))
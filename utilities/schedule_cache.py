@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta
+import json
+import os
+import threading
+
+# Default directory holding one snapshot file per studio
+DEFAULT_CACHE_DIRECTORY = os.path.join("data", "schedule_cache")
+
+# Session fields stored in a snapshot; the element index is only valid on the live page
+SNAPSHOT_FIELDS = ("date", "name", "staff", "start_time", "end_time")
+
+class ScheduleCache:
+    """Snapshots of parsed schedules per studio and day, with a TTL and diffing
+
+    Snapshots are kept in memory and, when a directory is given, in one JSON
+    file per studio so later runs can filter against them without the browser.
+    """
+
+    def __init__(self, directory=None, ttl=timedelta(hours=6)):
+        """Initialize the cache
+
+        Args:
+            directory: Optional directory of the snapshot files, memory only without it
+            ttl: How long a day's snapshot is used before it has to be scraped again
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.snapshots = {}  # studio -> {date_key: {"fetched_at": iso, "sessions": [...]}}
+
+    def get_path(self, studio):
+        """Helper method to build the snapshot file path of a studio"""
+
+        return os.path.join(self.directory, f"{studio.lower()}.json")
+
+    def load(self, studio):
+        """Helper method to return the snapshot of a studio, reading it from disk once"""
+
+        studio = studio.lower()
+        if studio not in self.snapshots:
+            self.snapshots[studio] = {}
+            if self.directory and os.path.exists(self.get_path(studio)):
+                try:
+                    with open(self.get_path(studio)) as snapshot_file:
+                        self.snapshots[studio] = json.load(snapshot_file)
+                except (OSError, ValueError) as e:
+                    print(f"Ignoring unreadable schedule cache for {studio}: {e}")
+        return self.snapshots[studio]
+
+    def save(self, studio):
+        """Helper method to write the snapshot of a studio to disk"""
+
+        if not self.directory:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = self.get_path(studio) + ".tmp"
+        with open(temp_path, "w") as snapshot_file:
+            json.dump(self.snapshots[studio.lower()], snapshot_file, indent=1)
+        os.replace(temp_path, self.get_path(studio))
+
+    def is_fresh(self, entry):
+        """Helper method to check a day entry against the TTL"""
+
+        return datetime.now() - datetime.fromisoformat(entry["fetched_at"]) < self.ttl
+
+    def get_week(self, studio, date_keys):
+        """Get the cached sessions of several days if all of them are fresh.
+
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            date_keys: Dates formatted as YYYY-MM-DD
+
+        Returns:
+            Dict of date_key -> list of session records, or None if any day is stale
+        """
+
+        with self.lock:
+            snapshot = self.load(studio)
+            week = {}
+            for date_key in date_keys:
+                entry = snapshot.get(date_key)
+                if not entry or not self.is_fresh(entry):
+                    return None
+                week[date_key] = entry["sessions"]
+            return week
+
+    def put_week(self, studio, days):
+        """Store freshly scraped days and compare them with the previous snapshot.
+
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            days: Dict of date_key -> list of session records
+
+        Returns:
+            Dict with 'new', 'removed' and 'changed' lists; changed entries are (old, new) pairs
+        """
+
+        diff = {"new": [], "removed": [], "changed": []}
+        now = datetime.now().isoformat()
+
+        with self.lock:
+            snapshot = self.load(studio)
+            for date_key, sessions in days.items():
+                sessions = [{field: session.get(field, "") for field in SNAPSHOT_FIELDS} for session in sessions]
+                previous = snapshot.get(date_key)
+                if previous:
+                    self.diff_day(previous["sessions"], sessions, diff)
+                snapshot[date_key] = {"fetched_at": now, "sessions": sessions}
+            self.save(studio)
+
+        return diff
+
+    def diff_day(self, old_sessions, new_sessions, diff):
+        """Helper method to add the differences between two snapshots of a day to diff
+
+        Sessions are matched by start time and class name; a matched session
+        whose instructor or end time differs counts as changed.
+        """
+
+        key = lambda session: (session["date"], session["start_time"], session["name"])
+        old_by_key = {key(session): session for session in old_sessions}
+        new_by_key = {key(session): session for session in new_sessions}
+
+        for session_key, session in new_by_key.items():
+            old = old_by_key.get(session_key)
+            if not old:
+                diff["new"].append(session)
+            elif (old["staff"], old["end_time"]) != (session["staff"], session["end_time"]):
+                diff["changed"].append((old, session))
+
+        for session_key, session in old_by_key.items():
+            if session_key not in new_by_key:
+                diff["removed"].append(session)
+
+    def print_diff(self, diff):
+        """Print the differences returned by put_week, if there are any"""
+
+        if not any(diff.values()):
+            return
+
+        print("\n-------------------------------------------------------")
+        print("Schedule changes since the last snapshot:")
+        for session in diff["new"]:
+            print(f"    New: {session['date']} {session['start_time']} {session['name']} with {session['staff']}")
+        for session in diff["removed"]:
+            print(f"    Removed: {session['date']} {session['start_time']} {session['name']} with {session['staff']}")
+        for old, session in diff["changed"]:
+            print(f"    Changed: {session['date']} {session['start_time']} {session['name']} "
+                  f"({old['staff']} -> {session['staff']}, ends {old['end_time']} -> {session['end_time']})")
+        print("-------------------------------------------------------")
@@ -0,0 +1,189 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+import csv
+import json
+import os
+
+from utilities.booking_rules import parse_session_time
+
+# Fields of every exported session record, in CSV column order
+EXPORT_FIELDS = ("studio", "date", "day", "start_time", "end_time", "name", "staff", "cart_label", "cart_enabled")
+
+# Export formats by file extension
+EXPORT_FORMATS = {".jsonl": "jsonl", ".csv": "csv", ".ics": "ics"}
+
+# Longest iCalendar content line in octets, longer lines are folded
+ICS_LINE_LIMIT = 75
+
+def get_schedule_record(studio, class_date, session):
+    """Build the exported record of a parsed session.
+
+    Args:
+        studio: Studio name ('cranford' or 'metuchen')
+        class_date: Date of the class
+        session: Session record from a ScheduleSource
+
+    Returns:
+        Dict with the EXPORT_FIELDS
+    """
+
+    return {
+        "studio": studio.lower(),
+        "date": class_date.strftime("%Y-%m-%d"),
+        "day": class_date.strftime("%A"),
+        "start_time": session.get("start_time", ""),
+        "end_time": session.get("end_time", ""),
+        "name": session.get("name", ""),
+        "staff": session.get("staff", ""),
+        "cart_label": session.get("cart_label", ""),
+        "cart_enabled": bool(session.get("cart_enabled"))
+    }
+
+class ScheduleWriter(ABC):
+    """Writes exported session records to a file as they arrive
+
+    Every record is flushed right away, so a reader following the file sees
+    each week as soon as it is scanned.
+    """
+
+    def __init__(self, path):
+        """Open the file and write the header of the format, if any
+
+        Args:
+            path: File to write
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.count = 0
+        self.write_header()
+
+    def write(self, record):
+        """Write one session record and flush it
+
+        Args:
+            record: Dict built by get_schedule_record
+        """
+
+        self.write_record(record)
+        self.file.flush()
+        self.count += 1
+
+    def close(self):
+        """Write the footer of the format, if any, and close the file"""
+
+        self.write_footer()
+        self.file.close()
+
+    def write_header(self):
+        """Helper method to write what comes before the first record"""
+
+    @abstractmethod
+    def write_record(self, record):
+        """Helper method to write one record in the writer's format"""
+
+    def write_footer(self):
+        """Helper method to write what comes after the last record"""
+
+class JsonLinesWriter(ScheduleWriter):
+    """One JSON object per session and line"""
+
+    def write_record(self, record):
+        self.file.write(json.dumps(record) + "\n")
+
+class CsvWriter(ScheduleWriter):
+    """One CSV row per session, with a header row"""
+
+    def write_header(self):
+        self.writer = csv.DictWriter(self.file, fieldnames=EXPORT_FIELDS)
+        self.writer.writeheader()
+
+    def write_record(self, record):
+        self.writer.writerow(record)
+
+class IcsWriter(ScheduleWriter):
+    """An iCalendar feed with one event per session, in the studio's local time"""
+
+    def write_header(self):
+        self.stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        self.write_lines(["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//yoga-reservation//schedule export//EN", "CALSCALE:GREGORIAN"])
+
+    def write_record(self, record):
+        class_date = datetime.strptime(record["date"], "%Y-%m-%d").date()
+        start_time = parse_session_time(record["start_time"]) if record["start_time"] else None
+        end_time = parse_session_time(record["end_time"]) if record["end_time"] else None
+        if not start_time:
+            return  # An event needs a start, the other formats still carry the session
+
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:{record['studio']}-{record['date']}-{start_time.strftime('%H%M')}-{self.get_uid_name(record['name'])}@yoga-reservation",
+            f"DTSTAMP:{self.stamp}",
+            f"DTSTART:{datetime.combine(class_date, start_time).strftime('%Y%m%dT%H%M%S')}"
+        ]
+        if end_time:
+            lines.append(f"DTEND:{datetime.combine(class_date, end_time).strftime('%Y%m%dT%H%M%S')}")
+        lines.append(f"SUMMARY:{self.escape(record['name'])}")
+        lines.append(f"LOCATION:{self.escape(record['studio'].title())}")
+        description = []
+        if record["staff"]:
+            description.append(f"Instructor: {record['staff']}")
+        if record["cart_label"]:
+            description.append(f"Status: {record['cart_label']}")
+        if description:
+            lines.append("DESCRIPTION:" + self.escape("\n".join(description)))
+        lines.append("END:VEVENT")
+        self.write_lines(lines)
+
+    def write_footer(self):
+        self.write_lines(["END:VCALENDAR"])
+
+    def write_lines(self, lines):
+        """Helper method to write content lines, folded and CRLF terminated as iCalendar requires"""
+
+        self.file.write("".join(self.fold(line) + "\r\n" for line in lines))
+
+    def fold(self, line):
+        """Helper method to split a line into chunks of at most ICS_LINE_LIMIT octets, continued with a space"""
+
+        chunks = []
+        chunk = ""
+        for character in line:
+            limit = ICS_LINE_LIMIT if not chunks else ICS_LINE_LIMIT - 1
+            if len((chunk + character).encode("utf-8")) > limit:
+                chunks.append(chunk)
+                chunk = ""
+            chunk += character
+        chunks.append(chunk)
+        return "\r\n ".join(chunks)
+
+    def escape(self, text):
+        """Helper method to escape a text value"""
+
+        return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+    def get_uid_name(self, name):
+        """Helper method to turn a class name into a UID-safe token"""
+
+        return "".join(character if character.isalnum() else "-" for character in name.lower()).strip("-")
+
+def open_schedule_writer(path, export_format=None):
+    """Open a writer for a schedule export.
+
+    Args:
+        path: File to write
+        export_format: 'jsonl', 'csv' or 'ics', taken from the file extension if None
+
+    Returns:
+        ScheduleWriter: The open writer
+
+    Raises:
+        ValueError: If the format cannot be told from the path or is unknown
+    """
+
+    if export_format is None:
+        export_format = EXPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+    writers = {"jsonl": JsonLinesWriter, "csv": CsvWriter, "ics": IcsWriter}
+    if export_format not in writers:
+        raise ValueError(f"Cannot tell the export format of {path}, use a .jsonl, .csv or .ics file")
+    return writers[export_format](path)
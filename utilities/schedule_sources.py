@@ -0,0 +1,281 @@
+from abc import ABC, abstractmethod
+from html.parser import HTMLParser
+import json
+
+from utilities.scan_planner import ScanPlanner
+from utilities.tracer import traced
+from resources.html_selectors import *
+
+# Host serving the branded-web widget's schedule markup
+WIDGET_BASE_URL = "https://widgets.mindbodyonline.com"
+
+# Path of the schedule markup of a widget, the same request the widget makes when a week is shown
+WIDGET_SCHEDULE_PATH = "/widgets/schedules/{widget_id}/load_markup"
+
+# Key of the schedule HTML in the widget's JSON response
+WIDGET_MARKUP_KEY = "class_sessions"
+
+# Tags without a closing tag, which never hold any of the schedule's elements
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+class ScheduleSource(ABC):
+    """Where the handler reads a studio's week of classes from
+
+    Implementations return the same session records as SessionUtils.extract_week,
+    grouped by date, so the handler can filter and cache them without knowing
+    whether a browser was involved.
+    """
+
+    # Whether reading a week moves a browser, which then shows that week
+    uses_browser = True
+
+    @abstractmethod
+    def get_week(self, studio, anchor):
+        """Read the week view that starts at a date.
+
+        Args:
+            studio: Studio name ('cranford' or 'metuchen')
+            anchor: First date of the week view
+
+        Returns:
+            Dict of date_key (YYYY-MM-DD) -> list of session records, or None if the week could not be read
+        """
+
+    def close(self):
+        """Release what the source holds open"""
+
+        pass
+
+class SeleniumScheduleSource(ScheduleSource):
+    """Reads weeks by jumping the live widget in a browser to them"""
+
+    uses_browser = True
+
+    def __init__(self, driver, calendar_utils, session_utils):
+        """Initialize the source
+
+        Args:
+            driver: Selenium webdriver instance with the studio page loaded
+            calendar_utils: CalendarUtils used to jump to a week
+            session_utils: SessionUtils used to read the week
+        """
+        self.driver = driver
+        self.calendar_utils = calendar_utils
+        self.session_utils = session_utils
+        self.scan_planner = ScanPlanner()
+
+    @traced("scan")
+    def get_week(self, studio, anchor):
+        if not self.calendar_utils.jump_to_date(self.driver, studio, anchor):
+            return None
+        return group_days_by_date(self.session_utils.extract_week(self.driver), anchor, self.scan_planner)
+
+class HttpScheduleSource(ScheduleSource):
+    """Reads weeks straight from the widget's schedule responses, without a browser
+
+    The markup the widget would insert into the page is fetched over a pooled
+    HTTP session and parsed with the same selectors the browser script uses.
+    Session records carry no element index, so booking still needs the browser.
+    """
+
+    uses_browser = False
+
+    def __init__(self, base_url=WIDGET_BASE_URL, widget_ids=None, timeout=10, pool_size=8):
+        """Initialize the source
+
+        Args:
+            base_url: Scheme and host serving the widget, e.g. a local stand-in server
+            widget_ids: Optional dict of studio name -> widget id, the configured ids if None
+            timeout: Seconds a request may take
+            pool_size: Number of connections kept open for reuse, at least the number of workers
+
+        Raises:
+            ValueError: If requests is not installed or the widget ids are not configured
+        """
+        try:
+            import requests
+            from requests.adapters import HTTPAdapter
+        except ImportError:
+            raise ValueError("The HTTP schedule source requires requests (pip install requests)")
+
+        self.base_url = base_url.rstrip("/")
+        self.widget_ids = widget_ids or self.get_configured_widget_ids()
+        self.timeout = timeout
+        self.scan_planner = ScanPlanner()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get_configured_widget_ids(self):
+        """Helper method to read the widget ids from config.py, which only this source needs"""
+
+        try:
+            from config.config import HYR_METUCHEN_WIDGET_ID, HYR_CRANFORD_WIDGET_ID
+        except ImportError:
+            raise ValueError("The HTTP schedule source needs HYR_METUCHEN_WIDGET_ID and HYR_CRANFORD_WIDGET_ID in config.py")
+        return {"metuchen": HYR_METUCHEN_WIDGET_ID, "cranford": HYR_CRANFORD_WIDGET_ID}
+
+    @traced("scan")
+    def get_week(self, studio, anchor):
+        try:
+            markup = self.fetch_markup(studio, anchor)
+        except Exception as e:
+            print(f"Could not fetch the schedule of {anchor.strftime('%B %d')}: {e}")
+            return None
+        return group_days_by_date(parse_schedule_markup(markup), anchor, self.scan_planner)
+
+    def fetch_markup(self, studio, anchor):
+        """Helper method to download the schedule HTML of the week view starting at anchor"""
+
+        url = self.base_url + WIDGET_SCHEDULE_PATH.format(widget_id=self.widget_ids[studio.lower()])
+        response = self.session.get(url, params={"options[start_date]": anchor.strftime("%Y-%m-%d")}, timeout=self.timeout)
+        response.raise_for_status()
+
+        # The widget answers with JSON wrapping the markup; a captured page may be plain HTML
+        try:
+            return json.loads(response.text)[WIDGET_MARKUP_KEY]
+        except (ValueError, KeyError, TypeError):
+            return response.text
+
+    def close(self):
+        self.session.close()
+
+class WidgetMarkupParser(HTMLParser):
+    """Collects the day and session records of the widget's schedule markup
+
+    Produces the same records as EXTRACT_WEEK_SCRIPT, except that 'index' is
+    the position of the session in the markup rather than on a live page.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []  # (tag, role) of every open element; role is None, 'day', 'session', 'basics' or a field name
+        self.days = []
+        self.day = None
+        self.session = None
+        self.session_count = 0
+        self.field_text = None  # Text parts of the field being read
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+
+        classes = (dict(attrs).get("class") or "").split()
+        role = None
+
+        if SESSION_DAY in classes and not self.day:
+            role = "day"
+            self.day = {"date": "", "empty": SESSION_DAY_EMPTY in classes, "sessions": []}
+        elif SESSION in classes and self.day:
+            role = "session"
+            self.session = {
+                "index": self.session_count, "basics": False, "name": "", "staff": "", "start_time": "", "end_time": "",
+                "cart_label": "", "cart_enabled": False
+            }
+            self.session_count += 1
+        elif self.field_text is None:
+            role = self.get_field_role(classes)
+            if role == "basics":
+                self.session["basics"] = True
+            elif role:
+                self.field_text = []
+            if role == "cart_label":
+                self.session["cart_enabled"] = "disabled" not in dict(attrs) and "disabled" not in classes
+
+        self.stack.append((tag, role))
+
+    def get_field_role(self, classes):
+        """Helper method to name the field an element holds, if any"""
+
+        if self.session:
+            if SESSION_BASICS in classes:
+                return "basics"
+            if SESSION_CART_BUTTON in classes:
+                return "cart_label"
+            if self.session["basics"]:
+                for field, selector in (("name", SESSION_NAME), ("staff", SESSION_STAFF),
+                                        ("start_time", SESSION_START_TIME), ("end_time", SESSION_END_TIME)):
+                    if selector in classes:
+                        return field
+        elif self.day and SESSION_DATE in classes:
+            return "date"
+        return None
+
+    def handle_endtag(self, tag):
+        # Close everything up to the matching tag, as browsers do for unclosed elements
+        if not any(open_tag == tag for open_tag, _ in self.stack):
+            return
+        while self.stack:
+            open_tag, role = self.stack.pop()
+            self.close_role(role)
+            if open_tag == tag:
+                return
+
+    def close_role(self, role):
+        """Helper method to finish the record or field an element held"""
+
+        if role == "day":
+            self.days.append(self.day)
+            self.day = None
+        elif role == "session":
+            if self.session["basics"] and not self.day["empty"]:
+                session = {key: value for key, value in self.session.items() if key != "basics"}
+                session["date"] = self.day["date"]
+                self.day["sessions"].append(session)
+            self.session = None
+        elif role and role != "basics":
+            text = " ".join("".join(self.field_text).split())
+            if role == "date":
+                self.day["date"] = text
+            else:
+                self.session[role] = text
+            self.field_text = None
+
+    def handle_data(self, data):
+        if self.field_text is not None:
+            self.field_text.append(data)
+
+    def close(self):
+        super().close()
+        while self.stack:
+            self.close_role(self.stack.pop()[1])
+
+def parse_schedule_markup(markup):
+    """Parse the widget's schedule HTML.
+
+    Args:
+        markup: HTML of the sessions container
+
+    Returns:
+        List of day records, each a dict with 'date', 'empty' and 'sessions'
+    """
+
+    parser = WidgetMarkupParser()
+    parser.feed(markup)
+    parser.close()
+    return parser.days
+
+def group_days_by_date(days, anchor, scan_planner):
+    """Turn day records into a dict of date_key -> session records.
+
+    Args:
+        days: Day records from SessionUtils.extract_week or parse_schedule_markup, may be None
+        anchor: First date of the week view, used to find the year of each day
+        scan_planner: ScanPlanner used to parse the day headers
+
+    Returns:
+        Dict of date_key (YYYY-MM-DD) -> list of session records, or None if days is None
+    """
+
+    if days is None:
+        return None
+
+    week = {}
+    for day in days:
+        try:
+            week[scan_planner.get_day_date(day["date"], anchor).strftime("%Y-%m-%d")] = day["sessions"]
+        except ValueError:
+            continue
+    return week
@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta
+import json
+import os
+import threading
+import time
+
+try:
+    from config.config import MINDBODY_LOGIN_URL
+except ImportError:
+    MINDBODY_LOGIN_URL = None  # Older config files have no sign-in page, bookings log in from the modal
+
+# Default file holding the cookies of the last authenticated Mindbody session
+DEFAULT_SESSION_PATH = os.path.join("data", "mindbody_session.json")
+
+# How long after its last validation a saved session is used without checking the sign-in page
+SESSION_TRUST_WINDOW = timedelta(minutes=30)
+
+# Only cookies of this domain are saved, the studio site's cookies are not needed to book
+SESSION_COOKIE_DOMAIN = "mindbodyonline.com"
+
+# Cookie fields accepted by the Network.setCookies DevTools command
+COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite")
+
+class SessionManager:
+    """Class to log into Mindbody once and reuse the session across runs and browsers
+
+    The cookies of an authenticated session are kept in memory and, when a
+    path is given, on disk. A browser that starts gets them injected before
+    it opens any modal, so bookings never have to log in themselves.
+    """
+
+    def __init__(self, path=None, login_url=MINDBODY_LOGIN_URL, trust_window=SESSION_TRUST_WINDOW):
+        """Initialize the session manager
+
+        Args:
+            path: Optional file the session cookies are saved to, memory only without it
+            login_url: URL of the Mindbody sign-in page, None to skip the up-front login
+            trust_window: How long a validated session is reused without checking it again
+        """
+        self.path = path
+        self.login_url = login_url
+        self.trust_window = trust_window
+        self.lock = threading.Lock()  # Browsers starting at once log in only once
+        self.session = None  # {"validated_at": iso, "cookies": [...]}, loaded from disk once
+        self.loaded = False
+
+    def start(self, driver, modal_utils):
+        """Make sure a browser is logged into Mindbody before it books anything.
+
+        Saved cookies are injected first. If they were validated within the
+        trust window and none has expired they are used as they are, otherwise
+        the sign-in page is opened once and the form is filled in only if the
+        cookies no longer authenticate.
+
+        Args:
+            driver: Selenium webdriver instance
+            modal_utils: ModalUtils of the handler driving the browser
+
+        Returns:
+            bool: Whether the browser is logged in
+        """
+
+        with self.lock:
+            session = self.load()
+            if session:
+                self.restore_cookies(driver, session["cookies"])
+                if self.is_trusted(session):
+                    print("    Reusing saved Mindbody session")
+                    return True
+
+            if not self.login_url:
+                print("    No MINDBODY_LOGIN_URL in config.py, skipping the up-front login")
+                return False
+
+            if not modal_utils.login_up_front(driver, self.login_url):
+                return False
+
+            self.save(driver)
+            return True
+
+    def load(self):
+        """Helper method to return the saved session, reading it from disk once"""
+
+        if not self.loaded:
+            self.loaded = True
+            if self.path and os.path.exists(self.path):
+                try:
+                    with open(self.path) as session_file:
+                        self.session = json.load(session_file)
+                except (OSError, ValueError) as e:
+                    print(f"Ignoring unreadable session file: {e}")
+        return self.session
+
+    def save(self, driver):
+        """Helper method to store the browser's Mindbody cookies in memory and on disk"""
+
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+        self.session = {
+            "validated_at": datetime.now().isoformat(),
+            "cookies": [cookie for cookie in cookies if SESSION_COOKIE_DOMAIN in cookie.get("domain", "")]
+        }
+
+        if not self.path:
+            return
+
+        # The cookies authenticate the account, keep the file private to the user
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as session_file:
+            json.dump(self.session, session_file, indent=1)
+        os.replace(temp_path, self.path)
+
+    def restore_cookies(self, driver, cookies):
+        """Helper method to inject saved cookies without loading a page of their domain"""
+
+        now = time.time()
+        params = []
+        for cookie in cookies:
+            param = {field: cookie[field] for field in COOKIE_FIELDS if field in cookie}
+            if not cookie.get("session") and cookie.get("expires", -1) > 0:
+                if cookie["expires"] <= now:
+                    continue
+                param["expires"] = cookie["expires"]
+            params.append(param)
+
+        if params:
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": params})
+
+    def is_trusted(self, session):
+        """Helper method to check whether a session can be used without validating it"""
+
+        if datetime.now() - datetime.fromisoformat(session["validated_at"]) >= self.trust_window:
+            return False
+
+        now = time.time()
+        return bool(session["cookies"]) and not any(
+            not cookie.get("session") and 0 < cookie.get("expires", -1) <= now
+            for cookie in session["cookies"]
+        )
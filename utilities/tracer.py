@@ -0,0 +1,196 @@
+from contextlib import contextmanager
+from functools import wraps
+import inspect
+import json
+import os
+import threading
+import time
+
+# Tracer the traced() methods and span() blocks report to, None while tracing is off
+active_tracer = None
+
+class Tracer:
+    """Records timed spans of a run and writes them in the Chrome trace event format
+
+    The file loads in chrome://tracing or https://ui.perfetto.dev, with one
+    track per thread, so parallel workers show up side by side. Spans carry a
+    category (navigation, scan, booking, login, wait, sleep) used to split the
+    run's time in the summary.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self.events = []
+        self.thread_ids = set()  # Threads whose name has been recorded
+
+    def add_span(self, name, category, start, end, args=None):
+        """Record a finished span.
+
+        Args:
+            name: Label shown on the span
+            category: Kind of work the span measures
+            start: time.perf_counter() value at which the span started
+            end: time.perf_counter() value at which the span ended
+            args: Optional dict shown with the span
+        """
+
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round((start - self.origin) * 1_000_000, 1),
+            "dur": round((end - start) * 1_000_000, 1),
+            "pid": self.pid,
+            "tid": thread.ident
+        }
+        if args:
+            event["args"] = {key: str(value) for key, value in args.items()}
+
+        with self.lock:
+            if thread.ident not in self.thread_ids:
+                self.thread_ids.add(thread.ident)
+                self.events.append({
+                    "name": "thread_name", "ph": "M", "pid": self.pid, "tid": thread.ident,
+                    "args": {"name": thread.name}
+                })
+            self.events.append(event)
+
+    def save(self, path):
+        """Write the recorded spans to a trace file.
+
+        Args:
+            path: Path of the JSON trace file
+        """
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self.lock:
+            trace = {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+        with open(path, "w") as trace_file:
+            json.dump(trace, trace_file)
+
+    def get_category_totals(self):
+        """Get the time spent per category, each span counting only the time none of its nested spans cover
+
+        Returns:
+            Dict of category -> seconds
+        """
+
+        with self.lock:
+            spans = [event for event in self.events if event["ph"] == "X"]
+
+        totals = {}
+        stacks = {}  # tid -> [[end, category, self time]] of the spans open at the current one
+        for event in sorted(spans, key=lambda event: (event["ts"], -event["dur"])):
+            stack = stacks.setdefault(event["tid"], [])
+            while stack and stack[-1][0] <= event["ts"]:
+                _, category, seconds = stack.pop()
+                totals[category] = totals.get(category, 0.0) + seconds
+            duration = event["dur"] / 1_000_000
+            if stack:
+                stack[-1][2] -= duration
+            stack.append([event["ts"] + event["dur"], event["cat"], duration])
+
+        for stack in stacks.values():
+            for _, category, seconds in stack:
+                totals[category] = totals.get(category, 0.0) + seconds
+        return totals
+
+    def print_summary(self, path=None):
+        """Print the time spent per category
+
+        Args:
+            path: Optional path the trace was saved to
+        """
+
+        totals = self.get_category_totals()
+        if not totals:
+            return
+
+        print("\n-------------------------------------------------------")
+        print(f"Time per phase ({time.perf_counter() - self.origin:.2f}s since tracing started):")
+        for category, seconds in sorted(totals.items(), key=lambda item: -item[1]):
+            print(f"    {category}: {seconds:.2f}s")
+        if path:
+            print(f"    Trace written to {path} (open it in chrome://tracing or ui.perfetto.dev)")
+        print("-------------------------------------------------------")
+
+def start_tracing():
+    """Start recording spans.
+
+    Returns:
+        Tracer: The tracer every span now reports to
+    """
+
+    global active_tracer
+    active_tracer = Tracer()
+    return active_tracer
+
+@contextmanager
+def span(name, category, **args):
+    """Time a block of code as a span, a no-op while tracing is off.
+
+    Args:
+        name: Label shown on the span
+        category: Kind of work the span measures
+        **args: Values shown with the span
+    """
+
+    tracer = active_tracer
+    if not tracer:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        tracer.add_span(name, category, start, time.perf_counter(), args)
+
+def traced(category):
+    """Decorator timing every call of a method as a span named after it.
+
+    Args:
+        category: Kind of work the method does
+    """
+
+    def decorator(function):
+        if inspect.isgeneratorfunction(function):
+            return traced_generator(function, category)
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            tracer = active_tracer
+            if not tracer:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                tracer.add_span(function.__name__, category, start, time.perf_counter())
+        return wrapper
+    return decorator
+
+def traced_generator(function, category):
+    """Helper function to time a generator method, one span per step so the caller's own work is left out"""
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        generator = function(*args, **kwargs)
+        try:
+            while True:
+                tracer = active_tracer
+                start = time.perf_counter()
+                try:
+                    item = next(generator)
+                except StopIteration:
+                    return
+                finally:
+                    if tracer:
+                        tracer.add_span(function.__name__, category, start, time.perf_counter())
+                yield item
+        finally:
+            generator.close()
+    return wrapper
@@ -0,0 +1,145 @@
+from urllib.request import urlopen
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+# Port the long-lived Chrome listens on for remote debugging
+DEFAULT_WARM_PORT = 9222
+
+# Profile of the long-lived Chrome, kept between runs so its cookies and cache stay warm
+WARM_PROFILE_DIRECTORY = os.path.join("data", "warm_chrome_profile")
+
+# Seconds a freshly launched Chrome may take to accept debugger connections
+WARM_LAUNCH_TIMEOUT = 15
+
+# Chrome executables tried when CHROME_BINARY is not set
+CHROME_EXECUTABLES = [
+    "google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"
+]
+
+class WarmBrowser:
+    """A Chrome that outlives the script, reused by every run through remote debugging
+
+    The first run starts Chrome with a debugging port and a profile of its
+    own, detached from the script. Later runs attach to it instead of
+    launching a browser, so its login cookies and HTTP cache carry over.
+    Every driver works in a tab of its own, and quitting the driver only
+    closes that tab.
+    """
+
+    def __init__(self, port=DEFAULT_WARM_PORT, profile_directory=WARM_PROFILE_DIRECTORY, headless=False):
+        """Initialize the warm browser
+
+        Args:
+            port: Remote debugging port of the long-lived Chrome
+            profile_directory: Profile used when this script has to start Chrome
+            headless: Whether a Chrome started by this script runs headless
+        """
+        self.port = port
+        self.profile_directory = profile_directory
+        self.headless = headless
+        self.lock = threading.Lock()
+
+    @property
+    def address(self):
+        """host:port for the debuggerAddress option"""
+
+        return f"127.0.0.1:{self.port}"
+
+    def is_running(self):
+        """Check whether a Chrome answers on the debugging port"""
+
+        try:
+            with urlopen(f"http://{self.address}/json/version", timeout=0.5) as response:
+                return response.status == 200
+        except OSError:
+            return False
+
+    def ensure_running(self):
+        """Start the long-lived Chrome unless it is already up.
+
+        Returns:
+            str: The debugger address to attach to
+
+        Raises:
+            ValueError: If Chrome cannot be found or does not open its debugging port
+        """
+
+        with self.lock:  # Parallel workers must not start two browsers
+            if self.is_running():
+                return self.address
+
+            print(f"Starting a warm browser on port {self.port}...")
+            self.launch()
+            deadline = time.monotonic() + WARM_LAUNCH_TIMEOUT
+            while time.monotonic() < deadline:
+                if self.is_running():
+                    return self.address
+                time.sleep(0.2)
+
+        raise ValueError(f"Chrome did not open its debugging port {self.port} within {WARM_LAUNCH_TIMEOUT}s")
+
+    def launch(self):
+        """Helper method to start Chrome detached from this process, so it outlives the run"""
+
+        arguments = [
+            self.find_chrome(),
+            f"--remote-debugging-port={self.port}",
+            f"--user-data-dir={os.path.abspath(self.profile_directory)}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--disable-gpu"
+        ]
+        if self.headless:
+            arguments.append("--headless=new")
+        arguments.append("about:blank")  # Tab kept open so the browser survives the runs' tabs closing
+
+        os.makedirs(self.profile_directory, exist_ok=True)
+        detach = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP} \
+            if sys.platform == "win32" else {"start_new_session": True}
+        subprocess.Popen(arguments, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **detach)
+
+    def find_chrome(self):
+        """Helper method to locate the Chrome executable"""
+
+        for candidate in [os.environ.get("CHROME_BINARY")] + CHROME_EXECUTABLES:
+            if not candidate:
+                continue
+            path = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+            if path:
+                return path
+        raise ValueError(
+            "Chrome was not found; set CHROME_BINARY or start Chrome yourself with "
+            f"--remote-debugging-port={self.port}"
+        )
+
+    def open_tab(self, driver):
+        """Move a driver attached to the warm browser into a fresh tab of its own.
+
+        Quitting the driver afterwards closes only that tab and leaves the
+        browser running for the next run.
+
+        Args:
+            driver: Selenium webdriver attached through debuggerAddress
+        """
+
+        driver.switch_to.new_window('tab')
+        tab = driver.current_window_handle
+        quit_driver = driver.quit
+
+        def close_tab_and_quit():
+            try:
+                if tab in driver.window_handles:
+                    driver.switch_to.window(tab)
+                    driver.close()
+            except Exception:
+                pass  # The tab or browser is already gone
+            quit_driver()
+
+        driver.quit = close_tab_and_quit
@@ -0,0 +1,120 @@
+# Chrome switches that keep a tab in the background rendering at full speed, so a prefetched week is ready when needed
+BACKGROUND_TAB_ARGUMENTS = [
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding"
+]
+
+class WeekPrefetcher:
+    """Loads the next week view in a second tab while the current tab books
+
+    A WebDriver session drives one tab at a time, but a tab keeps loading
+    and rendering while the session works in another one. The next week is
+    therefore started in the spare tab with a single datepicker command,
+    and the session goes straight back to booking in the main tab. Once
+    the current week is done, the spare tab already shows the next week and
+    the two tabs swap roles.
+
+    Prefetching needs the datepicker input, so it starts once a jump in the
+    main tab has confirmed the widget accepts it; if the widget only accepts
+    jumps through the calendar popup, weeks are shown in the main tab as before.
+    """
+
+    def __init__(self, driver, calendar_utils, wait_utils):
+        """Initialize the prefetcher and start opening the spare tab
+
+        Args:
+            driver: Selenium webdriver instance with the studio page loaded
+            calendar_utils: CalendarUtils of the handler, which knows whether the datepicker input works
+            wait_utils: WaitUtils of the handler
+        """
+        self.driver = driver
+        self.calendar_utils = calendar_utils
+        self.wait_utils = wait_utils
+        self.original_tab = driver.current_window_handle
+        self.main_tab = self.original_tab
+        self.spare_tab = None
+        self.pending = None  # Date whose week the spare tab is loading
+        self.hits = 0
+        self.open_spare_tab()
+
+    def open_spare_tab(self):
+        """Helper method to open the studio page in a second tab without waiting for it to load"""
+
+        url = self.driver.current_url
+        handles = set(self.driver.window_handles)
+        self.driver.execute_script("window.open(arguments[0], '_blank');", url)
+        opened = [handle for handle in self.driver.window_handles if handle not in handles]
+
+        if opened:
+            self.spare_tab = opened[0]
+            return
+
+        # The popup was blocked (a browser not started by chromedriver), open the tab through WebDriver instead
+        self.driver.switch_to.new_window('tab')
+        self.spare_tab = self.driver.current_window_handle
+        self.driver.get(url)
+        self.driver.switch_to.window(self.main_tab)
+
+    def start(self, date_obj):
+        """Start loading the week of a date in the spare tab, returning to the main tab right away.
+
+        Args:
+            date_obj: First date of the week view to load
+        """
+
+        self.pending = None
+        if self.calendar_utils.jump_method != "input" or not self.spare_tab:
+            return  # Until a jump in the main tab confirmed the input, a prefetch could wait for nothing
+
+        self.driver.switch_to.window(self.spare_tab)
+        try:
+            # Only the first week waits, for the widget of the freshly opened tab to load
+            started = self.wait_utils.wait_for(
+                self.driver, lambda d: self.calendar_utils.set_datepicker_input(d, date_obj),
+                "prefetch tab datepicker", raise_on_timeout=False
+            )
+        finally:
+            self.driver.switch_to.window(self.main_tab)
+
+        if started:
+            self.pending = date_obj
+
+    def take(self, date_obj):
+        """Switch to the spare tab if it holds the week of a date, making it the main tab.
+
+        Args:
+            date_obj: First date of the week view that is needed
+
+        Returns:
+            bool: Whether the week is shown in the (new) main tab, False if it still has to be jumped to
+        """
+
+        if self.pending != date_obj:
+            return False
+        self.pending = None
+
+        self.driver.switch_to.window(self.spare_tab)
+        if not self.wait_utils.wait_for_week_containing(self.driver, date_obj):
+            self.driver.switch_to.window(self.main_tab)
+            return False
+
+        self.main_tab, self.spare_tab = self.spare_tab, self.main_tab
+        self.hits += 1
+        return True
+
+    def close(self):
+        """Close the tab that is not the original one and continue in the original tab
+
+        The original tab is the one the caller (and a warm browser) knows, so
+        it is the one kept, whatever week it shows.
+        """
+
+        self.pending = None
+        extra_tab = self.main_tab if self.main_tab != self.original_tab else self.spare_tab
+        if extra_tab and extra_tab in self.driver.window_handles:
+            self.driver.switch_to.window(extra_tab)
+            self.driver.close()
+        self.driver.switch_to.window(self.original_tab)
+        self.main_tab = self.original_tab
+        self.spare_tab = None
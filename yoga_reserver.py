@@ -1,12 +1,55 @@
-from selenium import webdriver
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+import argparse
 import calendar
-from utilities.mindbody_handler import MindbodyHandler
+import os
+import shutil
+from utilities.booking_ledger import BookingLedger, DEFAULT_LEDGER_PATH
+from utilities.schedule_cache import ScheduleCache, DEFAULT_CACHE_DIRECTORY
+from utilities.job_loader import load_job_file, STUDIOS
+from utilities.job_orchestrator import JobOrchestrator
+from utilities.command_profiler import CommandProfiler
+from utilities.tracer import start_tracing, span, traced
+from utilities.browser_launcher import BrowserLauncher
+from utilities.warm_browser import WarmBrowser, DEFAULT_WARM_PORT
+from utilities.booking_rules import BookingRule, parse_time
+from utilities.session_manager import SessionManager, DEFAULT_SESSION_PATH, MINDBODY_LOGIN_URL
+from utilities.booking_queue import BookingQueue, DEFAULT_QUEUE_PATH
+from utilities.members import load_members
+from utilities.schedule_export import EXPORT_FORMATS
+from utilities.run_checkpoint import RunCheckpoint, DEFAULT_CHECKPOINT_PATH
+from utilities.week_prefetcher import BACKGROUND_TAB_ARGUMENTS
+from utilities.schedule_sources import HttpScheduleSource, WIDGET_BASE_URL
 from config.config import (
     HYR_METUCHEN_URL,
     HYR_CRANFORD_URL
 )
 
+# Window size used by the lean profile; wide enough for the widget's desktop layout
+LEAN_WINDOW_SIZE = "1280,900"
+
+# Requests the lean profile never downloads: images, fonts, media and analytics
+LEAN_BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.m4a",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*connect.facebook.net*", "*hotjar.com*", "*clarity.ms*",
+    "*segment.io*", "*nr-data.net*", "*newrelic.com*"
+]
+
+# Last chromedriver binary Selenium resolved, reused so later launches skip the lookup
+CHROMEDRIVER_PATH_CACHE = os.path.join("data", "chromedriver_path.txt")
+
+# CommandProfiler every new driver reports to, set by --instrument
+command_profiler = None
+
+# WarmBrowser every new driver attaches to, set by --warm
+warm_browser = None
+
+# Whether new drivers keep background tabs rendering for the week prefetch, set by --prefetch
+prefetch_weeks = False
+
 def get_studio_choice():
     """Prompts the user to select a yoga studio.
     
@@ -187,12 +230,15 @@ def get_instructor():
         except:
             print("Invalid input. Please try again.")
 
-def read_all_inputs():
+def read_all_inputs(on_studio_selected=None):
     """Collects all necessary inputs from the user for class booking.
     
     Prompts for studio, month, instructor, day, and time preferences.
     Provides feedback after each selection.
     
+    Args:
+        on_studio_selected (callable, optional): Called with the studio name as soon as it is chosen
+    
     Returns:
         tuple: Contains all booking parameters:
             - str: Studio name
@@ -206,6 +252,8 @@ def read_all_inputs():
 
     # Get studio choice
     studio = get_studio_choice()
+    if on_studio_selected:
+        on_studio_selected(studio)
     print(f"\nSelected studio: {'Metuchen' if 'metuchen' in studio.lower() else 'Cranford'}")
     print("-------------------------------------------------------")
     print("\n")
@@ -248,7 +296,142 @@ def read_all_inputs():
 
     return studio, target_year, start_month, book_all_months, target_day, target_time, instructor
 
-def begin_reservation_system(studio, target_year, start_month, book_all_months, target_day, target_time, instructor):
+def get_prompt_run(studio, target_year, start_month, book_all_months, target_day, target_time, instructor):
+    """Describes an interactive run by its prompt answers, as stored in the checkpoint.
+    
+    How the weeks are navigated is left out, so a run can be resumed with
+    or without --jump.
+    
+    Returns:
+        dict: JSON-serializable answers identifying the run
+    """
+
+    return {
+        "mode": "prompts",
+        "studio": studio,
+        "year": target_year,
+        "start_month": start_month,
+        "book_all_months": book_all_months,
+        "day": target_day,
+        "time": target_time.strftime("%I:%M %p") if target_time else None,
+        "instructor": instructor
+    }
+
+def get_saved_inputs(checkpoint):
+    """Reads the prompt answers of the interactive run a checkpoint was saved by.
+    
+    Args:
+        checkpoint (RunCheckpoint): The checkpoint to resume
+    
+    Returns:
+        tuple or None: The same values as read_all_inputs, None if there is no interactive run to resume
+    """
+
+    run = checkpoint.get_saved_run()
+    if not run or run.get("mode") != "prompts":
+        print("No interactive run to resume, please answer the prompts")
+        return None
+
+    target_time = parse_time(run["time"]) if run["time"] else None
+    print("-------------------------------------------------------")
+    print(f"Resuming: {run['studio'].title()}, "
+          f"{'all months from ' if run['book_all_months'] else ''}{calendar.month_name[run['start_month']]} {run['year']}")
+    print("-------------------------------------------------------")
+    return run["studio"], run["year"], run["start_month"], run["book_all_months"], run["day"], target_time, run["instructor"]
+
+def open_studio_page(driver, studio):
+    """Loads the schedule page of the selected studio.
+    
+    Args:
+        driver (webdriver.Chrome): The webdriver instance
+        studio (str): The selected studio name
+    """
+
+    if studio.lower() == 'cranford':
+        driver.get(HYR_CRANFORD_URL.strip())
+    else:
+        driver.get(HYR_METUCHEN_URL.strip())
+
+def run_month_worker(studio, target_year, month, target_day, target_time, instructor, handler, lean):
+    """Books the classes of a single month on a browser of its own.
+    
+    Args:
+        studio (str): The selected studio name
+        target_year (int): The target year for booking
+        month (int): The month this worker handles
+        target_day (str or None): The target day of week or None for any day
+        target_time (datetime.time or None): The target time or None for any time
+        instructor (str or None): The instructor name or None for any instructor
+        handler (MindbodyHandler): Handler of this worker, sharing the ledger, cache and session of the others
+        lean (bool): Whether to start the browser with the lean profile
+    
+    Returns:
+        tuple: (int, bool or None) - The month and the result of reserve_classes
+    """
+
+    driver = init_driver(lean)
+    try:
+        open_studio_page(driver, studio)
+        handler.start_session(driver)
+        handler.seek_month(driver, studio, target_year, month)
+        return month, handler.reserve_classes(driver, studio, target_year, month, target_day, target_time, instructor)
+    finally:
+        driver.quit()
+
+def run_parallel_months(studio, target_year, start_month, target_day, target_time, instructor, workers, handler, lean=False):
+    """Books all remaining months concurrently, one browser per month.
+    
+    Workers share a BookingLedger so dates of weeks that span two months
+    are only handled once, and their bookings are merged into one summary.
+    They also share the Mindbody session, so only the first one logs in.
+    
+    Args:
+        studio (str): The selected studio name
+        target_year (int): The target year for booking
+        start_month (int): The first month to book
+        target_day (str or None): The target day of week or None for any day
+        target_time (datetime.time or None): The target time or None for any time
+        instructor (str or None): The instructor name or None for any instructor
+        workers (int): Maximum number of browsers running at once
+        handler (MindbodyHandler): Handler whose ledger, cache and session the workers share
+        lean (bool): Whether to start the browsers with the lean profile
+    
+    Returns:
+        BookingLedger: The ledger holding every booking attempt
+    """
+
+    months = range(start_month, 13)
+
+    print("-------------------------------------------------------")
+    print(f"Processing {len(months)} months with {min(workers, len(months))} workers")
+    print("-------------------------------------------------------")
+    print("\n")
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = [
+        executor.submit(run_month_worker, studio, target_year, month, target_day, target_time, instructor, handler.spawn(), lean)
+        for month in months
+    ]
+    try:
+        for future in as_completed(futures):
+            try:
+                month, result = future.result()
+                status = "membership expired" if result is None else "finished" if result else "stopped early"
+                print(f"\nWorker for {calendar.month_name[month]} {target_year} {status}")
+            except Exception as e:
+                print(f"\nWorker failed: {e}")
+    except KeyboardInterrupt:
+        # Months that have not started yet are dropped, running workers finish their month
+        for future in futures:
+            future.cancel()
+        raise
+    finally:
+        executor.shutdown(wait=True)
+
+    handler.ledger.print_summary()
+    return handler.ledger
+
+def begin_reservation_system(studio, target_year, start_month, book_all_months, target_day, target_time, instructor, lean=False, workers=1, queue=None, book_queued=True, launcher=None, checkpoint=None, resume=False):
     """Initiates the class reservation process with the provided parameters.
     
     Sets up the webdriver and handles the reservation process for either a single month
@@ -262,70 +445,746 @@ def begin_reservation_system(studio, target_year, start_month, book_all_months,
         target_day (str or None): The target day of week or None for any day
         target_time (datetime.time or None): The target time or None for any time
         instructor (str or None): The instructor name or None for any instructor
+        lean (bool): Whether to start the browser with the lean profile
+        workers (int): Number of browsers used to book all remaining months in parallel
+        queue (BookingQueue or None): Scan everything into this queue first, then book it
+        book_queued (bool): Whether to book the queue after scanning
+        launcher (BrowserLauncher or None): Browser started while the prompts were answered, with the studio page loading
+        checkpoint (RunCheckpoint or None): Progress file saved after every week of a serial run
+        resume (bool): Whether to continue from the checkpoint of the same run
     
     Returns:
         tuple: (driver, bool) - The webdriver instance and whether to close it
     """
 
-    driver = init_driver()
+    def get_driver():
+        if launcher:
+            return launcher.get()
+        driver = init_driver(lean)
+        open_studio_page(driver, studio)
+        return driver
 
-    if studio.lower() == 'cranford':
-        driver.get(HYR_CRANFORD_URL.strip())
-    else:
-        driver.get(HYR_METUCHEN_URL.strip())
+    if queue:
+        months = list(range(start_month, 13)) if book_all_months else [start_month]
+        driver = None
+        if book_queued or not mindbody_handler.schedule_source:  # Scanning over HTTP needs no browser
+            driver = get_driver()
+        if book_queued:
+            mindbody_handler.start_session(driver)
+        mindbody_handler.reserve_classes_pipelined(driver, studio, target_year, months, target_day, target_time, instructor, queue=queue, book=book_queued)
+        mindbody_handler.ledger.print_summary()
+        return driver, True
+
+    if book_all_months and workers > 1:
+        run_parallel_months(studio, target_year, start_month, target_day, target_time, instructor, workers, mindbody_handler, lean)
+        return None, True
+
+    if checkpoint:
+        run = get_prompt_run(studio, target_year, start_month, book_all_months, target_day, target_time, instructor)
+        mindbody_handler.checkpoint = checkpoint
+        if checkpoint.start(run, resume):
+            mindbody_handler.ledger.restore_bookings(checkpoint.get_bookings())
+            mindbody_handler.restore_progress(studio)
+
+    driver = get_driver()
+    mindbody_handler.start_session(driver)
 
     if book_all_months:
-        # Process each remaining month of the year
+        # One pass over the planned weeks of every remaining month, each week loaded once
         try:
-            for month in range(start_month, 13):
-                print("-------------------------------------------------------")
-                print(f"Processing {calendar.month_name[month]} {target_year}")
-                print("-------------------------------------------------------")
-                print("\n")
-                result = mindbody_handler.reserve_classes(driver, studio, target_year, month, target_day, target_time, instructor)
-
-                if result is None:  # Membership expired
-                    return driver, True
-                if not result:  # User interrupted
-                    return driver, True
-                
+            result = mindbody_handler.reserve_classes_continuous(driver, studio, target_year, list(range(start_month, 13)), target_day, target_time, instructor)
         except KeyboardInterrupt:
             return driver, True
         
     else:
+        mindbody_handler.seek_month(driver, studio, target_year, start_month)
         result = mindbody_handler.reserve_classes(driver, studio, target_year, start_month, target_day, target_time, instructor)
-        if result is None:  # Membership expired
-            return driver, True
-        
+
+    # An interrupted or failed run keeps its checkpoint for --resume
+    if checkpoint and result is not False:
+        checkpoint.clear()
+
+    mindbody_handler.ledger.print_summary()
+    return driver, True
+
+def begin_job_system(job, lean=False, queue=None, book_queued=True, checkpoint=None, resume=False):
+    """Runs a booking job from a job file without any prompts.
+    
+    Each studio is scanned once and every rule is evaluated in the same pass
+    over each week, so the navigation cost is shared by all rules.
+    
+    Args:
+        job (BookingJob): The job to run
+        lean (bool): Whether to start the browser with the lean profile
+        queue (BookingQueue or None): Scan each studio into this queue first, then book it
+        book_queued (bool): Whether to book the queue after scanning
+        checkpoint (RunCheckpoint or None): Progress file saved after every week, used without a queue
+        resume (bool): Whether to continue from the checkpoint of the same job
+    
+    Returns:
+        tuple: (driver, bool) - The webdriver instance and whether to close it
+    """
+
+    if checkpoint:
+        run = {"mode": "job", "job": job.path, "year": job.year, "months": job.months}
+        if checkpoint.start(run, resume):
+            mindbody_handler.ledger.restore_bookings(checkpoint.get_bookings())
+
+    print("-------------------------------------------------------")
+    print(f"Running job: {job.name}")
+    for rule in job.rules:
+        print(f"    Rule: {rule.describe()}")
+    print("-------------------------------------------------------")
+    print("\n")
+
+    driver = None
+    if book_queued or not (queue and mindbody_handler.schedule_source):  # Scanning over HTTP needs no browser
+        driver = init_driver(lean)
+    if book_queued:
+        mindbody_handler.start_session(driver)
+
+    try:
+        for studio in job.studios:
+            if not any(rule.applies_to(studio) for rule in job.rules):
+                continue
+
+            if driver:
+                open_studio_page(driver, studio)
+            handler = mindbody_handler.spawn()
+            handler.checkpoint = checkpoint
+            handler.restore_progress(studio)
+
+            if queue:
+                if not handler.reserve_classes_pipelined(driver, studio, job.year, job.months, rules=job.rules, queue=queue, book=book_queued):
+                    return driver, True
+                continue
+
+            print("-------------------------------------------------------")
+            print(f"Processing {studio.title()}: {', '.join(calendar.month_name[month] for month in job.months)} {job.year}")
+            print("-------------------------------------------------------")
+            print("\n")
+            if handler.reserve_classes_continuous(driver, studio, job.year, job.months, rules=job.rules) is False:  # User interrupted
+                return driver, True
+
+    except KeyboardInterrupt:
+        return driver, True
+
+    if checkpoint:
+        checkpoint.clear()
+    mindbody_handler.ledger.print_summary()
     return driver, True
 
-def init_driver():
+def begin_orchestrated_jobs(jobs, max_browsers, lean=False, queue=None, book_queued=True):
+    """Runs several booking jobs at once, each studio and month on a browser of its own.
+    
+    Args:
+        jobs (list): The BookingJob instances to run
+        max_browsers (int): Maximum number of browsers open at once
+        lean (bool): Whether to start the browsers with the lean profile
+        queue (BookingQueue or None): Scan each studio into this queue first, then book it
+        book_queued (bool): Whether to book the queue after scanning
+    
+    Returns:
+        tuple: (driver, bool) - None, as every browser is closed by its unit, and whether to close it
+    """
+
+    def open_browser(studio):
+        driver = init_driver(lean)
+        open_studio_page(driver, studio)
+        return driver
+
+    orchestrator = JobOrchestrator(mindbody_handler, open_browser, max_browsers, queue, book_queued)
+    orchestrator.run(jobs)
+    return None, True
+
+def begin_member_system(studios, target_year, months, rules, members, session_path, lean=False, queue=None, book_queued=True):
+    """Books the same classes for several members in one run.
+    
+    Each studio is scanned once, then every member books the matches in a
+    browser and session of its own, all members at the same time.
+    
+    Args:
+        studios (list): The studio names to book at
+        target_year (int): The target year for booking
+        months (list): The month numbers to book
+        rules (list): BookingRule instances a class has to match one of
+        members (list): The Member instances to book for
+        session_path (str or None): Session file of the default account, the members' files are named after it
+        lean (bool): Whether to start the browsers with the lean profile
+        queue (BookingQueue or None): Queue the scan resumes from and writes to, in memory if None
+        book_queued (bool): Whether to book the queue after scanning
+    
+    Returns:
+        tuple: (driver, bool) - None, as every browser is closed by the booker, and whether to close it
+    """
+
+    from utilities.member_booker import MemberBooker
+
+    def open_browser(studio):
+        driver = init_driver(lean)
+        open_studio_page(driver, studio)
+        return driver
+
+    booker = MemberBooker(mindbody_handler, members, open_browser, session_path)
+    try:
+        for studio in studios:
+            if not any(rule.applies_to(studio) for rule in rules):
+                continue
+            booker.run(studio, target_year, months, rules, queue, book_queued)
+    except KeyboardInterrupt:
+        return None, True
+
+    mindbody_handler.ledger.print_summary()
+    return None, True
+
+def begin_export_system(studios, target_year, months, rules, path, lean=False, launcher=None):
+    """Writes the schedule of the selected months to a file without booking anything.
+    
+    Every session is written as soon as its week is read, so the file grows
+    at scan speed. Sessions are filtered by the rules, which match anything
+    when every prompt was answered with 'any'.
+    
+    Args:
+        studios (list): The studio names to read
+        target_year (int): The target year
+        months (list): The month numbers to read
+        rules (list): BookingRule instances a session has to match one of
+        path (str): The .jsonl, .csv or .ics file to write
+        lean (bool): Whether to start the browser with the lean profile
+        launcher (BrowserLauncher or None): Browser started while the prompts were answered, showing the first studio
+    
+    Returns:
+        tuple: (driver, bool) - The webdriver instance and whether to close it
+    """
+
+    from utilities.schedule_export import open_schedule_writer
+
+    writer = open_schedule_writer(path)
+    source = mindbody_handler.schedule_source
+    needs_browser = not (source and not source.uses_browser)  # Reading over HTTP needs no browser
+    driver = launcher.get() if launcher else None
+    shown_studio = studios[0] if launcher else None
+
+    print("-------------------------------------------------------")
+    print(f"Exporting the schedule to {path}")
+    print("-------------------------------------------------------")
+
+    try:
+        for studio in studios:
+            rule_index = mindbody_handler.get_studio_rule_index(studio, rules)
+            if not rule_index:
+                continue
+            if needs_browser and studio != shown_studio:
+                driver = driver or init_driver(lean)
+                open_studio_page(driver, studio)
+                shown_studio = studio
+
+            for record in mindbody_handler.scan_schedule(driver, studio, target_year, months, rule_index):
+                writer.write(record)
+    except KeyboardInterrupt:
+        print("\nInterrupted, the file holds the classes read so far")
+    finally:
+        writer.close()
+
+    print("\n-------------------------------------------------------")
+    print(f"Exported {writer.count} classes to {path}")
+    print("-------------------------------------------------------")
+    return driver, True
+
+def begin_sniper_system(studio, class_date, rule, release_time, prepare_lead, lean=False):
+    """Books one class the moment its booking window opens.
+    
+    The browser is started shortly before the release time, logs in, shows
+    the class's day and expands the class, then fires at the release time.
+    
+    Args:
+        studio (str): The selected studio name
+        class_date (datetime.date): Date of the class
+        rule (BookingRule): Filters identifying the class on that date
+        release_time (datetime): When the booking window opens
+        prepare_lead (timedelta): How long before release_time preparation starts
+        lean (bool): Whether to start the browser with the lean profile
+    
+    Returns:
+        tuple: (driver, bool) - The webdriver instance and whether to close it
+    """
+
+    from utilities.booking_sniper import BookingSniper
+
+    sniper = BookingSniper(mindbody_handler)
+    sniper.wait_until(release_time - prepare_lead)
+
+    driver = init_driver(lean)
+    open_studio_page(driver, studio)
+    sniper.run(driver, studio, class_date, rule, release_time, prepare_lead)
+
+    mindbody_handler.ledger.print_summary()
+    return driver, True
+
+def begin_watch_system(studio, class_dates, rule, until=None, lean=False):
+    """Watches full classes and books them as soon as a spot frees up.
+    
+    Args:
+        studio (str): The selected studio name
+        class_dates (list): Dates (datetime.date) of the classes to watch
+        rule (BookingRule): Filters identifying the class on each date
+        until (datetime or None): When to stop watching, the classes' start if None
+        lean (bool): Whether to start the browser with the lean profile
+    
+    Returns:
+        tuple: (driver, bool) - The webdriver instance and whether to close it
+    """
+
+    from utilities.class_watcher import ClassWatcher
+
+    driver = init_driver(lean)
+    open_studio_page(driver, studio)
+    mindbody_handler.start_session(driver)
+    ClassWatcher(mindbody_handler).run(driver, studio, [(class_date, rule) for class_date in class_dates], until)
+
+    mindbody_handler.ledger.print_summary()
+    return driver, True
+
+def build_handler(jump, ledger, schedule_cache, session_manager, schedule_source, prefetch=False):
+    """Creates the handler every mode books with.
+    
+    The handler module pulls in Selenium, so it is imported here rather than
+    at startup; in the interactive mode that import overlaps with the prompts.
+    
+    Args:
+        jump (bool): Whether to jump straight to each planned week
+        ledger (BookingLedger): Ledger shared by every worker
+        schedule_cache (ScheduleCache): Cache of schedule snapshots
+        session_manager (SessionManager): Saved Mindbody session
+        schedule_source (ScheduleSource or None): Source weeks are read from instead of the browser
+        prefetch (bool): Whether to load the next planned week in a second tab while booking
+    
+    Returns:
+        MindbodyHandler: The handler
+    """
+
+    from utilities.mindbody_handler import MindbodyHandler
+
+    return MindbodyHandler(
+        ledger=ledger,
+        jump_navigation=jump,
+        schedule_cache=schedule_cache,
+        session_manager=session_manager,
+        schedule_source=schedule_source,
+        prefetch_weeks=prefetch
+    )
+
+def get_chrome_service():
+    """Builds the chromedriver service, skipping Selenium's driver lookup when the binary is known.
+    
+    The binary is taken from the CHROMEDRIVER environment variable, the path
+    cached by the last launch or the PATH, in that order. Without one,
+    Selenium resolves (and if needed downloads) a matching driver itself.
+    
+    Returns:
+        tuple: (Service, bool) - The service and whether it uses a known binary
+    """
+
+    from selenium.webdriver.chrome.service import Service
+
+    cached_path = None
+    if os.path.exists(CHROMEDRIVER_PATH_CACHE):
+        with open(CHROMEDRIVER_PATH_CACHE) as cache_file:
+            cached_path = cache_file.read().strip()
+
+    for path in (os.environ.get("CHROMEDRIVER"), cached_path, shutil.which("chromedriver")):
+        if path and os.path.isfile(path) and os.access(path, os.X_OK):
+            return Service(executable_path=path), True
+    return Service(), False
+
+def cache_chromedriver_path(driver):
+    """Remembers the chromedriver binary a driver was started with, for the next launch."""
+
+    path = getattr(driver.service, "path", None)
+    if not path or not os.path.isfile(path):
+        return
+    os.makedirs(os.path.dirname(CHROMEDRIVER_PATH_CACHE), exist_ok=True)
+    with open(CHROMEDRIVER_PATH_CACHE, "w") as cache_file:
+        cache_file.write(path)
+
+@traced("startup")
+def init_driver(lean=False):
     """Initializes and configures the Chrome webdriver.
     
     Sets up Chrome options for optimal performance and user experience.
+    The lean profile runs headless with a fixed window size, returns from
+    page loads once the DOM is ready and blocks images, fonts, media and
+    analytics requests, which keeps navigation fast and memory per browser low.
+    
+    With --warm the driver attaches to the long-lived browser instead and
+    works in a fresh tab, which quitting the driver closes again.
+    
+    Args:
+        lean (bool): Whether to use the headless, resource-lean profile
     
     Returns:
         webdriver.Chrome: Configured Chrome webdriver instance
     """
 
+    # Imported here so the prompts show up without waiting for Selenium to load
+    from selenium import webdriver
+    from selenium.common.exceptions import SessionNotCreatedException
+
     options = webdriver.ChromeOptions()
-    options.add_argument('--start-maximized')
-    options.add_argument('--disable-gpu')
-    options.add_argument('--log-level=3')  # Suppress console logging
-    options.add_experimental_option('excludeSwitches', ['enable-logging'])  # Suppress console logging
-    options.add_experimental_option("detach", True)
-    return webdriver.Chrome(options=options)
+
+    if warm_browser:
+        # Launch switches belong to the running browser, attaching only takes its debugger address
+        options.debugger_address = warm_browser.ensure_running()
+        if lean:
+            options.page_load_strategy = 'eager'
+    else:
+        options.add_argument('--disable-gpu')
+        options.add_argument('--log-level=3')  # Suppress console logging
+        options.add_experimental_option('excludeSwitches', ['enable-logging'])  # Suppress console logging
+
+        if lean:
+            options.add_argument('--headless=new')
+            options.add_argument(f'--window-size={LEAN_WINDOW_SIZE}')
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            options.add_argument('--disable-extensions')
+            options.add_argument('--mute-audio')
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+            options.page_load_strategy = 'eager'  # The widget renders after DOMContentLoaded, our waits cover it
+        else:
+            options.add_argument('--start-maximized')
+            options.add_experimental_option("detach", True)
+
+        if prefetch_weeks:
+            for argument in BACKGROUND_TAB_ARGUMENTS:
+                options.add_argument(argument)
+
+    service, known_binary = get_chrome_service()
+    try:
+        driver = webdriver.Chrome(service=service, options=options)
+    except SessionNotCreatedException:
+        if not known_binary:
+            raise
+        # The known binary no longer matches the installed Chrome, let Selenium find one that does
+        driver = webdriver.Chrome(options=options)
+        known_binary = False
+    if not known_binary:
+        cache_chromedriver_path(driver)
+
+    if command_profiler:
+        command_profiler.attach(driver)
+
+    if warm_browser:
+        warm_browser.open_tab(driver)
+
+    if lean:
+        # Block fonts, media and trackers at the network layer
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URL_PATTERNS})
+
+    return driver
+
+def parse_args():
+    """Parses the command line options.
+    
+    Returns:
+        argparse.Namespace: The parsed options
+    """
+
+    parser = argparse.ArgumentParser(description="Yoga Class Reservation System")
+    parser.add_argument(
+        "--job",
+        metavar="PATH",
+        nargs="+",
+        help="run the studios, months and rules of one or more JSON, YAML or TOML job files without prompts"
+    )
+    parser.add_argument(
+        "--lean",
+        action="store_true",
+        help="run a headless browser that skips images, fonts, media and analytics"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="?",
+        const=os.cpu_count() or 1,
+        default=1,
+        help="book all remaining months, or the months of --job files, with this many browsers in parallel (default with no value: CPU count)"
+    )
+    parser.add_argument(
+        "--jump",
+        action="store_true",
+        help="jump straight to each week that can hold a match instead of walking the calendar"
+    )
+    parser.add_argument(
+        "--prefetch",
+        action="store_true",
+        help="load the next week in a second tab while the current week is booked (implies --jump)"
+    )
+    parser.add_argument(
+        "--ledger",
+        default=DEFAULT_LEDGER_PATH,
+        help=f"SQLite file remembering scanned dates and booked classes between runs (default: {DEFAULT_LEDGER_PATH})"
+    )
+    parser.add_argument(
+        "--no-ledger",
+        action="store_true",
+        help="do not read or write the on-disk ledger"
+    )
+    parser.add_argument(
+        "--rescan-after",
+        type=float,
+        default=12,
+        help="hours after which a scanned date is scanned again (default: 12)"
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=360,
+        help=f"minutes a schedule snapshot in {DEFAULT_CACHE_DIRECTORY} is trusted before the week is scraped again (default: 360)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="do not read or write schedule snapshots on disk"
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="scan the whole range into a queue first, then book the queued classes back to back"
+    )
+    parser.add_argument(
+        "--queue",
+        default=DEFAULT_QUEUE_PATH,
+        help=f"file the pipeline's scan stage writes to and resumes from (default: {DEFAULT_QUEUE_PATH})"
+    )
+    parser.add_argument(
+        "--queue-only",
+        action="store_true",
+        help="run only the scan stage of the pipeline and keep the queue for a later run"
+    )
+    parser.add_argument(
+        "--schedule-source",
+        choices=("browser", "http"),
+        default="browser",
+        help="read schedules in the browser or straight from the widget's responses over HTTP (default: browser)"
+    )
+    parser.add_argument(
+        "--schedule-url",
+        default=WIDGET_BASE_URL,
+        help=f"host serving the widget's schedule responses for --schedule-source http (default: {WIDGET_BASE_URL})"
+    )
+    parser.add_argument(
+        "--warm",
+        action="store_true",
+        help="attach to a long-lived Chrome (started on first use) and work in a fresh tab, leaving the browser running and logged in for the next run"
+    )
+    parser.add_argument(
+        "--warm-port",
+        type=int,
+        default=DEFAULT_WARM_PORT,
+        help=f"remote debugging port of the warm browser (default: {DEFAULT_WARM_PORT})"
+    )
+    parser.add_argument(
+        "--instrument",
+        action="store_true",
+        help="count and time every WebDriver command and print the hot spots at the end of the run"
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="record how the run splits into navigation, scanning, booking, login and waits, and write the timeline to PATH in Chrome trace format (chrome://tracing, ui.perfetto.dev)"
+    )
+    parser.add_argument(
+        "--session",
+        default=DEFAULT_SESSION_PATH,
+        help=f"file keeping the Mindbody login cookies between runs (default: {DEFAULT_SESSION_PATH})"
+    )
+    parser.add_argument(
+        "--no-session",
+        action="store_true",
+        help="do not read or write the login cookies on disk, log in once per run"
+    )
+
+    parser.add_argument(
+        "--members",
+        metavar="NAME",
+        nargs="*",
+        help="book for these MINDBODY_MEMBERS (all of them without names), each in a browser and session of its own, scanning the schedule once"
+    )
+    parser.add_argument(
+        "--export",
+        metavar="PATH",
+        help="only read the schedule of the selected months (or --job files) and stream it to a .jsonl, .csv or .ics file, booking nothing"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=DEFAULT_CHECKPOINT_PATH,
+        help=f"file a serial run saves its progress to after every week (default: {DEFAULT_CHECKPOINT_PATH})"
+    )
+    parser.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="do not save the run's progress"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue the run the checkpoint was saved by, skipping the prompts and every finished week"
+    )
+    sniper = parser.add_argument_group("sniper mode", "book one class the moment its booking window opens")
+    sniper.add_argument(
+        "--snipe",
+        metavar="RELEASE_TIME",
+        type=datetime.fromisoformat,
+        help="when the booking window opens, e.g. '2026-10-20 06:00:00'"
+    )
+    sniper.add_argument(
+        "--studio",
+        choices=STUDIOS,
+        help="studio of the class to snipe or watch"
+    )
+    sniper.add_argument(
+        "--date",
+        type=lambda value: datetime.strptime(value, "%Y-%m-%d").date(),
+        help="date of the class (YYYY-MM-DD)"
+    )
+    sniper.add_argument(
+        "--time",
+        type=parse_time,
+        help="start time of the class to snipe or watch, e.g. '6:00 PM'"
+    )
+    sniper.add_argument("--instructor", help="instructor of the class to snipe or watch")
+    sniper.add_argument("--class-name", help="name of the class to snipe or watch")
+    sniper.add_argument(
+        "--prepare-lead",
+        type=float,
+        default=90,
+        help="seconds before the release time to log in and expand the class (default: 90)"
+    )
+
+    watch = parser.add_argument_group(
+        "watch mode", "book full classes the moment a spot frees up, using --studio, --time, --instructor and --class-name above"
+    )
+    watch.add_argument(
+        "--watch",
+        metavar="DATE",
+        nargs="+",
+        type=lambda value: datetime.strptime(value, "%Y-%m-%d").date(),
+        help="dates (YYYY-MM-DD) of the classes to watch"
+    )
+    watch.add_argument(
+        "--watch-until",
+        type=datetime.fromisoformat,
+        help="stop watching at this time, e.g. '2026-10-20 17:00' (default: shortly before each class starts)"
+    )
+
+    args = parser.parse_args()
+    if args.prefetch:
+        args.jump = True  # Only planned weeks are known ahead of time
+    if args.snipe and not (args.studio and args.date):
+        parser.error("--snipe needs --studio and --date")
+    if args.snipe and not (args.time or args.instructor or args.class_name):
+        parser.error("--snipe needs --time, --instructor or --class-name to tell which class to book")
+    if args.snipe and not MINDBODY_LOGIN_URL:
+        parser.error("--snipe logs in ahead of the release and needs MINDBODY_LOGIN_URL in config.py")
+    if args.watch and not args.studio:
+        parser.error("--watch needs --studio")
+    if args.watch and not (args.time or args.instructor or args.class_name):
+        parser.error("--watch needs --time, --instructor or --class-name to tell which classes to watch")
+    if args.members is not None and (args.snipe or args.watch or args.warm or args.workers > 1):
+        parser.error("--members cannot be combined with --snipe, --watch, --warm or --workers")
+    if args.export and (args.snipe or args.watch or args.members is not None or args.pipeline or args.queue_only or args.workers > 1):
+        parser.error("--export cannot be combined with --snipe, --watch, --members, --pipeline, --queue-only or --workers")
+    if args.resume and (args.no_checkpoint or args.snipe or args.watch or args.export or args.members is not None or args.workers > 1):
+        parser.error("--resume continues serial booking runs and cannot be combined with --no-checkpoint, --snipe, --watch, --export, --members or --workers")
+    if args.resume and (args.pipeline or args.queue_only):
+        parser.error("--pipeline resumes from its queue by itself, run it again without --resume")
+    if args.export and os.path.splitext(args.export)[1].lower() not in EXPORT_FORMATS:
+        parser.error("--export needs a .jsonl, .csv or .ics file")
+    if args.schedule_source == "http" and not (args.jump or args.pipeline or args.queue_only or args.members is not None or args.export):
+        parser.error("--schedule-source http needs --jump, --pipeline, --members or --export")
+    return args
 
 if __name__ == "__main__":
+    args = parse_args()
     driver = None
-    mindbody_handler = MindbodyHandler()
+    launcher = None
+    if args.instrument:
+        command_profiler = CommandProfiler()
+    if args.warm:
+        warm_browser = WarmBrowser(args.warm_port, headless=args.lean)
+    prefetch_weeks = args.prefetch
+    tracer = start_tracing() if args.trace else None
+    ledger = BookingLedger(None if args.no_ledger else args.ledger, timedelta(hours=args.rescan_after))
+    schedule_cache = ScheduleCache(None if args.no_cache else DEFAULT_CACHE_DIRECTORY, timedelta(minutes=args.cache_ttl))
+    session_path = None if args.no_session else args.session
+    session_manager = SessionManager(session_path)
+    try:
+        schedule_source = HttpScheduleSource(args.schedule_url, pool_size=max(args.workers, 1)) if args.schedule_source == "http" else None
+    except ValueError as e:
+        raise SystemExit(e)
+    # The prompts need no handler, it is only built once they are answered
+    prompting = not (args.snipe or args.watch or args.job)
+    mindbody_handler = None if prompting else build_handler(args.jump, ledger, schedule_cache, session_manager, schedule_source, args.prefetch)
+    queue = BookingQueue(args.queue, timedelta(hours=args.rescan_after)) if args.pipeline or args.queue_only else None
+    # Only serial runs that book as they scan keep a checkpoint, the pipeline resumes from its queue
+    serial = not (args.snipe or args.watch or args.export or args.members is not None or queue or args.workers > 1)
+    checkpoint = RunCheckpoint(args.checkpoint) if serial and not args.no_checkpoint else None
     try:
         print("\nYoga Class Reservation System")
         print("-------------------------------------------------------")
         print(f"    Press Ctrl+C at any time to exit safely\n")
         
-        studio, target_year, start_month, book_all_months, target_day, target_time, instructor = read_all_inputs()
-        driver, should_close = begin_reservation_system(studio, target_year, start_month, book_all_months, target_day, target_time, instructor)
+        if args.snipe:
+            rule = BookingRule(time=args.time, instructor=args.instructor, class_name=args.class_name)
+            driver, should_close = begin_sniper_system(args.studio, args.date, rule, args.snipe, timedelta(seconds=args.prepare_lead), args.lean)
+        elif args.watch:
+            rule = BookingRule(time=args.time, instructor=args.instructor, class_name=args.class_name)
+            driver, should_close = begin_watch_system(args.studio, args.watch, rule, args.watch_until, args.lean)
+        elif args.job:
+            jobs = [load_job_file(path) for path in args.job]
+            if args.export:
+                if len(jobs) > 1:
+                    raise ValueError("--export reads one job file at a time")
+                job = jobs[0]
+                driver, should_close = begin_export_system(job.studios, job.year, job.months, job.rules, args.export, args.lean)
+            elif args.members is not None or any(job.members for job in jobs):
+                if len(jobs) > 1 or args.workers > 1:
+                    raise ValueError("Jobs that book for members run one at a time, without --workers")
+                job = jobs[0]
+                members = load_members(job.members if args.members is None else args.members)
+                driver, should_close = begin_member_system(job.studios, job.year, job.months, job.rules, members, session_path, args.lean, queue, not args.queue_only)
+            elif len(jobs) > 1 or args.workers > 1:
+                if args.resume:
+                    raise ValueError("--resume continues one job at a time")
+                driver, should_close = begin_orchestrated_jobs(jobs, args.workers, args.lean, queue, not args.queue_only)
+            else:
+                driver, should_close = begin_job_system(jobs[0], args.lean, queue, not args.queue_only, checkpoint, args.resume)
+        else:
+            members = load_members(args.members) if args.members is not None else None
+
+            # Start the browser while the prompts are answered, unless the run will not use this one
+            if args.workers <= 1 and not members and not ((args.queue_only or args.export) and schedule_source):
+                launcher = BrowserLauncher(lambda: init_driver(args.lean))
+            on_studio_selected = (lambda studio: launcher.queue(lambda driver: open_studio_page(driver, studio))) if launcher else None
+
+            inputs = get_saved_inputs(checkpoint) if args.resume else None
+            if inputs:
+                if on_studio_selected:
+                    on_studio_selected(inputs[0])
+            else:
+                with span("read_all_inputs", "prompt"):
+                    inputs = read_all_inputs(on_studio_selected)
+            studio, target_year, start_month, book_all_months, target_day, target_time, instructor = inputs
+            mindbody_handler = build_handler(args.jump, ledger, schedule_cache, session_manager, schedule_source, args.prefetch)
+            months = list(range(start_month, 13)) if book_all_months else [start_month]
+            rules = [BookingRule(target_day, target_time, instructor)]
+            if args.export:
+                driver, should_close = begin_export_system([studio], target_year, months, rules, args.export, args.lean, launcher)
+            elif members:
+                driver, should_close = begin_member_system([studio], target_year, months, rules, members, session_path, args.lean, queue, not args.queue_only)
+            else:
+                driver, should_close = begin_reservation_system(studio, target_year, start_month, book_all_months, target_day, target_time, instructor, args.lean, args.workers, queue, not args.queue_only, launcher, checkpoint, args.resume)
         
     except KeyboardInterrupt:
         print("\n\nKeyboard interrupt detected. Exiting safely...")
@@ -336,7 +1195,20 @@ if __name__ == "__main__":
         should_close = True
 
     finally:
-        if driver and should_close:
+        if launcher:
+            launcher.close()
+        if command_profiler:
+            command_profiler.print_summary()
+        if tracer:
+            tracer.save(args.trace)
+            tracer.print_summary(args.trace)
+        ledger.close()
+        if schedule_source:
+            schedule_source.close()
+        if driver and should_close and warm_browser:
+            driver.quit()
+            print("\nTab closed, the warm browser stays open. Goodbye!")
+        elif driver and should_close:
             print("\nClosing browser...")
             driver.quit()
             print("Browser closed. Goodbye!")